@@ -0,0 +1,51 @@
+"""Baseline files table
+
+Revision ID: 0001
+Revises:
+Create Date: 2024-01-15 10:00:00
+
+Databases that predate migrations already have this table (it was created
+on startup), so it is only created when missing.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table("files"):
+        return
+
+    op.create_table(
+        "files",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("original_filename", sa.String(255)),
+        sa.Column("stored_filename", sa.String(255)),
+        sa.Column("file_hash", sa.String(64)),
+        sa.Column("file_size", sa.Integer()),
+        sa.Column("content_type", sa.String(100)),
+        sa.Column("user_id", sa.String(100)),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("is_deleted", sa.Integer()),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+    op.create_index("ix_files_id", "files", ["id"])
+    op.create_index("ix_files_original_filename", "files", ["original_filename"])
+    op.create_index(
+        "ix_files_stored_filename", "files", ["stored_filename"], unique=True
+    )
+    op.create_index("ix_files_file_hash", "files", ["file_hash"])
+    op.create_index("ix_files_user_id", "files", ["user_id"])
+    op.create_index("ix_files_is_deleted", "files", ["is_deleted"])
+    op.create_index("ix_files_created_at", "files", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_table("files")
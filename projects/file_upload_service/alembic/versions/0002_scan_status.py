@@ -0,0 +1,36 @@
+"""Add scan status to files
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2024-01-15 10:00:00
+
+Files stored before async scanning were scanned on upload, so existing
+rows start out clean.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    columns = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("files")}
+    if "scan_status" in columns:
+        return
+
+    op.add_column(
+        "files", sa.Column("scan_status", sa.String(20), server_default="clean")
+    )
+    op.add_column("files", sa.Column("scan_detail", sa.String(255), nullable=True))
+    op.create_index("ix_files_scan_status", "files", ["scan_status"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_files_scan_status", table_name="files")
+    op.drop_column("files", "scan_detail")
+    op.drop_column("files", "scan_status")
@@ -0,0 +1,68 @@
+"""Add content-addressed blobs
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2024-01-15 10:00:00
+
+stored_filename stops being unique: files with the same content share
+their blob's object key.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    if not inspector.has_table("blobs"):
+        op.create_table(
+            "blobs",
+            sa.Column("sha256", sa.String(64), primary_key=True),
+            sa.Column("storage_key", sa.String(255), unique=True),
+            sa.Column("size", sa.Integer()),
+            sa.Column("ref_count", sa.Integer()),
+            sa.Column("created_at", sa.DateTime()),
+            sa.Column("updated_at", sa.DateTime()),
+        )
+        op.create_index("ix_blobs_ref_count", "blobs", ["ref_count"])
+
+    columns = {c["name"] for c in inspector.get_columns("files")}
+    if "blob_sha256" not in columns:
+        # Batch mode: SQLite can only add the foreign key by copying the table
+        with op.batch_alter_table("files") as batch:
+            batch.add_column(
+                sa.Column(
+                    "blob_sha256",
+                    sa.String(64),
+                    sa.ForeignKey("blobs.sha256", name="fk_files_blob_sha256"),
+                    nullable=True,
+                )
+            )
+        op.create_index("ix_files_blob_sha256", "files", ["blob_sha256"])
+
+    indexes = {i["name"]: i for i in inspector.get_indexes("files")}
+    stored = indexes.get("ix_files_stored_filename")
+    if stored is None or stored["unique"]:
+        if stored is not None:
+            op.drop_index("ix_files_stored_filename", table_name="files")
+        op.create_index("ix_files_stored_filename", "files", ["stored_filename"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_files_stored_filename", table_name="files")
+    op.create_index(
+        "ix_files_stored_filename", "files", ["stored_filename"], unique=True
+    )
+    op.drop_index("ix_files_blob_sha256", table_name="files")
+    with op.batch_alter_table("files") as batch:
+        batch.drop_constraint("fk_files_blob_sha256", type_="foreignkey")
+        batch.drop_column("blob_sha256")
+    op.drop_index("ix_blobs_ref_count", table_name="blobs")
+    op.drop_table("blobs")
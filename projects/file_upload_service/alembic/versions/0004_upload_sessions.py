@@ -0,0 +1,47 @@
+"""Add resumable upload sessions
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2024-01-15 10:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table("upload_sessions"):
+        return
+
+    op.create_table(
+        "upload_sessions",
+        sa.Column("id", sa.String(32), primary_key=True),
+        sa.Column("user_id", sa.String(100)),
+        sa.Column("filename", sa.String(255)),
+        sa.Column("content_type", sa.String(100)),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("upload_length", sa.Integer()),
+        sa.Column("offset", sa.Integer()),
+        sa.Column("stored_filename", sa.String(255)),
+        sa.Column("multipart_id", sa.String(255), nullable=True),
+        sa.Column("parts", sa.Text()),
+        sa.Column("tail_size", sa.Integer()),
+        sa.Column("expires_at", sa.DateTime()),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+    op.create_index("ix_upload_sessions_user_id", "upload_sessions", ["user_id"])
+    op.create_index(
+        "ix_upload_sessions_expires_at", "upload_sessions", ["expires_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("upload_sessions")
@@ -0,0 +1,41 @@
+"""Add direct upload intents
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2024-01-15 10:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table("upload_intents"):
+        return
+
+    op.create_table(
+        "upload_intents",
+        sa.Column("id", sa.String(32), primary_key=True),
+        sa.Column("user_id", sa.String(100)),
+        sa.Column("filename", sa.String(255)),
+        sa.Column("content_type", sa.String(100)),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("file_size", sa.Integer()),
+        sa.Column("file_hash", sa.String(64)),
+        sa.Column("stored_filename", sa.String(255)),
+        sa.Column("expires_at", sa.DateTime()),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_index("ix_upload_intents_user_id", "upload_intents", ["user_id"])
+    op.create_index("ix_upload_intents_expires_at", "upload_intents", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_table("upload_intents")
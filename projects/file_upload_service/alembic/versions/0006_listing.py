@@ -0,0 +1,46 @@
+"""Add the listing index and per-user file counts
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2024-01-15 10:00:00
+
+The counters fill themselves: each user is counted once, on their first
+listing. On PostgreSQL the index is built concurrently, outside the
+migration transaction, so uploads keep going while it builds.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    if not inspector.has_table("user_file_counts"):
+        op.create_table(
+            "user_file_counts",
+            sa.Column("user_id", sa.String(100), primary_key=True),
+            sa.Column("file_count", sa.Integer(), nullable=False),
+        )
+
+    if "ix_files_user_listing" not in {
+        i["name"] for i in inspector.get_indexes("files")
+    }:
+        with op.get_context().autocommit_block():
+            op.create_index(
+                "ix_files_user_listing",
+                "files",
+                ["user_id", "is_deleted", "created_at", "id"],
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_files_user_listing", table_name="files")
+    op.drop_table("user_file_counts")
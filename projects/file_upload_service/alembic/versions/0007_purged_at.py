@@ -0,0 +1,35 @@
+"""Add purged_at for background object collection
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2024-01-15 10:00:00
+
+Rows deleted before this revision had their objects removed
+synchronously, so they start out purged.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    columns = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("files")}
+    if "purged_at" in columns:
+        return
+
+    op.add_column("files", sa.Column("purged_at", sa.DateTime(), nullable=True))
+    op.execute("UPDATE files SET purged_at = updated_at WHERE is_deleted = 1")
+    op.create_index(
+        "ix_files_pending_purge", "files", ["is_deleted", "purged_at", "id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_files_pending_purge", table_name="files")
+    op.drop_column("files", "purged_at")
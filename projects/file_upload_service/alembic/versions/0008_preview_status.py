@@ -0,0 +1,34 @@
+"""Add preview status to files
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2024-01-15 10:00:00
+
+Existing files get no previews unless they are marked pending, after
+which the derivative workers' sweep renders them gradually (see README).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    columns = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("files")}
+    if "preview_status" in columns:
+        return
+
+    op.add_column(
+        "files", sa.Column("preview_status", sa.String(20), nullable=True)
+    )
+    op.create_index("ix_files_preview_status", "files", ["preview_status"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_files_preview_status", table_name="files")
+    op.drop_column("files", "preview_status")
@@ -1,66 +1,253 @@
-from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from typing import Optional
+from urllib.parse import quote
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.deps import get_current_user
+from app.core.config import settings
+from app.core.exceptions import (
+    APIException,
+    FileTooLargeError,
+    RangeNotSatisfiableError,
+)
 from app.db.session import get_db
 from app.schemas.file import (
+    ArchiveRequest,
+    BatchDeleteRequest,
+    BatchDeleteResponse,
+    DirectUploadRequest,
+    DirectUploadResponse,
     FileDeleteResponse,
     FileDownloadResponse,
     FileListResponse,
     FileUploadResponse,
     PresignedURLResponse,
+    UploadNegotiationRequest,
+    UploadNegotiationResponse,
 )
-from app.services.file_service import FileService
+from app.models.file import ScanStatus
+from app.services.file_service import FileService, ensure_clean
+from app.utils.derivatives import Derivative
+from app.utils.file_response import ObjectStreamResponse
+from app.utils.http_utils import etag_matches, parse_range_header
 from app.utils.logger import setup_logger
+from app.utils.streaming import iter_upload_file
 
 logger = setup_logger(__name__)
 
 router = APIRouter()
 
 
+def _reject_oversized(request: Request) -> None:
+    """Fail fast on a declared body larger than MAX_FILE_SIZE."""
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit():
+        # Multipart framing adds a little; allow 64KB of slack
+        if int(content_length) > settings.MAX_FILE_SIZE + 65536:
+            raise FileTooLargeError(
+                f"File size exceeds maximum {settings.MAX_FILE_SIZE}"
+            )
+
+
 @router.post("/upload", response_model=FileUploadResponse)
 async def upload_file(
+    request: Request,
+    response: Response,
     file: UploadFile = File(...),
     description: str = Query(None),
     user_id: str = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Upload a file with virus scanning."""
+    """Upload a file with virus scanning.
+
+    Returns 202 when the file is stored but its scan is still pending
+    (SCAN_MODE=async, or the scanner was unavailable).
+    """
     try:
+        _reject_oversized(request)
         file_service = FileService(db)
-        file_data = await file.read()
+        result = await file_service.upload_file(
+            iter_upload_file(file),
+            file.filename,
+            user_id,
+            file.content_type or "application/octet-stream",
+            description,
+        )
+        if result["scan_status"] == ScanStatus.PENDING:
+            # Stored, but not downloadable until a scan worker clears it
+            response.status_code = 202
+        return result
+    except (HTTPException, APIException):
+        raise
+    except Exception as e:
+        logger.error(f"Upload failed: {str(e)}")
+        raise HTTPException(status_code=500, detail="Upload failed")
 
-        from io import BytesIO
 
-        file_bytes = BytesIO(file_data)
+@router.post("/upload/stream", response_model=FileUploadResponse)
+async def upload_file_stream(
+    request: Request,
+    response: Response,
+    filename: str = Query(..., min_length=1, max_length=255),
+    description: str = Query(None),
+    user_id: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Upload the raw request body as a file, streamed as it arrives.
 
+    Unlike multipart ``/upload`` (which the framework spools to a temp file
+    before the handler runs), the body goes straight from the socket to
+    storage, and the size limit is enforced while reading.
+    """
+    try:
+        _reject_oversized(request)
+        file_service = FileService(db)
         result = await file_service.upload_file(
-            file_bytes,
-            file.filename,
+            request.stream(),
+            filename,
             user_id,
-            file.content_type or "application/octet-stream",
+            request.headers.get("content-type") or "application/octet-stream",
             description,
         )
+        if result["scan_status"] == ScanStatus.PENDING:
+            # Stored, but not downloadable until a scan worker clears it
+            response.status_code = 202
         return result
-    except HTTPException:
+    except (HTTPException, APIException):
         raise
     except Exception as e:
         logger.error(f"Upload failed: {str(e)}")
         raise HTTPException(status_code=500, detail="Upload failed")
 
 
+@router.post("/upload/negotiate", response_model=UploadNegotiationResponse)
+async def negotiate_upload(
+    body: UploadNegotiationRequest,
+    response: Response,
+    user_id: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Hash-first upload: send the SHA-256 and size before any bytes.
+
+    Content that is already stored becomes a file immediately (201, or 202
+    while its scan is pending); content held by another user must first be
+    proven with a ``prove`` challenge. Otherwise the reply is ``upload``
+    with a direct upload target, as from ``POST /presigned-upload``.
+    """
+    try:
+        file_service = FileService(db)
+        result = await file_service.negotiate_upload(
+            body.filename,
+            body.sha256.lower(),
+            body.file_size,
+            user_id,
+            body.content_type,
+            body.description,
+            challenge=body.challenge,
+            proof=body.proof,
+        )
+        if result["status"] == "created":
+            pending = result["scan_status"] == ScanStatus.PENDING
+            response.status_code = 202 if pending else 201
+        return result
+    except (HTTPException, APIException):
+        raise
+    except Exception as e:
+        logger.error(f"Upload negotiation failed: {str(e)}")
+        raise HTTPException(status_code=500, detail="Upload failed")
+
+
+@router.post(
+    "/presigned-upload", response_model=DirectUploadResponse, status_code=201
+)
+async def create_direct_upload(
+    body: DirectUploadRequest,
+    user_id: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Start an upload that goes straight to storage.
+
+    PUT the bytes to ``upload_url`` with ``upload_headers``, then POST to
+    ``complete_url`` to register the file.
+    """
+    try:
+        file_service = FileService(db)
+        return await file_service.create_direct_upload(
+            body.filename,
+            body.file_size,
+            body.sha256.lower(),
+            user_id,
+            body.content_type,
+            body.description,
+        )
+    except (HTTPException, APIException):
+        raise
+    except Exception as e:
+        logger.error(f"Direct upload creation failed: {str(e)}")
+        raise HTTPException(status_code=500, detail="Upload failed")
+
+
+@router.post(
+    "/presigned-upload/{upload_id}/complete", response_model=FileUploadResponse
+)
+async def complete_direct_upload(
+    upload_id: str,
+    response: Response,
+    user_id: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Register a direct upload once its PUT has succeeded.
+
+    The object's size and checksum are checked against what was declared;
+    202 while its virus scan is pending. 409 if the object is not there yet.
+    """
+    try:
+        file_service = FileService(db)
+        result = await file_service.complete_direct_upload(upload_id, user_id)
+        if result["scan_status"] == ScanStatus.PENDING:
+            response.status_code = 202
+        return result
+    except (HTTPException, APIException):
+        raise
+    except Exception as e:
+        logger.error(f"Direct upload completion failed: {str(e)}")
+        raise HTTPException(status_code=500, detail="Upload failed")
+
+
 @router.get("/list", response_model=FileListResponse)
 async def list_files(
+    cursor: Optional[str] = Query(None, max_length=200),
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
+    urls: bool = Query(False, description="Include presigned download URLs"),
     user_id: str = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """List user files with pagination."""
+    """List user files, newest first.
+
+    Follow ``next_cursor`` for the next page; ``skip`` still works but
+    deep offsets are slow.
+    """
     try:
         file_service = FileService(db)
-        result = await file_service.list_files(user_id, skip, limit)
+        result = await file_service.list_files(
+            user_id, limit, cursor, skip, with_urls=urls
+        )
         return result
+    except (HTTPException, APIException):
+        raise
     except Exception as e:
         logger.error(f"List files failed: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to list files")
@@ -75,21 +262,157 @@ async def get_file_metadata(
     """Get file metadata."""
     try:
         file_service = FileService(db)
-        metadata = await file_service.get_file_metadata(file_id, user_id)
+        file_record = await file_service.get_file(file_id, user_id)
 
-        presigned_url = await file_service.get_presigned_download_url(file_id, user_id)
+        presigned_url = None
+        if file_record.scan_status == ScanStatus.CLEAN:
+            presigned_url, _ = await file_service.get_presigned_download_url(
+                file_record
+            )
 
         return FileDownloadResponse(
-            filename=metadata["filename"],
-            file_size=metadata["file_size"],
-            content_type=metadata["content_type"],
+            filename=file_record.original_filename,
+            file_size=file_record.file_size,
+            content_type=file_record.content_type,
+            scan_status=file_record.scan_status,
+            preview_status=file_record.preview_status,
             download_url=presigned_url,
         )
+    except (HTTPException, APIException):
+        raise
     except Exception as e:
         logger.error(f"Get metadata failed: {str(e)}")
         raise HTTPException(status_code=404, detail="File not found")
 
 
+@router.get("/{file_id}/content")
+async def download_file_content(
+    file_id: int,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_none_match: Optional[str] = Header(None),
+    if_range: Optional[str] = Header(None),
+    user_id: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Stream file content through the API.
+
+    Supports single-range ``Range`` requests (206, forwarded to storage as
+    a ranged GET) and ``If-None-Match``/``If-Range`` against the content
+    hash, so media players can seek and downloads can resume.
+    """
+    try:
+        file_service = FileService(db)
+        file_record = await file_service.get_file(file_id, user_id)
+        size = file_record.file_size
+        ensure_clean(file_record.scan_status)
+        etag = f'"{file_record.file_hash}"'
+        headers = {"ETag": etag, "Accept-Ranges": "bytes"}
+
+        if if_none_match and etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+
+        byte_range = None
+        if range_header and (not if_range or etag_matches(if_range, etag)):
+            byte_range = parse_range_header(range_header, size)
+
+        stream = await file_service.open_file_stream(file_record, byte_range)
+    except RangeNotSatisfiableError:
+        raise HTTPException(
+            status_code=416,
+            detail="Range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    except (HTTPException, APIException):
+        raise
+    except Exception as e:
+        logger.error(f"Download failed: {str(e)}")
+        raise HTTPException(status_code=500, detail="Download failed")
+
+    headers["Content-Disposition"] = (
+        f"attachment; filename*=UTF-8''{quote(file_record.original_filename)}"
+    )
+    if byte_range:
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        headers["Content-Length"] = str(end - start + 1)
+        status_code = 206
+    else:
+        headers["Content-Length"] = str(size)
+        status_code = 200
+
+    return ObjectStreamResponse(
+        stream,
+        status_code=status_code,
+        media_type=file_record.content_type,
+        headers=headers,
+    )
+
+
+@router.get("/{file_id}/derivatives/{variant}")
+async def download_derivative(
+    file_id: int,
+    variant: Derivative,
+    if_none_match: Optional[str] = Header(None),
+    user_id: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Thumbnail or first-page preview of an image or PDF, as WebP.
+
+    404 unless the file's ``preview_status`` is ready. A file's derivatives
+    never change, so they can be cached privately for a long time.
+    """
+    try:
+        file_service = FileService(db)
+        file_record = await file_service.get_file(file_id, user_id)
+        ensure_clean(file_record.scan_status)
+        etag = f'"{file_record.file_hash}-{variant.value}"'
+        headers = {"ETag": etag, "Cache-Control": "private, max-age=86400"}
+
+        if if_none_match and etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+
+        stream = await file_service.open_derivative(file_record, variant)
+    except (HTTPException, APIException):
+        raise
+    except Exception as e:
+        logger.error(f"Preview download failed: {str(e)}")
+        raise HTTPException(status_code=500, detail="Download failed")
+
+    return ObjectStreamResponse(stream, media_type="image/webp", headers=headers)
+
+
+@router.post("/archive")
+async def download_archive(
+    archive: ArchiveRequest,
+    user_id: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Download several files as one ZIP archive, streamed as it is built.
+
+    All files must belong to the user and have passed the virus scan;
+    otherwise nothing is sent. Already-compressed formats are stored,
+    the rest deflated.
+    """
+    try:
+        chunks = await FileService(db).open_archive(archive.file_ids, user_id)
+    except (HTTPException, APIException):
+        raise
+    except Exception as e:
+        logger.error(f"Archive download failed: {str(e)}")
+        raise HTTPException(status_code=500, detail="Download failed")
+
+    filename = archive.filename
+    if not filename.lower().endswith(".zip"):
+        filename += ".zip"
+    return StreamingResponse(
+        chunks,
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f"attachment; filename*=UTF-8''{quote(filename)}"
+        },
+    )
+
+
 @router.delete("/{file_id}", response_model=FileDeleteResponse)
 async def delete_file(
     file_id: int,
@@ -99,18 +422,46 @@ async def delete_file(
     """Delete a file."""
     try:
         file_service = FileService(db)
-        metadata = await file_service.get_file_metadata(file_id, user_id)
-        await file_service.delete_file(file_id, user_id)
+        file_record = await file_service.get_file(file_id, user_id)
+        await file_service.delete_file(file_record)
 
         return FileDeleteResponse(
             message="File deleted successfully",
-            filename=metadata["filename"],
+            filename=file_record.original_filename,
         )
+    except (HTTPException, APIException):
+        raise
     except Exception as e:
         logger.error(f"Delete failed: {str(e)}")
         raise HTTPException(status_code=404, detail="File not found")
 
 
+@router.post("/batch-delete", response_model=BatchDeleteResponse)
+async def delete_files(
+    batch: BatchDeleteRequest,
+    user_id: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Delete up to BATCH_DELETE_MAX_FILES files in one request.
+
+    Only marks the files deleted; their objects are removed from storage
+    in the background.
+    """
+    try:
+        deleted = await FileService(db).delete_files(batch.file_ids, user_id)
+    except (HTTPException, APIException):
+        raise
+    except Exception as e:
+        logger.error(f"Batch delete failed: {str(e)}")
+        raise HTTPException(status_code=500, detail="Delete failed")
+
+    gone = set(deleted)
+    return BatchDeleteResponse(
+        deleted=deleted,
+        not_found=[i for i in dict.fromkeys(batch.file_ids) if i not in gone],
+    )
+
+
 @router.post("/presigned-download/{file_id}", response_model=PresignedURLResponse)
 async def get_presigned_download_url(
     file_id: int,
@@ -121,17 +472,19 @@ async def get_presigned_download_url(
     """Generate presigned download URL."""
     try:
         file_service = FileService(db)
-        metadata = await file_service.get_file_metadata(file_id, user_id)
-        url = await file_service.get_presigned_download_url(
-            file_id, user_id, expires_in
+        file_record = await file_service.get_file(file_id, user_id)
+        url, remaining = await file_service.get_presigned_download_url(
+            file_record, expires_in
         )
 
         return PresignedURLResponse(
             url=url,
-            filename=metadata["filename"],
-            expires_in=expires_in,
+            filename=file_record.original_filename,
+            expires_in=remaining,
             url_type="download",
         )
+    except (HTTPException, APIException):
+        raise
     except Exception as e:
         logger.error(f"Presigned URL generation failed: {str(e)}")
         raise HTTPException(status_code=404, detail="File not found")
@@ -0,0 +1,130 @@
+"""
+Presigned URL target for LocalFSStorage (STORAGE_TYPE=local).
+
+S3 and MinIO serve their presigned URLs themselves; with local storage this
+route plays that part. Requests carry no credentials, only the URL's
+signature, which covers the method, the key, the expiry and (for uploads)
+the content type and SHA-256 the client committed to.
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response
+
+from app.core.config import settings
+from app.core.exceptions import (
+    APIException,
+    FileTooLargeError,
+    RangeNotSatisfiableError,
+)
+from app.core.storage import storage
+from app.utils.file_response import ObjectStreamResponse
+from app.utils.http_utils import parse_range_header
+from app.utils.logger import setup_logger
+from app.utils.streaming import limit_stream
+
+logger = setup_logger(__name__)
+
+router = APIRouter()
+
+
+def _verify(method: str, key: str, expires: int, signature: str, **extra) -> None:
+    if not storage.verify_signature(method, key, expires, signature, **extra):
+        raise HTTPException(status_code=403, detail="Invalid or expired signature")
+
+
+@router.api_route("/{key:path}", methods=["GET", "HEAD"])
+async def get_object(
+    key: str,
+    request: Request,
+    expires: int = Query(...),
+    signature: str = Query(...),
+    range_header: Optional[str] = Header(None, alias="Range"),
+):
+    """Serve an object for a presigned download URL (Range supported)."""
+    _verify("GET", key, expires, signature)
+    info = await storage.stat_file(key)
+    if info is None:
+        raise HTTPException(status_code=404, detail="Object not found")
+
+    headers = {"Accept-Ranges": "bytes"}
+    if info.sha256:
+        headers["ETag"] = f'"{info.sha256}"'
+    byte_range = None
+    try:
+        if range_header:
+            byte_range = parse_range_header(range_header, info.size)
+    except RangeNotSatisfiableError:
+        raise HTTPException(
+            status_code=416,
+            detail="Range not satisfiable",
+            headers={"Content-Range": f"bytes */{info.size}"},
+        )
+    if byte_range:
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{info.size}"
+        headers["Content-Length"] = str(end - start + 1)
+        status_code = 206
+    else:
+        headers["Content-Length"] = str(info.size)
+        status_code = 200
+
+    if request.method == "HEAD":
+        return Response(
+            status_code=status_code, media_type=info.content_type, headers=headers
+        )
+    start, end = byte_range or (None, None)
+    stream = await storage.open_stream(key, start, end)
+    return ObjectStreamResponse(
+        stream,
+        status_code=status_code,
+        media_type=info.content_type,
+        headers=headers,
+    )
+
+
+@router.put("/{key:path}")
+async def put_object(
+    key: str,
+    request: Request,
+    expires: int = Query(...),
+    signature: str = Query(...),
+    content_type: str = Query(""),
+    sha256: str = Query(""),
+):
+    """Store the body for a presigned upload URL.
+
+    Like S3, a Content-Type other than the signed one is refused, and a body
+    not matching the signed SHA-256 is rejected without being stored. Like
+    the upload endpoints, bodies over MAX_FILE_SIZE are cut off with a 413.
+    """
+    _verify(
+        "PUT", key, expires, signature, content_type=content_type, sha256=sha256
+    )
+    body_type = request.headers.get("content-type") or "application/octet-stream"
+    if content_type and body_type != content_type:
+        raise HTTPException(
+            status_code=403, detail="Content-Type does not match the signed URL"
+        )
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit():
+        if int(content_length) > settings.MAX_FILE_SIZE:
+            raise FileTooLargeError(
+                f"File size exceeds maximum {settings.MAX_FILE_SIZE}"
+            )
+    try:
+        # request.stream() raises on a disconnect, so a cut-off body is
+        # discarded rather than stored as the whole object; so is one
+        # that turns out too large (chunked, or a lying Content-Length)
+        await storage.upload_stream(
+            key,
+            limit_stream(request.stream(), settings.MAX_FILE_SIZE),
+            content_type=body_type,
+            sha256=sha256,
+        )
+    except (HTTPException, APIException):
+        raise
+    except Exception as e:
+        logger.error(f"Local storage upload failed: {str(e)}")
+        raise HTTPException(status_code=500, detail="Upload failed")
+    return Response(status_code=200)
@@ -0,0 +1,168 @@
+from datetime import timezone
+from email.utils import format_datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.deps import get_current_user
+from app.core.config import settings
+from app.core.exceptions import APIException
+from app.db.session import get_db
+from app.models.file import ScanStatus
+from app.models.upload_session import UploadSession
+from app.services.resumable_upload_service import ResumableUploadService
+from app.utils.http_utils import parse_upload_metadata
+from app.utils.logger import setup_logger
+from app.utils.streaming import iter_request_body
+
+logger = setup_logger(__name__)
+
+router = APIRouter()
+
+TUS_VERSION = "1.0.0"
+TUS_HEADERS = {"Tus-Resumable": TUS_VERSION}
+
+
+def _session_headers(session: UploadSession) -> dict:
+    expires = session.expires_at.replace(tzinfo=timezone.utc)
+    return {
+        **TUS_HEADERS,
+        "Upload-Offset": str(session.offset),
+        "Upload-Length": str(session.upload_length),
+        "Upload-Expires": format_datetime(expires, usegmt=True),
+        "Cache-Control": "no-store",
+    }
+
+
+@router.options("")
+async def tus_options():
+    """tus capability discovery."""
+    return Response(
+        status_code=204,
+        headers={
+            **TUS_HEADERS,
+            "Tus-Version": TUS_VERSION,
+            "Tus-Extension": "creation,termination,expiration",
+            "Tus-Max-Size": str(settings.MAX_FILE_SIZE),
+        },
+    )
+
+
+@router.post("", status_code=201)
+async def create_upload(
+    request: Request,
+    upload_length: int = Header(..., ge=0),
+    upload_metadata: Optional[str] = Header(None),
+    user_id: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Start a resumable upload (tus creation).
+
+    ``Upload-Metadata`` carries ``filename`` (required), and optionally
+    ``filetype`` and ``description``, base64-encoded.
+    """
+    metadata = parse_upload_metadata(upload_metadata or "")
+    filename = metadata.get("filename", "")
+    if not 0 < len(filename) <= 255:
+        raise HTTPException(
+            status_code=400, detail="Upload-Metadata must include a filename"
+        )
+    try:
+        service = ResumableUploadService(db)
+        session = await service.create_upload(
+            filename,
+            upload_length,
+            user_id,
+            metadata.get("filetype") or "application/octet-stream",
+            metadata.get("description"),
+        )
+    except (HTTPException, APIException):
+        raise
+    except Exception as e:
+        logger.error(f"Upload creation failed: {str(e)}")
+        raise HTTPException(status_code=500, detail="Upload failed")
+
+    headers = _session_headers(session)
+    headers["Location"] = str(request.url_for("upload_status", upload_id=session.id))
+    return Response(status_code=201, headers=headers)
+
+
+@router.head("/{upload_id}", name="upload_status")
+async def upload_status(
+    upload_id: str,
+    user_id: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Acknowledged offset; clients resume from ``Upload-Offset``."""
+    try:
+        session = await ResumableUploadService(db).get_upload(upload_id, user_id)
+    except (HTTPException, APIException):
+        raise
+    except Exception as e:
+        logger.error(f"Upload status failed: {str(e)}")
+        raise HTTPException(status_code=500, detail="Upload failed")
+    return Response(status_code=200, headers=_session_headers(session))
+
+
+@router.patch("/{upload_id}")
+async def append_upload(
+    upload_id: str,
+    request: Request,
+    upload_offset: int = Header(..., ge=0),
+    content_type: Optional[str] = Header(None),
+    user_id: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Append bytes at ``Upload-Offset``.
+
+    Returns 204 with the new offset, or for the final PATCH the file
+    record (200, or 202 while its scan is pending).
+    """
+    if content_type != "application/offset+octet-stream":
+        raise HTTPException(
+            status_code=415,
+            detail="Content-Type must be application/offset+octet-stream",
+        )
+    try:
+        service = ResumableUploadService(db)
+        session, result = await service.append(
+            upload_id, user_id, upload_offset, iter_request_body(request)
+        )
+    except (HTTPException, APIException):
+        raise
+    except Exception as e:
+        logger.error(f"Upload append failed: {str(e)}")
+        raise HTTPException(status_code=500, detail="Upload failed")
+
+    headers = {**TUS_HEADERS, "Upload-Offset": str(session.upload_length)}
+    if result is None:
+        headers["Upload-Offset"] = str(session.offset)
+        return Response(status_code=204, headers=headers)
+
+    # Same body as POST /upload
+    pending = result["scan_status"] == ScanStatus.PENDING
+    return JSONResponse(
+        status_code=202 if pending else 200,
+        content=jsonable_encoder(result),
+        headers=headers,
+    )
+
+
+@router.delete("/{upload_id}", status_code=204)
+async def terminate_upload(
+    upload_id: str,
+    user_id: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Cancel an upload and discard its stored bytes (tus termination)."""
+    try:
+        await ResumableUploadService(db).terminate(upload_id, user_id)
+    except (HTTPException, APIException):
+        raise
+    except Exception as e:
+        logger.error(f"Upload termination failed: {str(e)}")
+        raise HTTPException(status_code=500, detail="Upload failed")
+    return Response(status_code=204, headers=TUS_HEADERS)
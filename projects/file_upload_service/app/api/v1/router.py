@@ -1,7 +1,15 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import files
+from app.api.v1.endpoints import files, uploads
+from app.core.config import settings
 
 router = APIRouter()
 
+router.include_router(uploads.router, prefix="/files/uploads", tags=["uploads"])
 router.include_router(files.router, prefix="/files", tags=["files"])
+
+if settings.STORAGE_TYPE.lower() == "local":
+    # Target of LocalFSStorage's presigned URLs
+    from app.api.v1.endpoints import storage
+
+    router.include_router(storage.router, prefix="/storage", tags=["storage"])
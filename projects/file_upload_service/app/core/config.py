@@ -25,6 +25,14 @@ class Settings(BaseSettings):
     CLAMAV_HOST: str = "localhost"
     CLAMAV_PORT: int = 3310
     ENABLE_VIRUS_SCAN: bool = True
+    CLAMAV_POOL_SIZE: int = 16  # Concurrent INSTREAM connections per worker
+    CLAMAV_IDLE_TIMEOUT: float = 25.0  # Keep below clamd's IdleTimeout (30s)
+    CLAMAV_VERSION_CHECK_INTERVAL: int = 300  # Seconds between signature checks
+    SCAN_CACHE_SIZE: int = 100000  # Cached verdicts (by content hash)
+    SCAN_MODE: str = "sync"  # sync, or async (202 now, scan in background)
+    SCAN_WORKERS: int = 4  # Background scan workers per process
+    SCAN_QUEUE_SIZE: int = 1000
+    SCAN_SWEEP_INTERVAL: int = 60  # Seconds between pending_scan recovery sweeps
 
     # JWT
     SECRET_KEY: str
@@ -34,9 +42,41 @@ class Settings(BaseSettings):
     # Upload Limits
     MAX_FILE_SIZE: int = 104857600  # 100MB
     ALLOWED_EXTENSIONS: str = "pdf,jpg,jpeg,png,txt,doc,docx,xls,xlsx,zip"
+    UPLOAD_CHUNK_SIZE: int = 1048576  # 1MB read from the request per step
+    DOWNLOAD_CHUNK_SIZE: int = 1048576  # 1MB read from storage per step
+    STORAGE_PART_SIZE: int = 8388608  # 8MB multipart part (S3 minimum is 5MB)
+    STORAGE_UPLOAD_CONCURRENCY: int = 4  # Parts in flight per upload
+    STORAGE_PART_RETRIES: int = 3  # Attempts per part before aborting
+    STORAGE_IO_THREADS: int = 16  # SDK call threads = HTTP connections per worker
+    CONTENT_ADDRESSED_STORAGE: bool = False  # Share one object per SHA-256
+    BLOB_GC_INTERVAL: int = 300  # Seconds between unreferenced blob sweeps
+    OBJECT_GC_INTERVAL: int = 60  # Seconds between deleted-file object sweeps
+    OBJECT_GC_RETRIES: int = 3  # Attempts per multi-object delete batch
+    ORPHAN_SCAN_INTERVAL: int = 86400  # Seconds between bucket scans; 0 = never
+    ORPHAN_MIN_AGE: int = 172800  # Untracked objects younger than this are kept
+    BATCH_DELETE_MAX_FILES: int = 1000  # Files per batch delete request
+    RESUMABLE_UPLOAD_EXPIRY: int = 86400  # Seconds a resumable upload stays open
+    UPLOAD_EXPIRY_INTERVAL: int = 600  # Seconds between expired upload sweeps
+    FILE_CACHE_SIZE: int = 10000  # File rows cached per worker
+    FILE_CACHE_TTL: float = 5.0  # Seconds; other workers may see stale rows this long
+    ARCHIVE_MAX_FILES: int = 1000  # Files per ZIP download
+    ARCHIVE_PREFETCH_FILES: int = 4  # Files fetched from storage ahead of the ZIP
+
+    # Thumbnails and previews (images, first page of PDFs)
+    DERIVATIVES_ENABLED: bool = True
+    DERIVATIVE_WORKERS: int = 2  # Rendering processes per worker process
+    DERIVATIVE_QUEUE_SIZE: int = 1000
+    DERIVATIVE_SWEEP_INTERVAL: int = 60  # Seconds between pending preview sweeps
+    DERIVATIVE_MAX_SOURCE_SIZE: int = 52428800  # 50MB; larger files get none
+    DERIVATIVE_MAX_PIXELS: int = 50000000  # Larger images are never decoded
+    THUMBNAIL_SIZE: int = 256  # Longest side in pixels
+    PREVIEW_SIZE: int = 1024  # Longest side in pixels
+    DERIVATIVE_QUALITY: int = 80  # WebP quality (0-100)
 
     # Presigned URL
     PRESIGNED_URL_EXPIRATION: int = 3600  # 1 hour
+    PRESIGNED_URL_CACHE_SIZE: int = 10000  # Download URLs reused per worker
+    PRESIGNED_URL_MIN_REMAINING: float = 0.5  # Reuse while this much lifetime left
 
     class Config:
         env_file = ".env"
@@ -46,8 +86,19 @@ class Settings(BaseSettings):
     def allowed_extensions_list(self) -> List[str]:
         """Parse allowed extensions."""
         return [ext.strip().lower() for ext in self.ALLOWED_EXTENSIONS.split(",")]
-    # Storage Backend (minio for dev, s3 for prod)
-    STORAGE_TYPE: str = "minio"  # minio or s3
+    # Storage Backend (minio for dev, s3 for prod, local for one node/tests)
+    STORAGE_TYPE: str = "minio"  # minio, s3 or local
+
+    # Local filesystem storage (STORAGE_TYPE=local)
+    LOCAL_STORAGE_PATH: str = "./data/objects"
+    # Public base of the /storage route that serves presigned local URLs
+    LOCAL_STORAGE_URL: str = "http://localhost:8000/api/v1/storage"
+
+    # Read-through disk cache in front of minio/s3 (not used with local)
+    STORAGE_CACHE_ENABLED: bool = False
+    STORAGE_CACHE_PATH: str = "./data/cache"
+    STORAGE_CACHE_SIZE: int = 10737418240  # 10GB of cached objects per worker
+    STORAGE_CACHE_MAX_OBJECT_SIZE: int = 104857600  # Larger objects bypass it
 
     # AWS S3 / Digital Ocean Spaces
     AWS_ACCESS_KEY_ID: str = ""
@@ -59,5 +110,16 @@ class Settings(BaseSettings):
     # VirusTotal API (alternative to ClamAV)
     VIRUSOTAL_API_KEY: str = ""
 
+    # Metrics
+    METRICS_ENABLED: bool = True
+
+    # Readiness (GET /ready)
+    READINESS_TIMEOUT: float = 2.0  # Seconds per dependency check
+
+    # Event loop monitor (opt-in)
+    LOOP_MONITOR_ENABLED: bool = False
+    LOOP_MONITOR_INTERVAL_MS: int = 50
+    LOOP_BLOCK_THRESHOLD_MS: int = 100
+
 
 settings = Settings()
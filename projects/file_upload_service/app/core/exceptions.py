@@ -13,6 +13,14 @@ class ErrorCode(str, Enum):
     UNAUTHORIZED = "UNAUTHORIZED"
     DATABASE_ERROR = "DATABASE_ERROR"
     STORAGE_ERROR = "STORAGE_ERROR"
+    RANGE_NOT_SATISFIABLE = "RANGE_NOT_SATISFIABLE"
+    SCAN_PENDING = "SCAN_PENDING"
+    FILE_QUARANTINED = "FILE_QUARANTINED"
+    UPLOAD_OFFSET_MISMATCH = "UPLOAD_OFFSET_MISMATCH"
+    UPLOAD_EXPIRED = "UPLOAD_EXPIRED"
+    UPLOAD_INCOMPLETE = "UPLOAD_INCOMPLETE"
+    CHECKSUM_MISMATCH = "CHECKSUM_MISMATCH"
+    INVALID_CURSOR = "INVALID_CURSOR"
 
 
 class APIException(Exception):
@@ -49,6 +57,16 @@ class VirusDetectedError(APIException):
         super().__init__(400, detail, ErrorCode.VIRUS_DETECTED)
 
 
+class ScanPendingError(APIException):
+    def __init__(self, detail: str = "File is waiting for a virus scan"):
+        super().__init__(409, detail, ErrorCode.SCAN_PENDING)
+
+
+class FileQuarantinedError(APIException):
+    def __init__(self, detail: str = "File is quarantined"):
+        super().__init__(403, detail, ErrorCode.FILE_QUARANTINED)
+
+
 class UploadFailedError(APIException):
     def __init__(self, detail: str = "Upload failed"):
         super().__init__(500, detail, ErrorCode.UPLOAD_FAILED)
@@ -59,6 +77,36 @@ class DownloadFailedError(APIException):
         super().__init__(500, detail, ErrorCode.DOWNLOAD_FAILED)
 
 
+class RangeNotSatisfiableError(APIException):
+    def __init__(self, detail: str = "Range not satisfiable"):
+        super().__init__(416, detail, ErrorCode.RANGE_NOT_SATISFIABLE)
+
+
+class UploadOffsetMismatchError(APIException):
+    def __init__(self, detail: str = "Upload-Offset does not match the upload"):
+        super().__init__(409, detail, ErrorCode.UPLOAD_OFFSET_MISMATCH)
+
+
+class UploadExpiredError(APIException):
+    def __init__(self, detail: str = "Upload session expired"):
+        super().__init__(410, detail, ErrorCode.UPLOAD_EXPIRED)
+
+
+class UploadIncompleteError(APIException):
+    def __init__(self, detail: str = "Upload has not been received"):
+        super().__init__(409, detail, ErrorCode.UPLOAD_INCOMPLETE)
+
+
+class ChecksumMismatchError(APIException):
+    def __init__(self, detail: str = "Uploaded content does not match"):
+        super().__init__(422, detail, ErrorCode.CHECKSUM_MISMATCH)
+
+
+class InvalidCursorError(APIException):
+    def __init__(self, detail: str = "Invalid pagination cursor"):
+        super().__init__(400, detail, ErrorCode.INVALID_CURSOR)
+
+
 class UnauthorizedError(APIException):
     def __init__(self, detail: str = "Unauthorized"):
         super().__init__(401, detail, ErrorCode.UNAUTHORIZED)
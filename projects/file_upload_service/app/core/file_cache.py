@@ -0,0 +1,65 @@
+"""
+Short-lived in-process cache of ``File`` rows.
+
+How it works:
+- Metadata, content and presign requests look a file up by ID; hot files
+  are served from here instead of the database for FILE_CACHE_TTL seconds
+- Entries are column snapshots, not ORM objects, so nothing is shared
+  between database sessions; each lookup gets its own detached ``File``
+- FileRepository drops the entry whenever it updates or deletes the row
+
+Invalidation is per process. Another worker may keep serving the old row
+until the TTL runs out, so keep the TTL short (a few seconds). Scan
+workers read the database directly, never through this cache.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.core.config import settings
+from app.core.metrics import FILE_CACHE
+from app.models.file import File
+
+_COLUMNS = tuple(column.key for column in File.__table__.columns)
+
+
+class FileCache:
+    """LRU of live ``File`` rows by ID, each valid for ``ttl`` seconds."""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # file_id -> (expires_at, column values)
+        self._entries: OrderedDict = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def get(self, file_id: int) -> Optional[File]:
+        if not self.enabled:
+            return None
+        entry = self._entries.get(file_id)
+        if entry is None or entry[0] < time.monotonic():
+            FILE_CACHE.labels(result="miss").inc()
+            return None
+        self._entries.move_to_end(file_id)
+        FILE_CACHE.labels(result="hit").inc()
+        return File(**entry[1])
+
+    def put(self, file_record: File) -> None:
+        if not self.enabled:
+            return
+        values = {key: getattr(file_record, key) for key in _COLUMNS}
+        self._entries[file_record.id] = (time.monotonic() + self.ttl, values)
+        self._entries.move_to_end(file_record.id)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, file_id: int) -> None:
+        self._entries.pop(file_id, None)
+
+
+# Singleton instance
+file_cache = FileCache(settings.FILE_CACHE_SIZE, settings.FILE_CACHE_TTL)
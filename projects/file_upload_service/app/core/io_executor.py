@@ -0,0 +1,122 @@
+"""
+Bounded thread pool for blocking storage SDK calls.
+
+Why a dedicated pool (not asyncio.to_thread)?
+- minio and boto3 are synchronous; calling them from ``async def`` holds the
+  event loop for the whole network transfer
+- The default executor is shared with everything else in the process and
+  sized from the CPU count, not from how many transfers we want in flight
+- Threads and the SDK's HTTP connection pool are sized from the same
+  setting (STORAGE_IO_THREADS), so a thread never waits for a connection
+- Busy threads, queued calls and queue wait time are exported on /metrics;
+  a non-zero queue means the pool is saturated
+
+Usage:
+    from app.core.io_executor import run_in_storage_pool
+
+    await run_in_storage_pool(client.remove_object, bucket, name)
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from app.core.config import settings
+from app.core.metrics import (
+    REGISTRY,
+    STORAGE_IO_BUSY_THREADS,
+    STORAGE_IO_POOL_SIZE,
+    STORAGE_IO_QUEUED_CALLS,
+    STORAGE_IO_WAIT_SECONDS,
+)
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+T = TypeVar("T")
+
+
+class InstrumentedExecutor:
+    """ThreadPoolExecutor that tracks its own saturation."""
+
+    def __init__(self, max_workers: int, thread_name_prefix: str = "storage-io"):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=thread_name_prefix
+        )
+        # Only touched on the event loop thread, so no lock is needed
+        self.in_flight = 0
+
+    @property
+    def busy(self) -> int:
+        return min(self.in_flight, self.max_workers)
+
+    @property
+    def queued(self) -> int:
+        return max(0, self.in_flight - self.max_workers)
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run ``fn`` on a pool thread and await its result."""
+        loop = asyncio.get_running_loop()
+        submitted = time.perf_counter()
+        started = [submitted]
+
+        def call() -> T:
+            started[0] = time.perf_counter()
+            return fn(*args, **kwargs)
+
+        def done() -> None:
+            # Counted when the thread finishes, not when the caller stops
+            # waiting: a cancelled await does not free the thread.
+            self.in_flight -= 1
+            STORAGE_IO_WAIT_SECONDS.observe(started[0] - submitted)
+
+        self.in_flight += 1
+        future = self._executor.submit(call)
+        future.add_done_callback(
+            lambda _: loop.is_closed() or loop.call_soon_threadsafe(done)
+        )
+        return await asyncio.wrap_future(future, loop=loop)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+# Lazy singleton - created on first storage call
+_storage_executor: Optional[InstrumentedExecutor] = None
+
+
+def get_storage_executor() -> InstrumentedExecutor:
+    """Get the storage I/O pool, creating it on first use."""
+    global _storage_executor
+
+    if _storage_executor is None:
+        _storage_executor = InstrumentedExecutor(settings.STORAGE_IO_THREADS)
+        logger.info(f"Storage I/O pool: {settings.STORAGE_IO_THREADS} threads")
+    return _storage_executor
+
+
+async def run_in_storage_pool(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking storage SDK call without holding the event loop."""
+    return await get_storage_executor().run(fn, *args, **kwargs)
+
+
+async def shutdown_storage_executor() -> None:
+    """Wait for in-flight storage calls and stop the pool. Call on shutdown."""
+    global _storage_executor
+
+    if _storage_executor is not None:
+        executor, _storage_executor = _storage_executor, None
+        await asyncio.to_thread(executor.shutdown)
+
+
+def _collect_pool_gauges() -> None:
+    if _storage_executor is None:
+        return
+    STORAGE_IO_POOL_SIZE.set(_storage_executor.max_workers)
+    STORAGE_IO_BUSY_THREADS.set(_storage_executor.busy)
+    STORAGE_IO_QUEUED_CALLS.set(_storage_executor.queued)
+
+
+REGISTRY.add_collector(_collect_pool_gauges)
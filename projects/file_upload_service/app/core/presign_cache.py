@@ -0,0 +1,86 @@
+"""
+Reuse of presigned download URLs.
+
+How it works:
+- URLs are cached per worker by (object key, requested lifetime)
+- A cached URL is handed out again while more than
+  PRESIGNED_URL_MIN_REMAINING of its lifetime is left; after that a new
+  one is signed. Callers get the URL's real remaining lifetime
+- Listing pages presign all their files in one call; only the misses are
+  signed, concurrently
+
+Why? A stable URL per file lets browsers and CDNs cache the download,
+and repeated metadata reads stop paying for a signature each time.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import PRESIGN_CACHE
+from app.core.storage import storage
+
+
+class PresignedURLCache:
+    """LRU of presigned download URLs with expiry-aware reuse."""
+
+    def __init__(self, max_entries: int, min_remaining: float):
+        self.max_entries = max_entries
+        self.min_remaining = min_remaining
+        # (file_name, expiration) -> (url, expires_at wall clock)
+        self._entries: OrderedDict = OrderedDict()
+
+    def _lookup(self, key: Tuple[str, int]) -> Optional[Tuple[str, int]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        url, expires_at = entry
+        remaining = expires_at - time.time()
+        if remaining <= key[1] * self.min_remaining:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return url, int(remaining)
+
+    def _store(self, key: Tuple[str, int], url: str, expires_at: float) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (url, expires_at)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def download_url(
+        self, file_name: str, expiration: int = None
+    ) -> Tuple[str, int]:
+        """Presigned GET for an object: (url, seconds it stays valid)."""
+        expiration = expiration or settings.PRESIGNED_URL_EXPIRATION
+        key = (file_name, expiration)
+        cached = self._lookup(key)
+        if cached is not None:
+            PRESIGN_CACHE.labels(result="hit").inc()
+            return cached
+
+        PRESIGN_CACHE.labels(result="miss").inc()
+        expires_at = time.time() + expiration
+        url = await storage.get_presigned_download_url(file_name, expiration)
+        self._store(key, url, expires_at)
+        return url, expiration
+
+    async def download_urls(
+        self, file_names: Iterable[str], expiration: int = None
+    ) -> Dict[str, str]:
+        """Presigned GETs for many objects (a listing page), by object key."""
+        names = list(dict.fromkeys(file_names))
+        results = await asyncio.gather(
+            *(self.download_url(name, expiration) for name in names)
+        )
+        return {name: url for name, (url, _) in zip(names, results)}
+
+
+# Singleton instance
+presigned_urls = PresignedURLCache(
+    settings.PRESIGNED_URL_CACHE_SIZE, settings.PRESIGNED_URL_MIN_REMAINING
+)
@@ -0,0 +1,81 @@
+"""
+Process pool for CPU-bound work (thumbnail and preview rendering).
+
+Why processes, not the storage I/O pool or asyncio.to_thread?
+- Decoding and resizing images holds the GIL for long stretches; in a
+  thread it would still stall the event loop of this worker
+- The decoders are native code fed with user uploads. A crash takes down
+  one pool process, which is replaced, instead of the server
+- Processes are started with ``spawn``: forking a process that already
+  runs an event loop and SDK threads can copy held locks into the child
+- Each process is replaced after MAX_TASKS_PER_CHILD jobs, which gives
+  back memory fragmented by large images
+
+Only module-level functions with picklable arguments can be submitted.
+
+Usage:
+    from app.core.process_pool import run_in_process_pool
+
+    thumbs = await run_in_process_pool(render_derivatives, data, ...)
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional, TypeVar
+
+from app.core.config import settings
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+T = TypeVar("T")
+
+MAX_TASKS_PER_CHILD = 100
+
+# Lazy singleton - created on first use; processes start as jobs arrive
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Get the process pool, creating it on first use."""
+    global _process_pool
+
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(
+            max_workers=settings.DERIVATIVE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            max_tasks_per_child=MAX_TASKS_PER_CHILD,
+        )
+        logger.info(f"Process pool: {settings.DERIVATIVE_WORKERS} processes")
+    return _process_pool
+
+
+async def run_in_process_pool(fn: Callable[..., T], *args: Any) -> T:
+    """Run ``fn(*args)`` in a pool process and await its result.
+
+    Raises BrokenProcessPool if a process died during the call; the pool
+    is then replaced on the next call.
+    """
+    global _process_pool
+
+    pool = get_process_pool()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+    except BrokenProcessPool:
+        # Every job in flight fails with it; the executor is unusable now
+        if _process_pool is pool:
+            _process_pool = None
+            logger.error("Process pool broken (a process died); replacing it")
+            pool.shutdown(wait=False, cancel_futures=True)
+        raise
+
+
+async def shutdown_process_pool() -> None:
+    """Stop the pool processes. Call on shutdown."""
+    global _process_pool
+
+    if _process_pool is not None:
+        pool, _process_pool = _process_pool, None
+        await asyncio.to_thread(pool.shutdown, wait=True, cancel_futures=True)
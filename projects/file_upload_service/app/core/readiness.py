@@ -0,0 +1,56 @@
+"""
+Readiness checks for ``GET /ready``.
+
+How it works:
+- ``/health`` only reports that the process is up (liveness) and touches
+  no other service, so a slow dependency never gets a worker restarted
+- ``/ready`` checks the database, storage and (with scanning on) clamd
+  concurrently, each bounded by READINESS_TIMEOUT
+- The worker is ready when the database and storage are. clamd is
+  reported but not required: without it uploads are stored pending_scan
+  and scanned once it is back
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Tuple
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.storage import storage
+from app.core.virus_scanner import virus_scanner
+from app.db.session import engine
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+async def _ping_database() -> None:
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def _check(name: str, check: Callable[[], Awaitable[None]]) -> str:
+    try:
+        await asyncio.wait_for(check(), settings.READINESS_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning(f"Readiness check {name} timed out")
+        return "timeout"
+    except Exception as e:
+        logger.warning(f"Readiness check {name} failed: {e}")
+        return f"error: {e}"
+    return "ok"
+
+
+async def check_readiness() -> Tuple[bool, Dict[str, str]]:
+    """Run every check; (ready, status per dependency)."""
+    checks = {"database": _ping_database, "storage": lambda: storage.ping()}
+    if settings.ENABLE_VIRUS_SCAN:
+        checks["clamav"] = virus_scanner.ping
+
+    results = await asyncio.gather(
+        *(_check(name, check) for name, check in checks.items())
+    )
+    status = dict(zip(checks, results))
+    ready = status["database"] == "ok" and status["storage"] == "ok"
+    return ready, status
@@ -1,21 +1,219 @@
-"""Storage abstraction layer - supports MinIO (dev) and AWS S3/DO Spaces (prod)."""
+"""Storage abstraction layer - supports MinIO (dev), AWS S3/DO Spaces (prod)
+and the local filesystem (single node, tests), optionally behind a local
+disk cache."""
 
+import asyncio
+import base64
+import contextlib
+import hashlib
+import hmac
+import itertools
+import json
+import os
+import shutil
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from collections import OrderedDict
 from io import BytesIO
 from abc import ABC, abstractmethod
+from typing import (
+    AsyncIterator,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+from urllib.parse import quote, unquote, urlencode
 
 import boto3
+import certifi
+import urllib3
+from botocore.config import Config as BotoConfig
 from botocore.exceptions import ClientError
 from minio import Minio
+from minio.commonconfig import REPLACE, CopySource
+from minio.datatypes import Part
+from minio.deleteobjects import DeleteObject
 from minio.error import S3Error
 
 from app.core.config import settings
+from app.core.exceptions import ChecksumMismatchError
+from app.core.io_executor import run_in_storage_pool
+from app.core.metrics import STORAGE_CACHE, STORAGE_CACHE_BYTES
 from app.utils.logger import setup_logger
+from app.utils.streaming import iter_buffer
 
 logger = setup_logger(__name__)
 
 
+class _MultipartUpload:
+    """One in-flight multipart upload: parallel parts, retries, abort.
+
+    ``first_part`` lets a later request add parts to an upload started
+    earlier (resumable uploads).
+    """
+
+    def __init__(
+        self,
+        backend: "StorageBackend",
+        file_name: str,
+        upload_id: str,
+        first_part: int = 1,
+    ):
+        self.backend = backend
+        self.file_name = file_name
+        self.upload_id = upload_id
+        self.first_part = first_part
+        self._slots = asyncio.Semaphore(settings.STORAGE_UPLOAD_CONCURRENCY)
+        self._tasks: List[asyncio.Task] = []
+
+    @classmethod
+    async def start(
+        cls,
+        backend: "StorageBackend",
+        file_name: str,
+        content_type: str,
+        metadata: dict,
+    ) -> "_MultipartUpload":
+        upload_id = await run_in_storage_pool(
+            backend._create_multipart, file_name, content_type, metadata
+        )
+        logger.info(f"Started multipart upload: {file_name}")
+        return cls(backend, file_name, upload_id)
+
+    async def submit(self, data: bytes) -> None:
+        """Queue the next part, waiting for a free slot."""
+        await self._slots.acquire()
+        # Fail fast instead of reading more of the body after a lost part
+        for task in self._tasks:
+            if task.done() and task.exception() is not None:
+                self._slots.release()
+                raise task.exception()
+        part_number = self.first_part + len(self._tasks)
+        self._tasks.append(asyncio.create_task(self._send(part_number, data)))
+
+    async def _send(self, part_number: int, data: bytes) -> Tuple[int, str]:
+        try:
+            for attempt in range(1, settings.STORAGE_PART_RETRIES + 1):
+                try:
+                    etag = await run_in_storage_pool(
+                        self.backend._upload_part,
+                        self.file_name,
+                        self.upload_id,
+                        part_number,
+                        data,
+                    )
+                    return part_number, etag
+                except Exception as e:
+                    if attempt == settings.STORAGE_PART_RETRIES:
+                        logger.error(
+                            f"Part {part_number} of {self.file_name} failed: {e}"
+                        )
+                        raise
+                    logger.warning(
+                        f"Retrying part {part_number} of {self.file_name} "
+                        f"(attempt {attempt}): {e}"
+                    )
+                    await asyncio.sleep(0.5 * 2 ** (attempt - 1))
+        finally:
+            self._slots.release()
+
+    async def sent_parts(self) -> List[Tuple[int, str]]:
+        """Wait for every submitted part; (part_number, etag) pairs."""
+        return list(await asyncio.gather(*self._tasks))
+
+    async def complete(self, earlier_parts: List[Tuple[int, str]] = ()) -> None:
+        parts = list(earlier_parts) + await self.sent_parts()
+        await run_in_storage_pool(
+            self.backend._complete_multipart, self.file_name, self.upload_id, parts
+        )
+        logger.info(
+            f"Completed multipart upload: {self.file_name} ({len(parts)} parts)"
+        )
+
+    async def cancel(self) -> None:
+        """Stop sending parts; the upload itself stays open."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def abort(self) -> None:
+        await self.cancel()
+        try:
+            await run_in_storage_pool(
+                self.backend._abort_multipart, self.file_name, self.upload_id
+            )
+            logger.info(f"Aborted multipart upload: {self.file_name}")
+        except Exception as e:
+            # Bucket lifecycle rules clean up anything left behind
+            logger.error(f"Failed to abort multipart upload {self.file_name}: {e}")
+
+
+class ObjectInfo(NamedTuple):
+    """What a HEAD on an object tells us."""
+
+    size: int
+    content_type: str
+    # Hex SHA-256 the backend verified on upload; None if it has none
+    sha256: Optional[str]
+
+
+class StoredObject(NamedTuple):
+    """An object as listed by ``list_objects``."""
+
+    name: str
+    last_modified: datetime
+
+
+# Keys per multi-object delete request (the S3 API maximum)
+MULTI_DELETE_LIMIT = 1000
+
+
+async def _drain_in_pool(
+    items: Iterator[StoredObject], batch: int = MULTI_DELETE_LIMIT
+) -> AsyncIterator[StoredObject]:
+    """Consume a blocking (e.g. paginating SDK) iterator on the I/O pool."""
+    while page := await run_in_storage_pool(list, itertools.islice(items, batch)):
+        for item in page:
+            yield item
+
+
+class ObjectStream:
+    """An open GET on an object, read chunk by chunk on the I/O pool.
+
+    The next chunk is only fetched when the consumer asks for it, so a slow
+    client slows the storage read instead of filling memory.
+    """
+
+    def __init__(self, body: BinaryIO, close: Callable[[], None]):
+        self._body = body
+        self._close = close
+
+    async def iter_chunks(self, chunk_size: int = None) -> AsyncIterator[bytes]:
+        chunk_size = chunk_size or settings.DOWNLOAD_CHUNK_SIZE
+        try:
+            while chunk := await run_in_storage_pool(self._body.read, chunk_size):
+                yield chunk
+        finally:
+            # Also runs when the client disconnects mid-download
+            self._close()
+
+    def close(self) -> None:
+        """Release the GET without reading it (``iter_chunks`` does this too)."""
+        self._close()
+
+
 class StorageBackend(ABC):
-    """Abstract storage backend."""
+    """Abstract storage backend.
+
+    The minio/boto3 SDKs are blocking, so every SDK call goes through
+    ``run_in_storage_pool`` and never runs on the event loop.
+    """
 
     @abstractmethod
     async def upload_file(
@@ -24,16 +222,161 @@ class StorageBackend(ABC):
         """Upload file to storage."""
         pass
 
+    async def upload_stream(
+        self,
+        file_name: str,
+        chunks: AsyncIterator[bytes],
+        content_type: str = "application/octet-stream",
+        metadata: dict = None,
+    ) -> str:
+        """Upload an object of unknown length from an async chunk stream.
+
+        Bodies up to one part go up in a single PUT. Anything larger becomes
+        a multipart upload: parts of STORAGE_PART_SIZE are sent on up to
+        STORAGE_UPLOAD_CONCURRENCY connections at once, each part is retried
+        on its own, and the upload is aborted if a part or the stream fails
+        (so no orphaned parts are billed). Reading from ``chunks`` pauses
+        while every slot is busy, which bounds memory to about
+        ``concurrency + 1`` parts.
+        """
+        metadata = metadata or {}
+        part_size = settings.STORAGE_PART_SIZE
+        buffer = bytearray()
+        upload: Optional[_MultipartUpload] = None
+        try:
+            async for chunk in chunks:
+                buffer += chunk
+                # Strictly greater: the last part is never empty
+                while len(buffer) > part_size:
+                    if upload is None:
+                        upload = await _MultipartUpload.start(
+                            self, file_name, content_type, metadata
+                        )
+                    await upload.submit(bytes(buffer[:part_size]))
+                    del buffer[:part_size]
+
+            if upload is None:
+                return await self.upload_file(
+                    file_name,
+                    BytesIO(buffer),
+                    len(buffer),
+                    content_type=content_type,
+                    metadata=metadata,
+                )
+            await upload.submit(bytes(buffer))
+            await upload.complete()
+            return file_name
+        except BaseException:
+            if upload is not None:
+                await upload.abort()
+            raise
+
+    async def start_multipart_upload(
+        self, file_name: str, content_type: str, metadata: dict = None
+    ) -> str:
+        """Start a multipart upload that outlives this request; its id."""
+        upload = await _MultipartUpload.start(
+            self, file_name, content_type, metadata or {}
+        )
+        return upload.upload_id
+
+    def resume_multipart_upload(
+        self, file_name: str, upload_id: str, first_part: int
+    ) -> _MultipartUpload:
+        """Handle for adding parts (from ``first_part`` on) to an upload."""
+        return _MultipartUpload(self, file_name, upload_id, first_part)
+
+    async def abort_multipart_upload(self, file_name: str, upload_id: str) -> None:
+        """Abort an upload started with ``start_multipart_upload``."""
+        await _MultipartUpload(self, file_name, upload_id).abort()
+
+    # === Multipart primitives (blocking; run in worker threads) ===
+
+    @abstractmethod
+    def _create_multipart(
+        self, file_name: str, content_type: str, metadata: dict
+    ) -> str:
+        """Start a multipart upload and return its upload id."""
+        pass
+
+    @abstractmethod
+    def _upload_part(
+        self, file_name: str, upload_id: str, part_number: int, data: bytes
+    ) -> str:
+        """Upload one part and return its ETag."""
+        pass
+
+    @abstractmethod
+    def _complete_multipart(
+        self, file_name: str, upload_id: str, parts: List[Tuple[int, str]]
+    ) -> None:
+        """Assemble the object from (part_number, etag) pairs."""
+        pass
+
+    @abstractmethod
+    def _abort_multipart(self, file_name: str, upload_id: str) -> None:
+        """Abort the upload and discard any stored parts."""
+        pass
+
     @abstractmethod
     async def download_file(self, file_name: str) -> BytesIO:
         """Download file from storage."""
         pass
 
+    async def open_stream(
+        self, file_name: str, start: int = None, end: int = None
+    ) -> ObjectStream:
+        """Open an object for streaming, optionally a byte range.
+
+        ``start``/``end`` are inclusive offsets, sent to the backend as a
+        ranged GET so only the requested bytes leave storage.
+        """
+        body, close = await run_in_storage_pool(
+            self._open_object, file_name, start, end
+        )
+        return ObjectStream(body, close)
+
+    @abstractmethod
+    def _open_object(
+        self, file_name: str, start: Optional[int], end: Optional[int]
+    ) -> Tuple[BinaryIO, Callable[[], None]]:
+        """Start a (ranged) GET; return the body and a close callback."""
+        pass
+
     @abstractmethod
     async def delete_file(self, file_name: str) -> bool:
         """Delete file from storage."""
         pass
 
+    @abstractmethod
+    async def delete_files(self, file_names: List[str]) -> List[str]:
+        """Delete many objects, MULTI_DELETE_LIMIT per request.
+
+        Missing objects count as deleted. Returns the names that could not
+        be deleted; the caller decides whether to retry them.
+        """
+        pass
+
+    @abstractmethod
+    def list_objects(self, prefix: str = "") -> AsyncIterator[StoredObject]:
+        """Every object under ``prefix``, paged from storage as consumed."""
+        pass
+
+    @abstractmethod
+    async def copy_file(
+        self,
+        source_name: str,
+        file_name: str,
+        content_type: str = None,
+        metadata: dict = None,
+    ) -> str:
+        """Server-side copy; the bytes never pass through this process.
+
+        The copy keeps the source's content type and metadata unless
+        ``metadata`` is given, which replaces both.
+        """
+        pass
+
     @abstractmethod
     async def get_presigned_download_url(
         self, file_name: str, expiration: int = None
@@ -43,9 +386,18 @@ class StorageBackend(ABC):
 
     @abstractmethod
     async def get_presigned_upload_url(
-        self, file_name: str, expiration: int = None
+        self,
+        file_name: str,
+        expiration: int = None,
+        content_type: str = None,
+        sha256: str = None,
     ) -> str:
-        """Generate presigned upload URL."""
+        """Generate presigned upload URL.
+
+        Where the backend supports it, ``sha256`` (hex) is signed into the
+        URL so storage rejects a PUT whose body does not match, and keeps
+        the checksum for ``stat_file``.
+        """
         pass
 
     @abstractmethod
@@ -53,6 +405,19 @@ class StorageBackend(ABC):
         """Check if file exists."""
         pass
 
+    @abstractmethod
+    async def stat_file(self, file_name: str) -> Optional[ObjectInfo]:
+        """HEAD an object; None if it does not exist."""
+        pass
+
+    @abstractmethod
+    async def ping(self) -> None:
+        """Readiness check: raise if storage cannot serve requests."""
+        pass
+
+    async def prepare(self) -> None:
+        """Create what storage needs before first use (e.g. the bucket)."""
+
 
 class MinIOStorage(StorageBackend):
     """MinIO S3-compatible object storage (development)."""
@@ -63,9 +428,22 @@ class MinIOStorage(StorageBackend):
             access_key=settings.MINIO_ACCESS_KEY,
             secret_key=settings.MINIO_SECRET_KEY,
             secure=settings.MINIO_USE_SSL,
+            http_client=self._http_client(),
         )
         self.bucket_name = settings.MINIO_BUCKET_NAME
-        self._ensure_bucket()
+
+    @staticmethod
+    def _http_client() -> urllib3.PoolManager:
+        """minio's default client, with one connection per I/O thread."""
+        return urllib3.PoolManager(
+            timeout=urllib3.Timeout(connect=10, read=300),
+            maxsize=settings.STORAGE_IO_THREADS,
+            cert_reqs="CERT_REQUIRED",
+            ca_certs=os.environ.get("SSL_CERT_FILE") or certifi.where(),
+            retries=urllib3.Retry(
+                total=5, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504]
+            ),
+        )
 
     def _ensure_bucket(self):
         """Ensure bucket exists, create if not."""
@@ -77,6 +455,18 @@ class MinIOStorage(StorageBackend):
             logger.error(f"Error ensuring bucket: {e}")
             raise
 
+    def _check_bucket(self):
+        if not self.client.bucket_exists(self.bucket_name):
+            raise FileNotFoundError(f"No such bucket: {self.bucket_name}")
+
+    async def ping(self) -> None:
+        """Readiness check: the bucket exists and is reachable. Read-only."""
+        await run_in_storage_pool(self._check_bucket)
+
+    async def prepare(self) -> None:
+        """Create the bucket the first time it is missing."""
+        await run_in_storage_pool(self._ensure_bucket)
+
     async def upload_file(
         self,
         file_name: str,
@@ -86,9 +476,15 @@ class MinIOStorage(StorageBackend):
         metadata: dict = None,
     ) -> str:
         """Upload file to MinIO."""
+        if file_size > settings.STORAGE_PART_SIZE:
+            file_data.seek(0)
+            return await self.upload_stream(
+                file_name, iter_buffer(file_data), content_type, metadata
+            )
         try:
             file_data.seek(0)
-            self.client.put_object(
+            await run_in_storage_pool(
+                self.client.put_object,
                 self.bucket_name,
                 file_name,
                 file_data,
@@ -102,12 +498,66 @@ class MinIOStorage(StorageBackend):
             logger.error(f"MinIO upload error: {e}")
             raise
 
+    # minio-py has no public per-part API; these are the calls its own
+    # put_object makes for multipart uploads.
+
+    def _create_multipart(
+        self, file_name: str, content_type: str, metadata: dict
+    ) -> str:
+        headers = {"Content-Type": content_type}
+        headers.update({f"x-amz-meta-{k}": v for k, v in metadata.items()})
+        return self.client._create_multipart_upload(
+            self.bucket_name, file_name, headers
+        )
+
+    def _upload_part(
+        self, file_name: str, upload_id: str, part_number: int, data: bytes
+    ) -> str:
+        return self.client._upload_part(
+            self.bucket_name, file_name, data, None, upload_id, part_number
+        )
+
+    def _complete_multipart(
+        self, file_name: str, upload_id: str, parts: List[Tuple[int, str]]
+    ) -> None:
+        self.client._complete_multipart_upload(
+            self.bucket_name,
+            file_name,
+            upload_id,
+            [Part(part_number, etag) for part_number, etag in parts],
+        )
+
+    def _abort_multipart(self, file_name: str, upload_id: str) -> None:
+        self.client._abort_multipart_upload(self.bucket_name, file_name, upload_id)
+
+    def _get_object_bytes(self, file_name: str) -> bytes:
+        response = self.client.get_object(self.bucket_name, file_name)
+        try:
+            return response.read()
+        finally:
+            response.close()
+            response.release_conn()
+
+    def _open_object(
+        self, file_name: str, start: Optional[int], end: Optional[int]
+    ) -> Tuple[BinaryIO, Callable[[], None]]:
+        length = end - start + 1 if start is not None and end is not None else 0
+        response = self.client.get_object(
+            self.bucket_name, file_name, offset=start or 0, length=length
+        )
+
+        def close() -> None:
+            response.close()
+            response.release_conn()
+
+        return response, close
+
     async def download_file(self, file_name: str) -> BytesIO:
         """Download file from MinIO."""
         try:
-            response = self.client.get_object(self.bucket_name, file_name)
-            file_data = BytesIO(response.read())
-            file_data.seek(0)
+            file_data = BytesIO(
+                await run_in_storage_pool(self._get_object_bytes, file_name)
+            )
             logger.info(f"Downloaded from MinIO: {file_name}")
             return file_data
         except S3Error as e:
@@ -117,21 +567,84 @@ class MinIOStorage(StorageBackend):
     async def delete_file(self, file_name: str) -> bool:
         """Delete file from MinIO."""
         try:
-            self.client.remove_object(self.bucket_name, file_name)
+            await run_in_storage_pool(
+                self.client.remove_object, self.bucket_name, file_name
+            )
             logger.info(f"Deleted from MinIO: {file_name}")
             return True
         except S3Error as e:
             logger.error(f"MinIO delete error: {e}")
             raise
 
+    def _remove_objects(self, file_names: List[str]) -> List[str]:
+        # Batched into multi-object deletes by minio; errors come back lazily
+        errors = self.client.remove_objects(
+            self.bucket_name, (DeleteObject(name) for name in file_names)
+        )
+        return [error.name for error in errors]
+
+    async def delete_files(self, file_names: List[str]) -> List[str]:
+        """Delete many objects from MinIO; returns the names that failed."""
+        try:
+            failed = await run_in_storage_pool(self._remove_objects, file_names)
+        except S3Error as e:
+            logger.error(f"MinIO multi-object delete error: {e}")
+            return list(file_names)
+        logger.info(f"Deleted {len(file_names) - len(failed)} objects from MinIO")
+        return failed
+
+    def _iter_objects(self, prefix: str) -> Iterator[StoredObject]:
+        for obj in self.client.list_objects(
+            self.bucket_name, prefix=prefix, recursive=True
+        ):
+            yield StoredObject(obj.object_name, obj.last_modified)
+
+    def list_objects(self, prefix: str = "") -> AsyncIterator[StoredObject]:
+        """Every object in the bucket under ``prefix``."""
+        return _drain_in_pool(self._iter_objects(prefix))
+
+    async def copy_file(
+        self,
+        source_name: str,
+        file_name: str,
+        content_type: str = None,
+        metadata: dict = None,
+    ) -> str:
+        """Copy an object within the MinIO bucket."""
+        replace = {}
+        if metadata is not None:
+            replace = {
+                "metadata": {
+                    "Content-Type": content_type or "application/octet-stream",
+                    **metadata,
+                },
+                "metadata_directive": REPLACE,
+            }
+        try:
+            await run_in_storage_pool(
+                self.client.copy_object,
+                self.bucket_name,
+                file_name,
+                CopySource(self.bucket_name, source_name),
+                **replace,
+            )
+            logger.info(f"Copied in MinIO: {source_name} -> {file_name}")
+            return file_name
+        except S3Error as e:
+            logger.error(f"MinIO copy error: {e}")
+            raise
+
     async def get_presigned_download_url(
         self, file_name: str, expiration: int = None
     ) -> str:
         """Generate presigned download URL."""
         try:
             expiration = expiration or settings.PRESIGNED_URL_EXPIRATION
-            url = self.client.get_presigned_download_url(
-                self.bucket_name, file_name, expires=expiration
+            url = await run_in_storage_pool(
+                self.client.presigned_get_object,
+                self.bucket_name,
+                file_name,
+                expires=timedelta(seconds=expiration),
             )
             logger.info(f"Generated MinIO presigned download URL")
             return url
@@ -140,13 +653,24 @@ class MinIOStorage(StorageBackend):
             raise
 
     async def get_presigned_upload_url(
-        self, file_name: str, expiration: int = None
+        self,
+        file_name: str,
+        expiration: int = None,
+        content_type: str = None,
+        sha256: str = None,
     ) -> str:
-        """Generate presigned upload URL."""
+        """Generate presigned upload URL.
+
+        minio-py cannot sign checksum headers into a URL, so ``sha256`` is
+        not enforced here; callers verify the content after the upload.
+        """
         try:
             expiration = expiration or settings.PRESIGNED_URL_EXPIRATION
-            url = self.client.get_presigned_upload_url(
-                self.bucket_name, file_name, expires=expiration
+            url = await run_in_storage_pool(
+                self.client.presigned_put_object,
+                self.bucket_name,
+                file_name,
+                expires=timedelta(seconds=expiration),
             )
             logger.info(f"Generated MinIO presigned upload URL")
             return url
@@ -157,7 +681,9 @@ class MinIOStorage(StorageBackend):
     async def file_exists(self, file_name: str) -> bool:
         """Check if file exists in MinIO."""
         try:
-            self.client.stat_object(self.bucket_name, file_name)
+            await run_in_storage_pool(
+                self.client.stat_object, self.bucket_name, file_name
+            )
             return True
         except S3Error as e:
             if e.code == "NoSuchKey":
@@ -165,6 +691,19 @@ class MinIOStorage(StorageBackend):
             logger.error(f"MinIO file existence check error: {e}")
             raise
 
+    async def stat_file(self, file_name: str) -> Optional[ObjectInfo]:
+        """HEAD an object in MinIO (no checksum is reported)."""
+        try:
+            stat = await run_in_storage_pool(
+                self.client.stat_object, self.bucket_name, file_name
+            )
+        except S3Error as e:
+            if e.code == "NoSuchKey":
+                return None
+            logger.error(f"MinIO stat error: {e}")
+            raise
+        return ObjectInfo(stat.size, stat.content_type, None)
+
 
 class S3Storage(StorageBackend):
     """AWS S3 and S3-compatible storage (production)."""
@@ -176,6 +715,8 @@ class S3Storage(StorageBackend):
             aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
             endpoint_url=settings.AWS_S3_ENDPOINT,
             region_name=settings.AWS_S3_REGION,
+            # One connection per I/O thread (botocore defaults to 10)
+            config=BotoConfig(max_pool_connections=settings.STORAGE_IO_THREADS),
         )
         self.bucket = settings.AWS_S3_BUCKET
         logger.info(f"Initialized S3 storage: {self.bucket}")
@@ -189,9 +730,15 @@ class S3Storage(StorageBackend):
         metadata: dict = None,
     ) -> str:
         """Upload file to S3."""
+        if file_size > settings.STORAGE_PART_SIZE:
+            file_data.seek(0)
+            return await self.upload_stream(
+                file_name, iter_buffer(file_data), content_type, metadata
+            )
         try:
             file_data.seek(0)
-            self.s3_client.put_object(
+            await run_in_storage_pool(
+                self.s3_client.put_object,
                 Bucket=self.bucket,
                 Key=file_name,
                 Body=file_data.getvalue(),
@@ -204,12 +751,70 @@ class S3Storage(StorageBackend):
             logger.error(f"S3 upload error: {e}")
             raise
 
+    def _create_multipart(
+        self, file_name: str, content_type: str, metadata: dict
+    ) -> str:
+        response = self.s3_client.create_multipart_upload(
+            Bucket=self.bucket,
+            Key=file_name,
+            ContentType=content_type,
+            Metadata=metadata,
+        )
+        return response["UploadId"]
+
+    def _upload_part(
+        self, file_name: str, upload_id: str, part_number: int, data: bytes
+    ) -> str:
+        response = self.s3_client.upload_part(
+            Bucket=self.bucket,
+            Key=file_name,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=data,
+        )
+        return response["ETag"]
+
+    def _complete_multipart(
+        self, file_name: str, upload_id: str, parts: List[Tuple[int, str]]
+    ) -> None:
+        self.s3_client.complete_multipart_upload(
+            Bucket=self.bucket,
+            Key=file_name,
+            UploadId=upload_id,
+            MultipartUpload={
+                "Parts": [
+                    {"PartNumber": part_number, "ETag": etag}
+                    for part_number, etag in parts
+                ]
+            },
+        )
+
+    def _abort_multipart(self, file_name: str, upload_id: str) -> None:
+        self.s3_client.abort_multipart_upload(
+            Bucket=self.bucket, Key=file_name, UploadId=upload_id
+        )
+
+    def _get_object_bytes(self, file_name: str) -> bytes:
+        response = self.s3_client.get_object(Bucket=self.bucket, Key=file_name)
+        return response["Body"].read()
+
+    def _open_object(
+        self, file_name: str, start: Optional[int], end: Optional[int]
+    ) -> Tuple[BinaryIO, Callable[[], None]]:
+        kwargs = {}
+        if start is not None:
+            kwargs["Range"] = f"bytes={start}-{'' if end is None else end}"
+        response = self.s3_client.get_object(
+            Bucket=self.bucket, Key=file_name, **kwargs
+        )
+        return response["Body"], response["Body"].close
+
     async def download_file(self, file_name: str) -> BytesIO:
         """Download file from S3."""
         try:
-            response = self.s3_client.get_object(Bucket=self.bucket, Key=file_name)
-            file_data = BytesIO(response["Body"].read())
-            file_data.seek(0)
+            file_data = BytesIO(
+                await run_in_storage_pool(self._get_object_bytes, file_name)
+            )
             logger.info(f"Downloaded from S3: {file_name}")
             return file_data
         except ClientError as e:
@@ -219,20 +824,87 @@ class S3Storage(StorageBackend):
     async def delete_file(self, file_name: str) -> bool:
         """Delete file from S3."""
         try:
-            self.s3_client.delete_object(Bucket=self.bucket, Key=file_name)
+            await run_in_storage_pool(
+                self.s3_client.delete_object, Bucket=self.bucket, Key=file_name
+            )
             logger.info(f"Deleted from S3: {file_name}")
             return True
         except ClientError as e:
             logger.error(f"S3 delete error: {e}")
             raise
 
+    async def delete_files(self, file_names: List[str]) -> List[str]:
+        """Delete many objects with DeleteObjects; returns the names that failed."""
+        failed = []
+        for start in range(0, len(file_names), MULTI_DELETE_LIMIT):
+            batch = file_names[start : start + MULTI_DELETE_LIMIT]
+            try:
+                response = await run_in_storage_pool(
+                    self.s3_client.delete_objects,
+                    Bucket=self.bucket,
+                    Delete={
+                        "Objects": [{"Key": name} for name in batch],
+                        # Only errors are listed in the response
+                        "Quiet": True,
+                    },
+                )
+            except ClientError as e:
+                logger.error(f"S3 multi-object delete error: {e}")
+                failed += batch
+                continue
+            failed += [error["Key"] for error in response.get("Errors", [])]
+        logger.info(f"Deleted {len(file_names) - len(failed)} objects from S3")
+        return failed
+
+    def _iter_objects(self, prefix: str) -> Iterator[StoredObject]:
+        pages = self.s3_client.get_paginator("list_objects_v2").paginate(
+            Bucket=self.bucket, Prefix=prefix
+        )
+        for page in pages:
+            for obj in page.get("Contents", []):
+                yield StoredObject(obj["Key"], obj["LastModified"])
+
+    def list_objects(self, prefix: str = "") -> AsyncIterator[StoredObject]:
+        """Every object in the bucket under ``prefix``."""
+        return _drain_in_pool(self._iter_objects(prefix))
+
+    async def copy_file(
+        self,
+        source_name: str,
+        file_name: str,
+        content_type: str = None,
+        metadata: dict = None,
+    ) -> str:
+        """Copy an object within the S3 bucket."""
+        replace = {}
+        if metadata is not None:
+            replace = {
+                "ContentType": content_type or "application/octet-stream",
+                "Metadata": metadata,
+                "MetadataDirective": "REPLACE",
+            }
+        try:
+            await run_in_storage_pool(
+                self.s3_client.copy_object,
+                Bucket=self.bucket,
+                Key=file_name,
+                CopySource={"Bucket": self.bucket, "Key": source_name},
+                **replace,
+            )
+            logger.info(f"Copied in S3: {source_name} -> {file_name}")
+            return file_name
+        except ClientError as e:
+            logger.error(f"S3 copy error: {e}")
+            raise
+
     async def get_presigned_download_url(
         self, file_name: str, expiration: int = None
     ) -> str:
         """Generate presigned download URL."""
         try:
             expiration = expiration or settings.PRESIGNED_URL_EXPIRATION
-            url = self.s3_client.generate_presigned_url(
+            url = await run_in_storage_pool(
+                self.s3_client.generate_presigned_url,
                 "get_object",
                 Params={"Bucket": self.bucket, "Key": file_name},
                 ExpiresIn=expiration,
@@ -244,14 +916,30 @@ class S3Storage(StorageBackend):
             raise
 
     async def get_presigned_upload_url(
-        self, file_name: str, expiration: int = None
+        self,
+        file_name: str,
+        expiration: int = None,
+        content_type: str = None,
+        sha256: str = None,
     ) -> str:
-        """Generate presigned upload URL."""
+        """Generate presigned upload URL.
+
+        With ``sha256`` the URL carries the checksum: S3 rejects a body that
+        does not match and reports the checksum on HEAD afterwards.
+        """
+        params = {"Bucket": self.bucket, "Key": file_name}
+        if content_type:
+            params["ContentType"] = content_type
+        if sha256:
+            params["ChecksumSHA256"] = base64.b64encode(
+                bytes.fromhex(sha256)
+            ).decode()
         try:
             expiration = expiration or settings.PRESIGNED_URL_EXPIRATION
-            url = self.s3_client.generate_presigned_url(
+            url = await run_in_storage_pool(
+                self.s3_client.generate_presigned_url,
                 "put_object",
-                Params={"Bucket": self.bucket, "Key": file_name},
+                Params=params,
                 ExpiresIn=expiration,
             )
             logger.info(f"Generated S3 presigned upload URL")
@@ -263,7 +951,9 @@ class S3Storage(StorageBackend):
     async def file_exists(self, file_name: str) -> bool:
         """Check if file exists in S3."""
         try:
-            self.s3_client.head_object(Bucket=self.bucket, Key=file_name)
+            await run_in_storage_pool(
+                self.s3_client.head_object, Bucket=self.bucket, Key=file_name
+            )
             return True
         except ClientError as e:
             if e.response["Error"]["Code"] == "404":
@@ -271,16 +961,845 @@ class S3Storage(StorageBackend):
             logger.error(f"S3 file existence check error: {e}")
             raise
 
+    async def stat_file(self, file_name: str) -> Optional[ObjectInfo]:
+        """HEAD an object in S3, including its SHA-256 checksum if stored."""
+        try:
+            head = await run_in_storage_pool(
+                self.s3_client.head_object,
+                Bucket=self.bucket,
+                Key=file_name,
+                ChecksumMode="ENABLED",
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "404":
+                return None
+            logger.error(f"S3 stat error: {e}")
+            raise
+        sha256 = None
+        checksum = head.get("ChecksumSHA256")
+        # Multipart objects report a checksum of part checksums ("...-N")
+        if checksum and "-" not in checksum:
+            sha256 = base64.b64decode(checksum).hex()
+        return ObjectInfo(
+            head["ContentLength"],
+            head.get("ContentType", "application/octet-stream"),
+            sha256,
+        )
+
+    async def ping(self) -> None:
+        """Readiness check: the bucket is reachable with our credentials."""
+        await run_in_storage_pool(self.s3_client.head_bucket, Bucket=self.bucket)
+
+
+class _RangeReader:
+    """File-like view of ``count`` bytes of an open file from its position."""
+
+    def __init__(self, file: BinaryIO, count: int):
+        self._file = file
+        self._remaining = count
+
+    def read(self, size: int) -> bytes:
+        data = self._file.read(min(size, self._remaining))
+        self._remaining -= len(data)
+        return data
+
+
+class FileStream(ObjectStream):
+    """A byte range of a local file (LocalFSStorage).
+
+    Besides the chunked reads of any ObjectStream, it can be handed to the
+    server whole, for kernel sendfile (see ``ObjectStreamResponse``).
+    """
+
+    def __init__(self, file: BinaryIO, offset: int, count: int, size: int):
+        super().__init__(_RangeReader(file, count), file.close)
+        self.file = file
+        self.offset = offset
+        self.count = count
+        # Of the whole file, not the range
+        self.size = size
+
+    @classmethod
+    def open(
+        cls, path: str, start: Optional[int], end: Optional[int]
+    ) -> "FileStream":
+        """Open a file, or an inclusive byte range of it (blocking)."""
+        file = open(path, "rb")
+        size = os.fstat(file.fileno()).st_size
+        start = start or 0
+        end = size - 1 if end is None else min(end, size - 1)
+        file.seek(start)
+        return cls(file, start, max(end - start + 1, 0), size)
+
+
+class LocalFSStorage(StorageBackend):
+    """Objects as files on a local disk (single node, tests, benchmarks).
+
+    How it works:
+    - An object lives at ``<root>/ab/cd/<quoted key>``, sharded by the
+      SHA-256 of its key so no directory grows too large; a JSON sidecar
+      next to it holds the content type, metadata and content SHA-256
+    - Every write goes to ``<root>/.tmp`` first and is renamed into place
+      once complete and fsynced, so readers never see a partial object
+    - Multipart parts are files under ``<root>/.multipart/<upload id>``,
+      concatenated (and hashed) on completion
+    - Copies are hard links: no bytes are copied
+    - Presigned URLs point at this service's ``/storage`` route and are
+      signed with SECRET_KEY, like storage-issued ones
+    """
+
+    def __init__(self, root: str = None):
+        self.root = os.path.abspath(root or settings.LOCAL_STORAGE_PATH)
+        self._tmp = os.path.join(self.root, ".tmp")
+        self._multipart = os.path.join(self.root, ".multipart")
+        os.makedirs(self._tmp, exist_ok=True)
+        os.makedirs(self._multipart, exist_ok=True)
+        logger.info(f"Initialized local storage: {self.root}")
+
+    def _path(self, file_name: str) -> str:
+        digest = hashlib.sha256(file_name.encode()).hexdigest()
+        return os.path.join(
+            self.root, digest[:2], digest[2:4], quote(file_name, safe="")
+        )
+
+    @staticmethod
+    def _meta_path(path: str) -> str:
+        # "#" is always quoted in object file names, so this never collides
+        return path + "#meta"
+
+    def _read_meta(self, path: str) -> dict:
+        try:
+            with open(self._meta_path(path)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _tmp_file(self) -> Tuple[str, BinaryIO]:
+        path = os.path.join(self._tmp, uuid.uuid4().hex)
+        return path, open(path, "wb")
+
+    def _publish(
+        self, tmp_path: str, file_name: str, meta: dict
+    ) -> None:
+        """Atomically move a finished temp file (and its sidecar) into place."""
+        path = self._path(file_name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        meta_tmp, meta_file = self._tmp_file()
+        with meta_file:
+            meta_file.write(json.dumps(meta).encode())
+        os.replace(meta_tmp, self._meta_path(path))
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _finish(file: BinaryIO) -> None:
+        file.flush()
+        os.fsync(file.fileno())
+        file.close()
+
+    def _discard(self, tmp_path: str, file: BinaryIO) -> None:
+        file.close()
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp_path)
+
+    def _write_bytes(
+        self, file_name: str, data: BinaryIO, content_type: str, metadata: dict
+    ) -> None:
+        tmp_path, file = self._tmp_file()
+        hasher = hashlib.sha256()
+        try:
+            while chunk := data.read(settings.UPLOAD_CHUNK_SIZE):
+                hasher.update(chunk)
+                file.write(chunk)
+            self._finish(file)
+        except BaseException:
+            self._discard(tmp_path, file)
+            raise
+        self._publish(
+            tmp_path,
+            file_name,
+            {
+                "content_type": content_type,
+                "metadata": metadata,
+                "sha256": hasher.hexdigest(),
+            },
+        )
+
+    async def upload_file(
+        self,
+        file_name: str,
+        file_data: BytesIO,
+        file_size: int,
+        content_type: str = "application/octet-stream",
+        metadata: dict = None,
+    ) -> str:
+        """Write an object from an in-memory file."""
+        file_data.seek(0)
+        await run_in_storage_pool(
+            self._write_bytes, file_name, file_data, content_type, metadata or {}
+        )
+        logger.info(f"Stored locally: {file_name}")
+        return file_name
+
+    async def upload_stream(
+        self,
+        file_name: str,
+        chunks: AsyncIterator[bytes],
+        content_type: str = "application/octet-stream",
+        metadata: dict = None,
+        sha256: str = None,
+    ) -> str:
+        """Write an object straight from a chunk stream (no parts needed).
+
+        With ``sha256`` the object is only published if its content hashes
+        to it; otherwise ChecksumMismatchError and nothing is stored.
+        """
+        tmp_path, file = await run_in_storage_pool(self._tmp_file)
+        hasher = hashlib.sha256()
+        try:
+            async for chunk in chunks:
+                hasher.update(chunk)
+                await run_in_storage_pool(file.write, chunk)
+            await run_in_storage_pool(self._finish, file)
+            if sha256 and hasher.hexdigest() != sha256:
+                raise ChecksumMismatchError("Body does not match its SHA-256")
+        except BaseException:
+            await run_in_storage_pool(self._discard, tmp_path, file)
+            raise
+        meta = {
+            "content_type": content_type,
+            "metadata": metadata or {},
+            "sha256": hasher.hexdigest(),
+        }
+        await run_in_storage_pool(self._publish, tmp_path, file_name, meta)
+        logger.info(f"Stored locally: {file_name}")
+        return file_name
+
+    def _create_multipart(
+        self, file_name: str, content_type: str, metadata: dict
+    ) -> str:
+        upload_id = uuid.uuid4().hex
+        upload_dir = os.path.join(self._multipart, upload_id)
+        os.makedirs(upload_dir)
+        with open(os.path.join(upload_dir, "meta"), "w") as f:
+            json.dump({"content_type": content_type, "metadata": metadata}, f)
+        return upload_id
+
+    def _upload_part(
+        self, file_name: str, upload_id: str, part_number: int, data: bytes
+    ) -> str:
+        upload_dir = os.path.join(self._multipart, upload_id)
+        if not os.path.isdir(upload_dir):
+            raise FileNotFoundError(f"No such multipart upload: {upload_id}")
+        tmp_path, file = self._tmp_file()
+        try:
+            file.write(data)
+            self._finish(file)
+        except BaseException:
+            self._discard(tmp_path, file)
+            raise
+        os.replace(tmp_path, os.path.join(upload_dir, str(part_number)))
+        return hashlib.md5(data).hexdigest()
+
+    def _complete_multipart(
+        self, file_name: str, upload_id: str, parts: List[Tuple[int, str]]
+    ) -> None:
+        upload_dir = os.path.join(self._multipart, upload_id)
+        with open(os.path.join(upload_dir, "meta")) as f:
+            meta = json.load(f)
+        tmp_path, file = self._tmp_file()
+        hasher = hashlib.sha256()
+        try:
+            for part_number, _ in sorted(parts):
+                with open(os.path.join(upload_dir, str(part_number)), "rb") as part:
+                    while chunk := part.read(settings.UPLOAD_CHUNK_SIZE):
+                        hasher.update(chunk)
+                        file.write(chunk)
+            self._finish(file)
+        except BaseException:
+            self._discard(tmp_path, file)
+            raise
+        meta["sha256"] = hasher.hexdigest()
+        self._publish(tmp_path, file_name, meta)
+        shutil.rmtree(upload_dir, ignore_errors=True)
+
+    def _abort_multipart(self, file_name: str, upload_id: str) -> None:
+        shutil.rmtree(os.path.join(self._multipart, upload_id), ignore_errors=True)
+
+    def _read_bytes(self, file_name: str) -> bytes:
+        with open(self._path(file_name), "rb") as f:
+            return f.read()
+
+    async def download_file(self, file_name: str) -> BytesIO:
+        """Read a whole object into memory."""
+        return BytesIO(await run_in_storage_pool(self._read_bytes, file_name))
+
+    async def open_stream(
+        self, file_name: str, start: int = None, end: int = None
+    ) -> FileStream:
+        """Open an object (or inclusive byte range) as a sendfile-able stream."""
+        return await run_in_storage_pool(
+            FileStream.open, self._path(file_name), start, end
+        )
+
+    def _open_object(
+        self, file_name: str, start: Optional[int], end: Optional[int]
+    ) -> Tuple[BinaryIO, Callable[[], None]]:
+        stream = FileStream.open(self._path(file_name), start, end)
+        return stream._body, stream.file.close
+
+    def _remove(self, file_name: str) -> None:
+        path = self._path(file_name)
+        for victim in (path, self._meta_path(path)):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(victim)
+
+    async def delete_file(self, file_name: str) -> bool:
+        """Delete an object; like S3, deleting a missing one succeeds."""
+        await run_in_storage_pool(self._remove, file_name)
+        logger.info(f"Deleted locally: {file_name}")
+        return True
+
+    def _remove_many(self, file_names: List[str]) -> List[str]:
+        failed = []
+        for file_name in file_names:
+            try:
+                self._remove(file_name)
+            except OSError as e:
+                logger.error(f"Local delete error for {file_name}: {e}")
+                failed.append(file_name)
+        return failed
+
+    async def delete_files(self, file_names: List[str]) -> List[str]:
+        """Delete many objects; returns the names that failed."""
+        failed = await run_in_storage_pool(self._remove_many, file_names)
+        logger.info(f"Deleted {len(file_names) - len(failed)} objects locally")
+        return failed
+
+    def _iter_objects(self, prefix: str) -> Iterator[StoredObject]:
+        for directory, subdirs, files in os.walk(self.root):
+            if directory == self.root:
+                # Staging areas, not objects
+                subdirs[:] = [d for d in subdirs if not d.startswith(".")]
+            for entry in files:
+                name = unquote(entry)
+                if entry.endswith("#meta") or not name.startswith(prefix):
+                    continue
+                mtime = os.stat(os.path.join(directory, entry)).st_mtime
+                yield StoredObject(name, datetime.fromtimestamp(mtime, timezone.utc))
+
+    def list_objects(self, prefix: str = "") -> AsyncIterator[StoredObject]:
+        """Every object under ``prefix`` (a full directory walk)."""
+        return _drain_in_pool(self._iter_objects(prefix))
+
+    def _link(
+        self,
+        source_name: str,
+        file_name: str,
+        content_type: Optional[str],
+        metadata: Optional[dict],
+    ) -> None:
+        source = self._path(source_name)
+        meta = self._read_meta(source)
+        if metadata is not None:
+            meta.update(
+                content_type=content_type or "application/octet-stream",
+                metadata=metadata,
+            )
+        tmp_path = os.path.join(self._tmp, uuid.uuid4().hex)
+        # Objects are only ever replaced by rename, never rewritten in
+        # place, so a shared inode is safe
+        os.link(source, tmp_path)
+        self._publish(tmp_path, file_name, meta)
+
+    async def copy_file(
+        self,
+        source_name: str,
+        file_name: str,
+        content_type: str = None,
+        metadata: dict = None,
+    ) -> str:
+        """Copy an object as a hard link to the same data."""
+        await run_in_storage_pool(
+            self._link, source_name, file_name, content_type, metadata
+        )
+        logger.info(f"Copied locally: {source_name} -> {file_name}")
+        return file_name
+
+    def _sign(self, method: str, file_name: str, expires: int, extra: str) -> str:
+        payload = f"{method}\n{file_name}\n{expires}\n{extra}"
+        return hmac.new(
+            settings.SECRET_KEY.encode(), payload.encode(), hashlib.sha256
+        ).hexdigest()
+
+    def _signed_url(
+        self, method: str, file_name: str, expiration: Optional[int], **extra
+    ) -> str:
+        expiration = expiration or settings.PRESIGNED_URL_EXPIRATION
+        expires = int(time.time()) + expiration
+        params = {k: v for k, v in extra.items() if v}
+        params["expires"] = expires
+        params["signature"] = self._sign(
+            method, file_name, expires, urlencode(sorted(extra.items()))
+        )
+        base = settings.LOCAL_STORAGE_URL.rstrip("/")
+        return f"{base}/{quote(file_name)}?{urlencode(params)}"
+
+    def verify_signature(
+        self,
+        method: str,
+        file_name: str,
+        expires: int,
+        signature: str,
+        **extra,
+    ) -> bool:
+        """Check a URL from ``get_presigned_*_url`` (used by /storage)."""
+        expected = self._sign(
+            method, file_name, expires, urlencode(sorted(extra.items()))
+        )
+        return hmac.compare_digest(signature, expected) and expires >= time.time()
+
+    async def get_presigned_download_url(
+        self, file_name: str, expiration: int = None
+    ) -> str:
+        """Signed GET URL served by this service's /storage route."""
+        return self._signed_url("GET", file_name, expiration)
+
+    async def get_presigned_upload_url(
+        self,
+        file_name: str,
+        expiration: int = None,
+        content_type: str = None,
+        sha256: str = None,
+    ) -> str:
+        """Signed PUT URL; like S3, a body not matching ``sha256`` is refused."""
+        return self._signed_url(
+            "PUT",
+            file_name,
+            expiration,
+            content_type=content_type or "",
+            sha256=sha256 or "",
+        )
+
+    async def file_exists(self, file_name: str) -> bool:
+        """Check if an object exists."""
+        return await run_in_storage_pool(os.path.exists, self._path(file_name))
+
+    def _stat(self, file_name: str) -> Optional[ObjectInfo]:
+        path = self._path(file_name)
+        try:
+            size = os.stat(path).st_size
+        except FileNotFoundError:
+            return None
+        meta = self._read_meta(path)
+        return ObjectInfo(
+            size,
+            meta.get("content_type", "application/octet-stream"),
+            meta.get("sha256"),
+        )
+
+    async def stat_file(self, file_name: str) -> Optional[ObjectInfo]:
+        """Size, content type and SHA-256 (recorded when it was written)."""
+        return await run_in_storage_pool(self._stat, file_name)
+
+    def _check_writable(self) -> None:
+        if not os.access(self._tmp, os.W_OK):
+            raise PermissionError(f"Cannot write to {self._tmp}")
+
+    async def ping(self) -> None:
+        """Readiness check: the storage directory is writable."""
+        await run_in_storage_pool(self._check_writable)
+
+
+class CachingStorage(StorageBackend):
+    """Read-through cache of whole objects on local disk, in front of a backend.
+
+    How it works:
+    - Reads (``download_file``, ``open_stream``) are served from
+      ``<STORAGE_CACHE_PATH>/ab/cd/<sha256 of key>`` when it is there. Hits
+      are handed out as FileStreams, so they go out with sendfile where the
+      server supports it (uvicorn does not; it gets them in chunks)
+    - A miss fetches the whole object into the cache once, then serves it
+      from disk; concurrent misses on a key wait for that one fetch instead
+      of each going to the origin. Objects over
+      STORAGE_CACHE_MAX_OBJECT_SIZE are streamed from the origin instead
+    - Past STORAGE_CACHE_SIZE bytes, least recently used objects are evicted
+    - On startup the directory is indexed (by last access or write time),
+      so objects cached before a restart count towards the bound and get
+      evicted like the rest; temp files of interrupted fetches are removed
+    - Writing, copying over or deleting a key drops its cached copy (and
+      discards a fetch of the old content still in flight)
+    - Presigning, stat and multipart uploads go straight to the origin
+
+    Why?
+    - Stored objects never change in place (keys are unique or
+      content-addressed), so a cached copy stays valid until deleted
+    - Hot files then cost no origin egress and no storage round trip
+
+    Worker processes share the directory. Each indexes what is there when
+    it starts, then tracks (and evicts) only what it has filled or read, so
+    the size bound is per worker.
+    """
+
+    # Temp files this old are leftovers; younger ones may be another
+    # worker's fetch in progress
+    STALE_FILL_AGE = 3600
+
+    def __init__(
+        self,
+        origin: StorageBackend,
+        root: str = None,
+        max_bytes: int = None,
+        max_object_size: int = None,
+    ):
+        self.origin = origin
+        self.root = os.path.abspath(root or settings.STORAGE_CACHE_PATH)
+        self.max_bytes = max_bytes or settings.STORAGE_CACHE_SIZE
+        self.max_object_size = (
+            max_object_size or settings.STORAGE_CACHE_MAX_OBJECT_SIZE
+        )
+        self._tmp = os.path.join(self.root, ".tmp")
+        os.makedirs(self._tmp, exist_ok=True)
+        # Cached file path -> size, least recently used first
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._size = 0
+        # Key -> the fetch filling it; a key dropped mid-fetch is removed
+        self._fills: Dict[str, asyncio.Task] = {}
+        self._load_index()
+        logger.info(
+            f"Initialized storage cache: {self.root} "
+            f"({len(self._entries)} objects, {self._size} bytes)"
+        )
+
+    def _load_index(self) -> None:
+        """Index the objects already in the directory, oldest use first."""
+        found = []
+        stale = time.time() - self.STALE_FILL_AGE
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                if dirpath == self._tmp:
+                    if st.st_mtime < stale:
+                        self._remove([path])
+                    continue
+                found.append((max(st.st_atime, st.st_mtime), path, st.st_size))
+        for _, path, size in sorted(found):
+            self._entries[path] = size
+            self._size += size
+        self._remove(self._evict())
+        STORAGE_CACHE_BYTES.set(self._size)
+
+    def _path(self, file_name: str) -> str:
+        digest = hashlib.sha256(file_name.encode()).hexdigest()
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    @staticmethod
+    def _open_cached(
+        path: str, start: Optional[int], end: Optional[int]
+    ) -> Optional[FileStream]:
+        try:
+            return FileStream.open(path, start, end)
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _remove(paths: List[str]) -> None:
+        for path in paths:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+
+    async def _record(self, path: str, size: int) -> None:
+        """Mark ``path`` most recently used; evict past the size bound."""
+        self._size += size - self._entries.pop(path, 0)
+        self._entries[path] = size
+        victims = self._evict()
+        STORAGE_CACHE_BYTES.set(self._size)
+        if victims:
+            await run_in_storage_pool(self._remove, victims)
+
+    def _evict(self) -> List[str]:
+        """Unindex least recently used objects past the size bound (keeping
+        the newest); returns their paths for removal."""
+        victims = []
+        while self._size > self.max_bytes and len(self._entries) > 1:
+            victim, victim_size = self._entries.popitem(last=False)
+            self._size -= victim_size
+            victims.append(victim)
+        return victims
+
+    async def _drop(self, file_name: str) -> None:
+        """Forget a key whose object changed at the origin."""
+        self._fills.pop(file_name, None)
+        path = self._path(file_name)
+        self._size -= self._entries.pop(path, 0)
+        STORAGE_CACHE_BYTES.set(self._size)
+        await run_in_storage_pool(self._remove, [path])
+
+    async def _cached(
+        self, file_name: str, start: int = None, end: int = None
+    ) -> Optional[FileStream]:
+        """The cached copy, fetched first on a miss; None if not cacheable."""
+        path = self._path(file_name)
+        stream = await run_in_storage_pool(self._open_cached, path, start, end)
+        if stream is not None:
+            STORAGE_CACHE.labels(result="hit").inc()
+            await self._record(path, stream.size)
+            return stream
+
+        fill = self._fills.get(file_name)
+        if fill is None:
+            fill = asyncio.create_task(self._fill(file_name, path))
+            self._fills[file_name] = fill
+            fill.add_done_callback(lambda task: self._fill_done(file_name, task))
+        # Shielded: one waiter giving up does not cancel the fetch for the rest
+        if not await asyncio.shield(fill):
+            STORAGE_CACHE.labels(result="bypass").inc()
+            return None
+        STORAGE_CACHE.labels(result="miss").inc()
+        # None if evicted or dropped in the meantime; the origin serves it
+        return await run_in_storage_pool(self._open_cached, path, start, end)
+
+    def _fill_done(self, file_name: str, task: asyncio.Task) -> None:
+        if self._fills.get(file_name) is task:
+            del self._fills[file_name]
+        if not task.cancelled():
+            # Waiters get the error; this only stops asyncio warning about it
+            # when no waiter is left
+            task.exception()
+
+    async def _fill(self, file_name: str, path: str) -> bool:
+        """Copy an object from the origin into the cache. False to bypass."""
+        info = await self.origin.stat_file(file_name)
+        if info is None or info.size > self.max_object_size:
+            return False
+
+        tmp_path = os.path.join(self._tmp, uuid.uuid4().hex)
+        file = await run_in_storage_pool(open, tmp_path, "wb")
+        try:
+            stream = await self.origin.open_stream(file_name)
+            async for chunk in stream.iter_chunks():
+                await run_in_storage_pool(file.write, chunk)
+            await run_in_storage_pool(file.close)
+        except BaseException:
+            file.close()
+            await run_in_storage_pool(self._remove, [tmp_path])
+            raise
+        if self._fills.get(file_name) is not asyncio.current_task():
+            # Dropped while fetching: this may be the old content
+            await run_in_storage_pool(self._remove, [tmp_path])
+            return False
+        size = await run_in_storage_pool(self._publish, tmp_path, path)
+        await self._record(path, size)
+        return True
+
+    @staticmethod
+    def _publish(tmp_path: str, path: str) -> int:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(tmp_path, path)
+        return os.stat(path).st_size
+
+    async def download_file(self, file_name: str) -> BytesIO:
+        """Read a whole object, from the cache when possible."""
+        stream = await self._cached(file_name)
+        if stream is None:
+            return await self.origin.download_file(file_name)
+        try:
+            return BytesIO(await run_in_storage_pool(stream.file.read))
+        finally:
+            stream.close()
+
+    async def open_stream(
+        self, file_name: str, start: int = None, end: int = None
+    ) -> ObjectStream:
+        """Open an object or byte range, from the cache when possible."""
+        stream = await self._cached(file_name, start, end)
+        if stream is None:
+            return await self.origin.open_stream(file_name, start, end)
+        return stream
+
+    def _open_object(
+        self, file_name: str, start: Optional[int], end: Optional[int]
+    ) -> Tuple[BinaryIO, Callable[[], None]]:
+        return self.origin._open_object(file_name, start, end)
+
+    async def upload_file(
+        self, file_name: str, file_data: BytesIO, file_size: int, **kwargs
+    ) -> str:
+        result = await self.origin.upload_file(
+            file_name, file_data, file_size, **kwargs
+        )
+        await self._drop(file_name)
+        return result
+
+    async def upload_stream(
+        self, file_name: str, chunks: AsyncIterator[bytes], **kwargs
+    ) -> str:
+        result = await self.origin.upload_stream(file_name, chunks, **kwargs)
+        await self._drop(file_name)
+        return result
+
+    def _create_multipart(
+        self, file_name: str, content_type: str, metadata: dict
+    ) -> str:
+        return self.origin._create_multipart(file_name, content_type, metadata)
+
+    def _upload_part(
+        self, file_name: str, upload_id: str, part_number: int, data: bytes
+    ) -> str:
+        return self.origin._upload_part(file_name, upload_id, part_number, data)
+
+    def _complete_multipart(
+        self, file_name: str, upload_id: str, parts: List[Tuple[int, str]]
+    ) -> None:
+        self.origin._complete_multipart(file_name, upload_id, parts)
+        # Runs on a worker thread: just unlink; the index catches up on the
+        # next fill of this key
+        self._remove([self._path(file_name)])
+
+    def _abort_multipart(self, file_name: str, upload_id: str) -> None:
+        self.origin._abort_multipart(file_name, upload_id)
+
+    async def delete_file(self, file_name: str) -> bool:
+        result = await self.origin.delete_file(file_name)
+        await self._drop(file_name)
+        return result
+
+    async def delete_files(self, file_names: List[str]) -> List[str]:
+        failed = await self.origin.delete_files(file_names)
+        for file_name in set(file_names).difference(failed):
+            await self._drop(file_name)
+        return failed
+
+    def list_objects(self, prefix: str = "") -> AsyncIterator[StoredObject]:
+        return self.origin.list_objects(prefix)
+
+    async def copy_file(
+        self,
+        source_name: str,
+        file_name: str,
+        content_type: str = None,
+        metadata: dict = None,
+    ) -> str:
+        result = await self.origin.copy_file(
+            source_name, file_name, content_type=content_type, metadata=metadata
+        )
+        await self._drop(file_name)
+        return result
+
+    async def get_presigned_download_url(
+        self, file_name: str, expiration: int = None
+    ) -> str:
+        return await self.origin.get_presigned_download_url(file_name, expiration)
+
+    async def get_presigned_upload_url(
+        self,
+        file_name: str,
+        expiration: int = None,
+        content_type: str = None,
+        sha256: str = None,
+    ) -> str:
+        return await self.origin.get_presigned_upload_url(
+            file_name, expiration, content_type=content_type, sha256=sha256
+        )
+
+    async def file_exists(self, file_name: str) -> bool:
+        return await self.origin.file_exists(file_name)
+
+    async def stat_file(self, file_name: str) -> Optional[ObjectInfo]:
+        return await self.origin.stat_file(file_name)
+
+    async def ping(self) -> None:
+        """Readiness check of the origin; a cache failure only costs hits."""
+        await self.origin.ping()
+
+    async def prepare(self) -> None:
+        await self.origin.prepare()
+
 
 def get_storage_backend() -> StorageBackend:
-    """Factory function to get storage backend based on config."""
+    """Factory function to get storage backend based on config.
+
+    No backend makes a network call when created; reachability is checked
+    by ``ping`` from the readiness endpoint, and MinIO's bucket is created
+    by ``prepare`` in the background after startup.
+    """
     storage_type = getattr(settings, "STORAGE_TYPE", "minio").lower()
 
-    if storage_type == "s3":
-        return S3Storage()
-    else:
-        return MinIOStorage()
+    if storage_type == "local":
+        # Already on local disk; nothing for a disk cache to save
+        return LocalFSStorage()
+    backend = S3Storage() if storage_type == "s3" else MinIOStorage()
+    if settings.STORAGE_CACHE_ENABLED:
+        return CachingStorage(backend)
+    return backend
+
+
+# Lazy singleton - created on startup (or first use), never at import
+_storage: Optional[StorageBackend] = None
+_prepare_task: Optional[asyncio.Task] = None
+
+PREPARE_RETRY_MAX = 60  # seconds between attempts, at most
+
+
+def get_storage() -> StorageBackend:
+    """The configured backend, created on first use."""
+    global _storage
+
+    if _storage is None:
+        _storage = get_storage_backend()
+    return _storage
+
+
+async def _prepare(backend: StorageBackend) -> None:
+    """Run ``backend.prepare`` until it succeeds, backing off between tries."""
+    delay = 1
+    while True:
+        try:
+            await backend.prepare()
+            return
+        except Exception as e:
+            logger.warning(f"Storage not prepared, retrying in {delay}s: {e}")
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, PREPARE_RETRY_MAX)
+
+
+def start_storage() -> StorageBackend:
+    """Create the backend before the first request. Call on startup.
+
+    Preparing it (creating MinIO's bucket) runs as a background task, so
+    startup never waits on storage; /ready reports 503 until it is done.
+    """
+    global _prepare_task
+
+    backend = get_storage()
+    logger.info(f"Storage backend: {type(backend).__name__}")
+    if _prepare_task is None:
+        _prepare_task = asyncio.create_task(_prepare(backend))
+    return backend
+
+
+async def stop_storage() -> None:
+    """Cancel preparation if it is still retrying. Call on shutdown."""
+    global _prepare_task
+
+    if _prepare_task is not None:
+        _prepare_task.cancel()
+        await asyncio.gather(_prepare_task, return_exceptions=True)
+        _prepare_task = None
+
+
+class _LazyStorage:
+    """``storage``: forwards to the backend, created when first touched.
+
+    Lets modules keep ``from app.core.storage import storage`` without
+    importing them building a client.
+    """
+
+    def __getattr__(self, name: str):
+        return getattr(get_storage(), name)
 
 
-# Singleton instance
-storage = get_storage_backend()
+storage = _LazyStorage()
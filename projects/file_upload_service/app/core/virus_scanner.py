@@ -1,54 +1,367 @@
-from io import BytesIO
+"""
+ClamAV scanning over pooled asyncio sockets, with a verdict cache.
+
+How it works:
+- Connections to clamd are opened in IDSESSION mode and kept in a small
+  pool, so a scan does not pay a TCP handshake; each connection carries one
+  INSTREAM at a time and goes back to the pool after a clean verdict
+- Uploads feed chunks into a ScanSession as they arrive, so scanning
+  overlaps with the storage upload
+- clamd only scans once the stream is terminated. If the content hash is
+  already in the verdict cache, the stream is dropped instead and no scan
+  runs at all
+- Cached verdicts are only valid for the signature database version they
+  were made with; the version is re-read from clamd periodically and the
+  cache is emptied when it changes
+"""
 
-import pyclamd
+import asyncio
+import struct
+import time
+from collections import OrderedDict
+from io import BytesIO
+from typing import List, Optional
 
 from app.core.config import settings
 from app.core.exceptions import VirusDetectedError
+from app.core.metrics import VIRUS_SCAN_CACHE
 from app.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
 
+# clamd rejects INSTREAM chunks above StreamMaxLength; keep each frame small
+INSTREAM_FRAME_SIZE = 256 * 1024
+
+
+class _ClamdConnection:
+    """A clamd socket in IDSESSION mode, serving one command at a time."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.last_used = time.monotonic()
+
+    @classmethod
+    async def open(cls, host: str, port: int, timeout: float) -> "_ClamdConnection":
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port), timeout
+        )
+        writer.write(b"zIDSESSION\0")
+        return cls(reader, writer)
+
+    def usable(self, idle_timeout: float) -> bool:
+        # clamd closes sessions idle past its IdleTimeout
+        idle = time.monotonic() - self.last_used
+        return not self.reader.at_eof() and idle < idle_timeout
+
+    async def read_reply(self, timeout: float) -> str:
+        reply = await asyncio.wait_for(self.reader.readuntil(b"\0"), timeout)
+        # Session replies are prefixed with the command id: "3: stream: OK"
+        return reply.rstrip(b"\0").decode(errors="replace").split(": ", 1)[-1]
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class ClamdPool:
+    """Bounded pool of clamd session connections."""
+
+    def __init__(self, host: str, port: int, size: int, idle_timeout: float):
+        self.host = host
+        self.port = port
+        self.idle_timeout = idle_timeout
+        self._slots = asyncio.Semaphore(size)
+        self._idle: List[_ClamdConnection] = []
+
+    async def acquire(self, timeout: float = 5.0) -> _ClamdConnection:
+        # Bounded wait: a scan that cannot start is reported as a scan error
+        await asyncio.wait_for(self._slots.acquire(), timeout)
+        try:
+            while self._idle:
+                conn = self._idle.pop()
+                if conn.usable(self.idle_timeout):
+                    return conn
+                conn.close()
+            return await _ClamdConnection.open(self.host, self.port, timeout)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, conn: _ClamdConnection, reuse: bool) -> None:
+        """Return a connection; anything mid-stream or broken is closed."""
+        if reuse:
+            conn.last_used = time.monotonic()
+            self._idle.append(conn)
+        else:
+            conn.close()
+        self._slots.release()
+
+    def close(self) -> None:
+        while self._idle:
+            self._idle.pop().close()
+
+
+class VerdictCache:
+    """LRU of scan verdicts by content hash for one signature DB version."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.db_version: Optional[str] = None
+        # file_hash -> signature name, "" when clean
+        self._entries: OrderedDict = OrderedDict()
+
+    def set_db_version(self, version: str) -> None:
+        if version != self.db_version:
+            if self.db_version is not None:
+                logger.info(
+                    f"ClamAV signatures {self.db_version} -> {version}, "
+                    f"dropping {len(self._entries)} cached verdicts"
+                )
+            self._entries.clear()
+            self.db_version = version
+
+    def get(self, file_hash: str) -> Optional[str]:
+        signature = self._entries.get(file_hash)
+        if signature is not None:
+            self._entries.move_to_end(file_hash)
+        return signature
+
+    def put(self, file_hash: str, signature: str) -> None:
+        self._entries[file_hash] = signature
+        self._entries.move_to_end(file_hash)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class ScanSession:
+    """One clamd INSTREAM conversation, fed chunk by chunk as bytes arrive.
+
+    A scanner failure never fails the upload (same as before streaming):
+    the session just remembers the error and ``finish`` reports it.
+    """
+
+    def __init__(self, pool: ClamdPool):
+        self._pool = pool
+        self._conn: Optional[_ClamdConnection] = None
+        self.error: Optional[str] = None
+
+    async def open(self) -> None:
+        try:
+            self._conn = await self._pool.acquire()
+            self._conn.writer.write(b"zINSTREAM\0")
+        except (OSError, asyncio.TimeoutError) as e:
+            self._fail(f"connect failed: {e}")
+
+    def _fail(self, error: str) -> None:
+        self.error = self.error or error
+        self.close()
+
+    async def feed(self, chunk: bytes) -> None:
+        """Send a chunk to clamd (length-prefixed INSTREAM frames)."""
+        if self.error or self._conn is None:
+            return
+        try:
+            writer = self._conn.writer
+            view = memoryview(chunk)
+            for start in range(0, len(view), INSTREAM_FRAME_SIZE):
+                frame = view[start : start + INSTREAM_FRAME_SIZE]
+                writer.write(struct.pack("!L", len(frame)))
+                writer.write(frame)
+            await writer.drain()
+        except OSError as e:
+            # clamd drops the connection once StreamMaxLength is exceeded
+            self._fail(f"stream aborted: {e}")
+
+    async def finish(self, timeout: float = 60.0) -> dict:
+        """End the stream and return the verdict."""
+        if self.error or self._conn is None:
+            logger.error(f"Error scanning file: {self.error}")
+            return {"safe": False, "error": self.error}
+
+        conn, self._conn = self._conn, None
+        try:
+            conn.writer.write(struct.pack("!L", 0))
+            await conn.writer.drain()
+            verdict = await conn.read_reply(timeout)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+            self._pool.release(conn, reuse=False)
+            self.error = f"no verdict: {e}"
+            logger.error(f"Error scanning file: {self.error}")
+            return {"safe": False, "error": self.error}
+
+        # Size-limit and other errors may leave clamd closing the session
+        definitive = verdict.endswith("FOUND") or verdict.endswith("OK")
+        self._pool.release(conn, reuse=definitive)
+
+        if verdict.endswith("FOUND"):
+            signature = verdict.split(":", 1)[-1].removesuffix("FOUND").strip()
+            logger.warning(f"Virus detected: {signature}")
+            raise VirusDetectedError(f"Virus detected: {signature}")
+        if not verdict.endswith("OK"):
+            logger.error(f"Error scanning file: {verdict}")
+            return {"safe": False, "error": verdict}
+
+        logger.info("File scan completed: safe")
+        return {"safe": True}
+
+    def close(self) -> None:
+        """Abandon the stream; clamd discards it without scanning."""
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            self._pool.release(conn, reuse=False)
+
+
 class VirusScanner:
     """ClamAV virus scanner integration."""
 
     def __init__(self):
-        try:
-            self.clam = pyclamd.ClamD(
-                host=settings.CLAMAV_HOST, port=settings.CLAMAV_PORT
+        self._pool: Optional[ClamdPool] = None
+        self.cache = VerdictCache(settings.SCAN_CACHE_SIZE)
+        self._version_checked_at = 0.0
+        self._version_lock: Optional[asyncio.Lock] = None
+
+    @property
+    def pool(self) -> ClamdPool:
+        # Created on first use so it binds to the running event loop
+        if self._pool is None:
+            self._pool = ClamdPool(
+                settings.CLAMAV_HOST,
+                settings.CLAMAV_PORT,
+                size=settings.CLAMAV_POOL_SIZE,
+                idle_timeout=settings.CLAMAV_IDLE_TIMEOUT,
             )
-            if not self.clam.ping():
-                logger.warning("ClamAV server is not responding")
-        except Exception as e:
-            logger.warning(f"Failed to initialize ClamAV: {e}")
-            self.clam = None
+        return self._pool
 
-    async def scan_file(self, file_data: BytesIO) -> dict:
-        """Scan file for viruses."""
+    async def open_session(self) -> Optional[ScanSession]:
+        """Start a streaming scan; None when scanning is disabled."""
         if not settings.ENABLE_VIRUS_SCAN:
             logger.debug("Virus scanning is disabled")
-            return {"safe": True}
+            return None
 
-        if not self.clam:
-            logger.warning("ClamAV is not available, skipping scan")
+        session = ScanSession(self.pool)
+        await session.open()
+        return session
+
+    async def complete_scan(
+        self, session: Optional[ScanSession], file_hash: str
+    ) -> dict:
+        """Verdict for a fully fed session, from the cache when possible.
+
+        Raises VirusDetectedError for infected content, cached or not.
+        """
+        if session is None:
             return {"safe": True}
 
         try:
-            file_data.seek(0)
-            result = self.clam.scan_stream(file_data.read())
+            cached = await self.cached_verdict(file_hash)
+        except VirusDetectedError:
+            session.close()
+            raise
+        if cached is not None:
+            session.close()
+            return cached
+
+        try:
+            result = await session.finish()
+        except VirusDetectedError as e:
+            self._remember(file_hash, e.detail.removeprefix("Virus detected: "))
+            raise
+        if result["safe"]:
+            self._remember(file_hash, "")
+        return result
 
-            if result is not None:
-                logger.warning(f"Virus detected: {result}")
-                raise VirusDetectedError(f"Virus detected: {result}")
+    async def cached_verdict(self, file_hash: str) -> Optional[dict]:
+        """Cached verdict for current signatures, or None if a scan is needed.
 
-            logger.info("File scan completed: safe")
+        Raises VirusDetectedError for content already known to be infected.
+        """
+        if not await self._refresh_db_version():
+            return None
+        signature = self.cache.get(file_hash)
+        if signature is None:
+            VIRUS_SCAN_CACHE.labels(result="miss").inc()
+            return None
+        VIRUS_SCAN_CACHE.labels(result="hit").inc()
+        if signature:
+            logger.warning(f"Virus detected (cached): {signature}")
+            raise VirusDetectedError(f"Virus detected: {signature}")
+        logger.info("File scan skipped: cached clean verdict")
+        return {"safe": True, "cached": True}
+
+    async def scan_file(self, file_data: BytesIO) -> dict:
+        """Scan an in-memory file for viruses."""
+        session = await self.open_session()
+        if session is None:
             return {"safe": True}
+        file_data.seek(0)
+        while chunk := file_data.read(INSTREAM_FRAME_SIZE):
+            await session.feed(chunk)
+        return await session.finish()
+
+    def _remember(self, file_hash: str, signature: str) -> None:
+        if self.cache.db_version is not None:
+            self.cache.put(file_hash, signature)
+
+    async def _refresh_db_version(self) -> bool:
+        """Re-read the signature version when due. False if it is unknown."""
+        if time.monotonic() - self._version_checked_at < (
+            settings.CLAMAV_VERSION_CHECK_INTERVAL
+        ):
+            return self.cache.db_version is not None
+
+        if self._version_lock is None:
+            self._version_lock = asyncio.Lock()
+        async with self._version_lock:
+            if time.monotonic() - self._version_checked_at >= (
+                settings.CLAMAV_VERSION_CHECK_INTERVAL
+            ):
+                version = await self._fetch_db_version()
+                self._version_checked_at = time.monotonic()
+                if version is None:
+                    # Unknown signatures: never trust or store cached verdicts
+                    self.cache.db_version = None
+                else:
+                    self.cache.set_db_version(version)
+        return self.cache.db_version is not None
+
+    async def _fetch_db_version(self) -> Optional[str]:
+        # "ClamAV 1.2.1/27100/Mon Nov 20 08:20:34 2023" -> "27100"
+        # Own connection, outside the pool: callers may hold every pool slot
+        conn = None
+        try:
+            conn = await _ClamdConnection.open(
+                settings.CLAMAV_HOST, settings.CLAMAV_PORT, timeout=5.0
+            )
+            conn.writer.write(b"zVERSION\0")
+            reply = await conn.read_reply(timeout=5.0)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+            logger.warning(f"ClamAV version check failed: {e}")
+            return None
+        finally:
+            if conn is not None:
+                conn.close()
+        parts = reply.split("/")
+        return parts[1] if len(parts) >= 2 else None
+
+    async def ping(self, timeout: float = 5.0) -> None:
+        """Readiness check: raise unless clamd answers PING."""
+        # Own connection, like the version check: the pool may be exhausted
+        conn = await _ClamdConnection.open(
+            settings.CLAMAV_HOST, settings.CLAMAV_PORT, timeout=timeout
+        )
+        try:
+            conn.writer.write(b"zPING\0")
+            reply = await conn.read_reply(timeout=timeout)
+        finally:
+            conn.close()
+        if reply != "PONG":
+            raise ConnectionError(f"Unexpected clamd reply: {reply}")
 
-        except Exception as e:
-            if isinstance(e, VirusDetectedError):
-                raise
-            logger.error(f"Error scanning file: {e}")
-            return {"safe": False, "error": str(e)}
+    async def close(self) -> None:
+        """Close pooled clamd connections. Call on shutdown."""
+        if self._pool is not None:
+            self._pool.close()
 
 
 # Singleton instance
@@ -2,14 +2,29 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from app.api.v1.router import router as v1_router
 from app.core.config import settings
 from app.core.exceptions import APIException
+from app.core.io_executor import shutdown_storage_executor
+from app.core.loop_monitor import start_loop_monitor, stop_loop_monitor
+from app.core.metrics import CONTENT_TYPE_LATEST, REGISTRY
+from app.core.process_pool import shutdown_process_pool
+from app.core.readiness import check_readiness
+from app.core.storage import start_storage, stop_storage
+from app.core.virus_scanner import virus_scanner
 from app.db.session import engine
 from app.models.base import Base
 from app.utils.logger import setup_logger
+from app.workers.blob_gc import start_blob_collector, stop_blob_collector
+from app.workers.derivative_worker import (
+    start_derivative_workers,
+    stop_derivative_workers,
+)
+from app.workers.object_gc import start_object_collector, stop_object_collector
+from app.workers.scan_worker import start_scan_workers, stop_scan_workers
+from app.workers.upload_expiry import start_upload_expiry, stop_upload_expiry
 
 logger = setup_logger(__name__)
 
@@ -21,9 +36,31 @@ async def lifespan(app: FastAPI):
     logger.info("Starting File Upload Service...")
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    # Cheap: no network calls. The bucket is created in the background and
+    # /ready reports whether storage is reachable
+    start_storage()
+    if settings.LOOP_MONITOR_ENABLED:
+        start_loop_monitor()
+    if settings.ENABLE_VIRUS_SCAN:
+        start_scan_workers()
+    if settings.DERIVATIVES_ENABLED:
+        start_derivative_workers()
+    start_blob_collector()
+    start_object_collector()
+    start_upload_expiry()
     yield
     # Shutdown
     logger.info("Shutting down File Upload Service...")
+    await stop_loop_monitor()
+    await stop_scan_workers()
+    await stop_derivative_workers()
+    await stop_blob_collector()
+    await stop_object_collector()
+    await stop_upload_expiry()
+    await stop_storage()
+    await shutdown_process_pool()
+    await shutdown_storage_executor()
+    await virus_scanner.close()
 
 
 app = FastAPI(
@@ -54,10 +91,28 @@ async def api_exception_handler(request, exc: APIException):
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint."""
+    """Liveness: the process is up. Checks no dependency (see /ready)."""
     return {"status": "healthy", "service": "file-upload-service"}
 
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness: database and storage reachable (503 if not)."""
+    ready, checks = await check_readiness()
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "not ready", "checks": checks},
+    )
+
+
+if settings.METRICS_ENABLED:
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Prometheus scrape endpoint (per-worker registry)."""
+        return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE_LATEST)
+
+
 # Include routers
 app.include_router(v1_router, prefix="/api/v1", tags=["v1"])
 
@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, String
+
+from app.models.base import Base
+
+
+class Blob(Base):
+    """Stored content shared by every File row with the same SHA-256."""
+
+    __tablename__ = "blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    storage_key = Column(String(255), unique=True)
+    size = Column(Integer)
+    # Live (not soft-deleted) File rows pointing here; 0 means collectable
+    ref_count = Column(Integer, default=0, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<Blob(sha256={self.sha256}, refs={self.ref_count})>"
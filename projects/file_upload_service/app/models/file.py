@@ -1,10 +1,27 @@
 from datetime import datetime
+from enum import Enum
 
-from sqlalchemy import Column, DateTime, Integer, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
 
 from app.models.base import Base
 
 
+class ScanStatus(str, Enum):
+    """Virus scan state; only clean files can be downloaded."""
+
+    PENDING = "pending_scan"
+    CLEAN = "clean"
+    QUARANTINED = "quarantined"
+
+
+class PreviewStatus(str, Enum):
+    """Thumbnail/preview state; NULL for files that get no derivatives."""
+
+    PENDING = "pending"
+    READY = "ready"
+    FAILED = "failed"
+
+
 class File(Base):
     """File metadata model."""
 
@@ -12,15 +29,33 @@ class File(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     original_filename = Column(String(255), index=True)
-    stored_filename = Column(String(255), unique=True, index=True)
+    # Not unique: content-addressed rows share their blob's key
+    stored_filename = Column(String(255), index=True)
     file_hash = Column(String(64), index=True)
+    # Set when the content lives in a shared blob (CONTENT_ADDRESSED_STORAGE)
+    blob_sha256 = Column(
+        String(64), ForeignKey("blobs.sha256"), nullable=True, index=True
+    )
     file_size = Column(Integer)
     content_type = Column(String(100))
     user_id = Column(String(100), index=True)
     description = Column(Text, nullable=True)
     is_deleted = Column(Integer, default=0, index=True)
+    # When the object was removed from storage; deleted rows without it are
+    # pending garbage collection (blob rows are set on delete: blob GC's job)
+    purged_at = Column(DateTime, nullable=True)
+    scan_status = Column(String(20), default=ScanStatus.CLEAN.value, index=True)
+    scan_detail = Column(String(255), nullable=True)  # Signature when quarantined
+    preview_status = Column(String(20), nullable=True, index=True)
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        # Listing: a user's live files newest first, seeking by (created_at, id)
+        Index("ix_files_user_listing", "user_id", "is_deleted", "created_at", "id"),
+        # Object GC: deleted rows whose object is still in storage
+        Index("ix_files_pending_purge", "is_deleted", "purged_at", "id"),
+    )
+
     def __repr__(self):
         return f"<File(id={self.id}, filename={self.original_filename})>"
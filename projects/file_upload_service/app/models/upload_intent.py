@@ -0,0 +1,29 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, String, Text
+
+from app.models.base import Base
+
+
+class UploadIntent(Base):
+    """A presigned direct-to-storage upload waiting for its completion call.
+
+    Holds what the client declared up front; completion checks the stored
+    object against it before any File row exists.
+    """
+
+    __tablename__ = "upload_intents"
+
+    id = Column(String(32), primary_key=True)  # Public; in the completion URL
+    user_id = Column(String(100), index=True)
+    filename = Column(String(255))
+    content_type = Column(String(100))
+    description = Column(Text, nullable=True)
+    file_size = Column(Integer)
+    file_hash = Column(String(64))
+    stored_filename = Column(String(255))
+    expires_at = Column(DateTime, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<UploadIntent(id={self.id}, filename={self.filename})>"
@@ -0,0 +1,34 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, String, Text
+
+from app.models.base import Base
+
+
+class UploadSession(Base):
+    """Progress of a resumable upload, so any worker can take the next PATCH.
+
+    Bytes up to ``offset`` are durable: whole parts of the storage
+    multipart upload (``parts``), then ``tail_size`` bytes kept in a tail
+    object until there is enough for another part.
+    """
+
+    __tablename__ = "upload_sessions"
+
+    id = Column(String(32), primary_key=True)  # Public; part of the upload URL
+    user_id = Column(String(100), index=True)
+    filename = Column(String(255))
+    content_type = Column(String(100))
+    description = Column(Text, nullable=True)
+    upload_length = Column(Integer)
+    offset = Column(Integer, default=0)
+    stored_filename = Column(String(255))
+    multipart_id = Column(String(255), nullable=True)  # Set with the first part
+    parts = Column(Text, default="[]")  # JSON [[part_number, etag], ...]
+    tail_size = Column(Integer, default=0)
+    expires_at = Column(DateTime, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<UploadSession(id={self.id}, offset={self.offset})>"
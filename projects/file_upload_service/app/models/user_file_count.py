@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String
+
+from app.models.base import Base
+
+
+class UserFileCount(Base):
+    """Live (not deleted) files per user, so listings never COUNT(*) them.
+
+    Changed in the same transaction as the file row it counts. Users from
+    before the counter existed get a row on their first listing.
+    """
+
+    __tablename__ = "user_file_counts"
+
+    user_id = Column(String(100), primary_key=True)
+    file_count = Column(Integer, default=0, nullable=False)
+
+    def __repr__(self):
+        return f"<UserFileCount(user_id={self.user_id}, files={self.file_count})>"
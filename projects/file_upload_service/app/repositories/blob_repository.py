@@ -0,0 +1,101 @@
+from typing import Awaitable, Callable
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.blob import Blob
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class BlobRepository:
+    """Blob repository: reference counting for content-addressed objects.
+
+    Counts are only changed with single UPDATE statements or under a row
+    lock, so concurrent uploads and deletes of the same content never lose
+    a reference. A reference is taken and released in the same transaction
+    as the file row holding it (``FileRepository.create``/``soft_delete``),
+    so ref_count always equals the number of live rows.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get(self, sha256: str) -> Blob | None:
+        """Get blob by content hash."""
+        result = await self.db.execute(select(Blob).where(Blob.sha256 == sha256))
+        return result.scalar_one_or_none()
+
+    async def add_reference(
+        self,
+        sha256: str,
+        storage_key: str,
+        size: int,
+        materialize: Callable[[], Awaitable[object]],
+    ) -> str:
+        """Take a reference on a blob, creating it if the content is new.
+
+        ``materialize`` puts the object at ``storage_key`` and only runs for
+        new content. The existing row is locked first, so this waits for a
+        garbage collector that is deleting the same blob and then recreates
+        it. Returns the key the content is stored under.
+
+        Nothing is committed: the reference becomes real with the file row
+        that holds it, and a rollback drops both. A blob object made here
+        for a rolled-back row is left to the orphan scan.
+        """
+        result = await self.db.execute(
+            select(Blob).where(Blob.sha256 == sha256).with_for_update()
+        )
+        blob = result.scalar_one_or_none()
+        if blob is not None:
+            blob.ref_count = Blob.ref_count + 1
+            await self.db.flush()
+            logger.info(f"Blob {sha256[:12]} referenced")
+            return blob.storage_key
+
+        try:
+            # Idempotent: racing uploads of the same content write the same bytes
+            await materialize()
+            self.db.add(
+                Blob(sha256=sha256, storage_key=storage_key, size=size, ref_count=1)
+            )
+            await self.db.flush()
+        except IntegrityError:
+            # Another upload created it first; count ours against theirs
+            await self.db.rollback()
+            return await self.add_reference(sha256, storage_key, size, materialize)
+        except BaseException:
+            await self.db.rollback()
+            raise
+        logger.info(f"Created blob {sha256[:12]}")
+        return storage_key
+
+    async def lock_unreferenced(self) -> Blob | None:
+        """Lock one blob with no references, skipping any already locked.
+
+        The lock is held until ``delete`` (or a rollback), which keeps
+        ``add_reference`` from reviving the blob mid-collection.
+        """
+        result = await self.db.execute(
+            select(Blob)
+            .where(Blob.ref_count <= 0)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        return result.scalar_one_or_none()
+
+    async def existing_keys(self, keys: list[str]) -> set[str]:
+        """The keys among ``keys`` that belong to a blob."""
+        result = await self.db.execute(
+            select(Blob.storage_key).where(Blob.storage_key.in_(keys))
+        )
+        return set(result.scalars().all())
+
+    async def delete(self, sha256: str) -> None:
+        """Delete a blob row (its object must already be gone)."""
+        await self.db.execute(delete(Blob).where(Blob.sha256 == sha256))
+        await self.db.commit()
+        logger.info(f"Deleted blob {sha256[:12]}")
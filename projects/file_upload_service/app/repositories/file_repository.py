@@ -1,7 +1,15 @@
-from sqlalchemy import desc, func, select
+from collections import Counter
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy import case, desc, func, literal, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.file import File
+from app.core.file_cache import file_cache
+from app.models.blob import Blob
+from app.models.file import File, PreviewStatus, ScanStatus
+from app.models.user_file_count import UserFileCount
 from app.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -14,9 +22,14 @@ class FileRepository:
         self.db = db
 
     async def create(self, **kwargs) -> File:
-        """Create new file record."""
+        """Create new file record.
+
+        Also commits whatever the caller staged in the session, such as the
+        blob reference the row holds (see ``BlobRepository.add_reference``).
+        """
         file_obj = File(**kwargs)
         self.db.add(file_obj)
+        await self._adjust_count(file_obj.user_id, 1)
         await self.db.commit()
         await self.db.refresh(file_obj)
         logger.info(f"Created file record: {file_obj.id}")
@@ -29,37 +42,133 @@ class FileRepository:
         )
         return result.scalar_one_or_none()
 
+    async def get_cached(self, file_id: int) -> File | None:
+        """Get file by ID, from the shared row cache while it is fresh.
+
+        Cached rows are detached copies: read them, but write through
+        ``update``/``soft_delete`` by ID.
+        """
+        file_obj = file_cache.get(file_id)
+        if file_obj is None:
+            file_obj = await self.get_by_id(file_id)
+            if file_obj is not None:
+                file_cache.put(file_obj)
+        return file_obj
+
+    async def get_many_by_user(
+        self, file_ids: list[int], user_id: str
+    ) -> list[File]:
+        """A user's live files among ``file_ids``, in one query."""
+        result = await self.db.execute(
+            select(File).where(
+                File.id.in_(file_ids),
+                File.user_id == user_id,
+                File.is_deleted == 0,
+            )
+        )
+        return list(result.scalars().all())
+
     async def get_by_stored_filename(self, filename: str) -> File | None:
-        """Get file by stored filename."""
+        """Get file by stored filename (blob keys can be shared by several)."""
         result = await self.db.execute(
             select(File).where(
                 File.stored_filename == filename, File.is_deleted == 0
             )
         )
-        return result.scalar_one_or_none()
+        return result.scalars().first()
 
     async def list_by_user(
-        self, user_id: str, skip: int = 0, limit: int = 10
-    ) -> tuple[list[File], int]:
-        """List files by user."""
+        self,
+        user_id: str,
+        limit: int = 10,
+        after: Optional[Tuple[datetime, int]] = None,
+        skip: int = 0,
+    ) -> list[File]:
+        """List files by user, newest first.
+
+        ``after`` is the (created_at, id) of the last file already listed.
+        Seeking to it walks ix_files_user_listing from that point, so every
+        page costs the same; ``skip`` (OFFSET) still reads the skipped rows.
+        """
         query = select(File).where(
             File.user_id == user_id, File.is_deleted == 0
         )
+        if after is not None:
+            query = query.where(tuple_(File.created_at, File.id) < after)
 
-        # Get total count
-        count_result = await self.db.execute(
-            select(func.count()).select_from(File).where(
-                File.user_id == user_id, File.is_deleted == 0
-            )
+        result = await self.db.execute(
+            query.order_by(desc(File.created_at), desc(File.id))
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def count_by_user(self, user_id: str) -> int:
+        """Live files of a user, from the maintained counter."""
+        count = await self._stored_count(user_id)
+        if count is not None:
+            return count
+
+        # No counter yet (files from before it existed): count them once.
+        # Counting and creating the row is one statement, under the lock
+        # _adjust_count takes, so a file added or deleted meanwhile is
+        # either in the count or adjusts the new row, never neither.
+        await self._lock_count(user_id)
+        live = (
+            select(literal(user_id), func.count())
+            .select_from(File)
+            .where(File.user_id == user_id, File.is_deleted == 0)
         )
-        total = count_result.scalar()
+        insert = postgresql.insert if self._on_postgresql() else sqlite.insert
+        await self.db.execute(
+            insert(UserFileCount)
+            .from_select(["user_id", "file_count"], live)
+            .on_conflict_do_nothing()
+        )
+        await self.db.commit()
+        return await self._stored_count(user_id)
 
-        # Get paginated results
+    async def _stored_count(self, user_id: str) -> int | None:
         result = await self.db.execute(
-            query.order_by(desc(File.created_at)).offset(skip).limit(limit)
+            select(UserFileCount.file_count).where(UserFileCount.user_id == user_id)
+        )
+        return result.scalar_one_or_none()
+
+    def _on_postgresql(self) -> bool:
+        return self.db.bind.dialect.name == "postgresql"
+
+    async def _lock_count(self, user_id: str) -> None:
+        """Serialize a user's counter changes with seeding it, until commit.
+
+        A transaction-scoped advisory lock on PostgreSQL. SQLite runs one
+        writer at a time, so a single statement needs no lock there.
+        """
+        if self._on_postgresql():
+            key = func.hashtext(f"user_file_counts:{user_id}")
+            await self.db.execute(select(func.pg_advisory_xact_lock(key)))
+
+    async def _adjust_count(self, user_id: str, delta: int) -> None:
+        """Change a user's counter inside the caller's transaction.
+
+        Users without a counter row are left alone; ``count_by_user``
+        seeds it from the table, this change included.
+        """
+        await self._lock_count(user_id)
+        await self.db.execute(
+            update(UserFileCount)
+            .where(UserFileCount.user_id == user_id)
+            .values(file_count=UserFileCount.file_count + delta)
         )
-        files = result.scalars().all()
-        return files, total
+
+    async def _release_blobs(self, blob_sha256s: list[Optional[str]]) -> None:
+        """Drop the blob references of deleted rows, in the caller's
+        transaction; the blob collector deletes blobs left at zero."""
+        for sha256, count in Counter(filter(None, blob_sha256s)).items():
+            await self.db.execute(
+                update(Blob)
+                .where(Blob.sha256 == sha256)
+                .values(ref_count=Blob.ref_count - count)
+            )
 
     async def update(self, file_id: int, **kwargs) -> File | None:
         """Update file record."""
@@ -71,21 +180,138 @@ class FileRepository:
             setattr(file_obj, key, value)
 
         await self.db.commit()
+        file_cache.invalidate(file_id)
         await self.db.refresh(file_obj)
         logger.info(f"Updated file record: {file_id}")
         return file_obj
 
     async def soft_delete(self, file_id: int) -> bool:
-        """Soft delete file record."""
-        file_obj = await self.get_by_id(file_id)
-        if not file_obj:
-            return False
+        """Soft delete file record.
 
-        file_obj.is_deleted = 1
+        A single conditional UPDATE, so of two concurrent deletes only one
+        returns True (and releases the file's blob reference, in the same
+        transaction).
+        """
+        result = await self.db.execute(
+            update(File)
+            .where(File.id == file_id, File.is_deleted == 0)
+            .values(is_deleted=1, purged_at=self._purged_on_delete())
+            .returning(File.user_id, File.blob_sha256)
+        )
+        row = result.one_or_none()
+        if row is not None:
+            await self._adjust_count(row.user_id, -1)
+            await self._release_blobs([row.blob_sha256])
         await self.db.commit()
+        file_cache.invalidate(file_id)
+        if row is None:
+            return False
+
         logger.info(f"Soft deleted file: {file_id}")
         return True
 
+    async def soft_delete_many(
+        self, file_ids: list[int], user_id: str
+    ) -> list[Tuple[int, Optional[str]]]:
+        """Soft delete a user's live files among ``file_ids`` in one UPDATE.
+
+        Returns (id, blob_sha256) of the rows this call deleted; their blob
+        references are released with them. Objects are left to the
+        collectors.
+        """
+        result = await self.db.execute(
+            update(File)
+            .where(
+                File.id.in_(file_ids),
+                File.user_id == user_id,
+                File.is_deleted == 0,
+            )
+            .values(is_deleted=1, purged_at=self._purged_on_delete())
+            .returning(File.id, File.blob_sha256)
+        )
+        deleted = [tuple(row) for row in result.all()]
+        if deleted:
+            await self._adjust_count(user_id, -len(deleted))
+            await self._release_blobs([sha256 for _, sha256 in deleted])
+        await self.db.commit()
+        for file_id, _ in deleted:
+            file_cache.invalidate(file_id)
+        logger.info(f"Soft deleted {len(deleted)} files for user {user_id}")
+        return deleted
+
+    @staticmethod
+    def _purged_on_delete():
+        # A shared blob's object belongs to the blob collector, not ours
+        return case((File.blob_sha256.is_(None), None), else_=datetime.utcnow())
+
+    async def lock_unpurged(self, limit: int) -> list[Tuple[int, str, str | None]]:
+        """Lock up to ``limit`` deleted rows whose object is still stored.
+
+        Returns (id, stored_filename, preview_status) rows. Rows locked by
+        another collector are skipped. The locks are held until
+        ``mark_purged`` (or a rollback).
+        """
+        result = await self.db.execute(
+            select(File.id, File.stored_filename, File.preview_status)
+            .where(File.is_deleted == 1, File.purged_at.is_(None))
+            .order_by(File.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return [tuple(row) for row in result.all()]
+
+    async def mark_purged(self, file_ids: list[int]) -> None:
+        """Record that these rows' objects are gone."""
+        if file_ids:
+            await self.db.execute(
+                update(File)
+                .where(File.id.in_(file_ids))
+                .values(purged_at=datetime.utcnow())
+            )
+        await self.db.commit()
+
+    async def live_keys(self, keys: list[str]) -> set[str]:
+        """The keys among ``keys`` still used by a live file."""
+        result = await self.db.execute(
+            select(File.stored_filename).where(
+                File.stored_filename.in_(keys), File.is_deleted == 0
+            )
+        )
+        return set(result.scalars().all())
+
+    async def unpurged_keys(self, keys: list[str]) -> set[str]:
+        """The keys among ``keys`` whose object a row still accounts for."""
+        result = await self.db.execute(
+            select(File.stored_filename).where(
+                File.stored_filename.in_(keys), File.purged_at.is_(None)
+            )
+        )
+        return set(result.scalars().all())
+
+    async def list_ids_by_scan_status(self, status: str, limit: int) -> list[int]:
+        """Oldest file IDs in a scan status (used to recover scan jobs)."""
+        result = await self.db.execute(
+            select(File.id)
+            .where(File.scan_status == status, File.is_deleted == 0)
+            .order_by(File.id)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def list_ids_pending_preview(self, limit: int) -> list[int]:
+        """Oldest clean files still waiting for their thumbnails."""
+        result = await self.db.execute(
+            select(File.id)
+            .where(
+                File.preview_status == PreviewStatus.PENDING.value,
+                File.scan_status == ScanStatus.CLEAN.value,
+                File.is_deleted == 0,
+            )
+            .order_by(File.id)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
     async def get_by_hash(self, file_hash: str, user_id: str) -> File | None:
         """Get file by hash for deduplication."""
         result = await self.db.execute(
@@ -96,3 +322,17 @@ class FileRepository:
             )
         )
         return result.scalar_one_or_none()
+
+    async def get_any_by_hash(self, file_hash: str, file_size: int) -> File | None:
+        """Any live file with this content, whoever owns it."""
+        result = await self.db.execute(
+            select(File)
+            .where(
+                File.file_hash == file_hash,
+                File.file_size == file_size,
+                File.is_deleted == 0,
+            )
+            .order_by(File.id)
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
@@ -0,0 +1,57 @@
+from datetime import datetime
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.upload_intent import UploadIntent
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class UploadIntentRepository:
+    """Upload intent repository for presigned direct uploads."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create(self, **kwargs) -> UploadIntent:
+        """Create new upload intent."""
+        intent = UploadIntent(**kwargs)
+        self.db.add(intent)
+        await self.db.commit()
+        logger.info(f"Created upload intent: {intent.id}")
+        return intent
+
+    async def get(
+        self, intent_id: str, user_id: str, lock: bool = False
+    ) -> UploadIntent | None:
+        """Get a user's upload intent, optionally locking it until the next
+        commit (or rollback)."""
+        query = select(UploadIntent).where(
+            UploadIntent.id == intent_id, UploadIntent.user_id == user_id
+        )
+        if lock:
+            query = query.with_for_update()
+        result = await self.db.execute(query)
+        return result.scalar_one_or_none()
+
+    async def lock_expired(self, skip: list[str]) -> UploadIntent | None:
+        """Lock one expired intent not in ``skip``, skipping any already
+        locked. The lock is held until ``delete`` (or a rollback)."""
+        result = await self.db.execute(
+            select(UploadIntent)
+            .where(
+                UploadIntent.expires_at < datetime.utcnow(),
+                UploadIntent.id.notin_(skip),
+            )
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        return result.scalar_one_or_none()
+
+    async def delete(self, intent_id: str) -> None:
+        """Delete an upload intent (completed, rejected or expired)."""
+        await self.db.execute(delete(UploadIntent).where(UploadIntent.id == intent_id))
+        await self.db.commit()
+        logger.info(f"Deleted upload intent: {intent_id}")
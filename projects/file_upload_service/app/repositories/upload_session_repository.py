@@ -0,0 +1,76 @@
+from datetime import datetime
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.upload_session import UploadSession
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class UploadSessionRepository:
+    """Upload session repository for resumable uploads."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create(self, **kwargs) -> UploadSession:
+        """Create new upload session."""
+        session = UploadSession(**kwargs)
+        self.db.add(session)
+        await self.db.commit()
+        logger.info(f"Created upload session: {session.id}")
+        return session
+
+    async def get(self, session_id: str, user_id: str) -> UploadSession | None:
+        """Get a user's upload session."""
+        result = await self.db.execute(
+            select(UploadSession).where(
+                UploadSession.id == session_id, UploadSession.user_id == user_id
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def lock_expired(self, skip: list[str]) -> UploadSession | None:
+        """Lock one expired session not in ``skip``, skipping any already
+        locked. The lock is held until ``delete`` (or a rollback)."""
+        result = await self.db.execute(
+            select(UploadSession)
+            .where(
+                UploadSession.expires_at < datetime.utcnow(),
+                UploadSession.id.notin_(skip),
+            )
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        return result.scalar_one_or_none()
+
+    async def advance(self, session_id: str, from_offset: int, **kwargs) -> bool:
+        """Record progress, only if nobody else moved the offset meanwhile.
+
+        Two PATCHes at the same offset both upload, but only one is
+        recorded; the other gets False (a 409 for the client).
+        """
+        result = await self.db.execute(
+            update(UploadSession)
+            .where(
+                UploadSession.id == session_id,
+                UploadSession.offset == from_offset,
+            )
+            .values(**kwargs)
+        )
+        await self.db.commit()
+        return bool(result.rowcount)
+
+    async def delete(self, session_id: str, from_offset: int = None) -> bool:
+        """Delete a session (finished or terminated), optionally only if it
+        is still at ``from_offset``."""
+        query = delete(UploadSession).where(UploadSession.id == session_id)
+        if from_offset is not None:
+            query = query.where(UploadSession.offset == from_offset)
+        result = await self.db.execute(query)
+        await self.db.commit()
+        if result.rowcount:
+            logger.info(f"Deleted upload session: {session_id}")
+        return bool(result.rowcount)
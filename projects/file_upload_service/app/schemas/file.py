@@ -1,6 +1,8 @@
 from datetime import datetime
 
-from pydantic import BaseModel, Field
+from pydantic import AliasChoices, BaseModel, Field
+
+from app.core.config import settings
 
 
 class FileMetadata(BaseModel):
@@ -12,6 +14,7 @@ class FileMetadata(BaseModel):
     file_hash: str
     file_size: int
     content_type: str
+    scan_status: str
     created_at: datetime
     updated_at: datetime
 
@@ -23,10 +26,14 @@ class FileUploadResponse(BaseModel):
     """File upload response."""
 
     id: int
-    filename: str = Field(alias="original_filename")
+    # Service dicts say "filename", ORM rows "original_filename"
+    filename: str = Field(
+        validation_alias=AliasChoices("filename", "original_filename")
+    )
     file_size: int
     file_hash: str
     content_type: str
+    scan_status: str = "clean"
     created_at: datetime
     message: str = "File uploaded successfully"
 
@@ -34,13 +41,71 @@ class FileUploadResponse(BaseModel):
         from_attributes = True
 
 
+class DirectUploadRequest(BaseModel):
+    """Direct-to-storage upload: describe the content before sending it."""
+
+    filename: str = Field(min_length=1, max_length=255)
+    sha256: str = Field(pattern="^[0-9a-fA-F]{64}$")
+    file_size: int = Field(ge=0)
+    content_type: str = "application/octet-stream"
+    description: str | None = None
+
+
+class DirectUploadResponse(BaseModel):
+    """Where to PUT the bytes, and where to confirm them afterwards."""
+
+    upload_id: str
+    upload_url: str
+    upload_headers: dict[str, str] = Field(
+        description="Headers the PUT must send unchanged"
+    )
+    complete_url: str
+    expires_in: int
+
+
+class UploadNegotiationRequest(DirectUploadRequest):
+    """Hash-first upload: describe the content before sending it."""
+
+    challenge: str | None = Field(None, description="Token from a 'prove' reply")
+    proof: str | None = Field(
+        None,
+        pattern="^[0-9a-fA-F]{64}$",
+        description="SHA-256 of the challenge nonce and then the byte range",
+    )
+
+
+class UploadNegotiationResponse(BaseModel):
+    """Outcome of a hash-first upload: exists, created, prove or upload."""
+
+    status: str
+    id: int | None = None
+    filename: str | None = None
+    file_size: int | None = None
+    file_hash: str | None = None
+    content_type: str | None = None
+    scan_status: str | None = None
+    created_at: datetime | None = None
+    message: str | None = None
+    challenge: str | None = None
+    challenge_nonce: str | None = None
+    challenge_offset: int | None = None
+    challenge_length: int | None = None
+    upload_id: str | None = None
+    upload_url: str | None = Field(None, description="Where to PUT the bytes")
+    upload_headers: dict[str, str] | None = None
+    complete_url: str | None = None
+    expires_in: int | None = None
+
+
 class FileDownloadResponse(BaseModel):
     """File download metadata."""
 
     filename: str
     file_size: int
     content_type: str
-    download_url: str
+    scan_status: str = "clean"
+    preview_status: str | None = None
+    download_url: str | None = Field(None, description="Only set once clean")
 
 
 class PresignedURLResponse(BaseModel):
@@ -52,6 +117,13 @@ class PresignedURLResponse(BaseModel):
     url_type: str = Field(description="Either 'download' or 'upload'")
 
 
+class ArchiveRequest(BaseModel):
+    """Files to download together as one ZIP archive."""
+
+    file_ids: list[int] = Field(min_length=1, max_length=settings.ARCHIVE_MAX_FILES)
+    filename: str = Field("files.zip", min_length=1, max_length=255)
+
+
 class FileDeleteResponse(BaseModel):
     """File deletion response."""
 
@@ -59,6 +131,23 @@ class FileDeleteResponse(BaseModel):
     filename: str
 
 
+class BatchDeleteRequest(BaseModel):
+    """Files to delete in one request."""
+
+    file_ids: list[int] = Field(
+        min_length=1, max_length=settings.BATCH_DELETE_MAX_FILES
+    )
+
+
+class BatchDeleteResponse(BaseModel):
+    """Which of the requested files were deleted."""
+
+    deleted: list[int]
+    not_found: list[int] = Field(
+        description="Not the user's, already deleted, or nonexistent"
+    )
+
+
 class FileListItem(BaseModel):
     """File list item."""
 
@@ -66,7 +155,15 @@ class FileListItem(BaseModel):
     original_filename: str
     file_size: int
     content_type: str
+    scan_status: str = "clean"
+    preview_status: str | None = Field(
+        None, description="pending, ready or failed; null if none apply"
+    )
     created_at: datetime
+    download_url: str | None = Field(None, description="Only with urls=true")
+    thumbnail_url: str | None = Field(
+        None, description="Only with urls=true, once previews are ready"
+    )
 
     class Config:
         from_attributes = True
@@ -77,5 +174,6 @@ class FileListResponse(BaseModel):
 
     items: list[FileListItem]
     total: int
-    page: int
+    page: int | None = Field(None, description="Only for skip-based paging")
     page_size: int
+    next_cursor: str | None = Field(None, description="Pass as cursor for more")
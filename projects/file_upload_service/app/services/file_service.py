@@ -1,121 +1,511 @@
+import base64
+import hashlib
+import hmac
+import uuid
+from datetime import datetime, timedelta
+from functools import partial
 from io import BytesIO
+from typing import AsyncIterator, List, Optional, Tuple
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.exceptions import FileTooLargeError, FileNotFoundError
-from app.core.storage import storage
-from app.core.virus_scanner import virus_scanner
+from app.core.exceptions import (
+    ChecksumMismatchError,
+    FileNotFoundError,
+    FileQuarantinedError,
+    FileTooLargeError,
+    ScanPendingError,
+    UploadExpiredError,
+    UploadIncompleteError,
+    VirusDetectedError,
+)
+from app.core.metrics import UPLOADS_EXPIRED
+from app.core.presign_cache import presigned_urls
+from app.core.storage import ObjectStream, storage
+from app.core.virus_scanner import ScanSession, virus_scanner
+from app.models.file import File, PreviewStatus, ScanStatus
+from app.repositories.blob_repository import BlobRepository
 from app.repositories.file_repository import FileRepository
+from app.repositories.upload_intent_repository import UploadIntentRepository
+from app.utils.derivatives import Derivative
 from app.utils.file_utils import (
-    calculate_file_hash,
+    archive_member_name,
+    content_addressed_key,
+    derivative_key,
+    derivative_kind,
     generate_unique_filename,
+    is_compressed_format,
     validate_file_extension,
 )
 from app.utils.logger import setup_logger
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.upload_proof import issue_challenge, read_challenge
+from app.utils.zip_stream import ZipEntry, stream_zip
+from app.workers.blob_gc import schedule_blob_gc
+from app.workers.derivative_worker import enqueue_derivatives
+from app.workers.object_gc import schedule_object_gc
+from app.workers.scan_worker import enqueue_scan
 
 logger = setup_logger(__name__)
 
 
+def upload_result(file_record: File, message: str) -> dict:
+    """Response body for an upload that produced (or found) a record."""
+    return {
+        "id": file_record.id,
+        "filename": file_record.original_filename,
+        "file_size": file_record.file_size,
+        "file_hash": file_record.file_hash,
+        "content_type": file_record.content_type,
+        "scan_status": file_record.scan_status,
+        "created_at": file_record.created_at,
+        "message": message,
+    }
+
+
+def scan_in_background() -> bool:
+    """Async mode: respond once stored; a scan worker delivers the verdict."""
+    return settings.ENABLE_VIRUS_SCAN and settings.SCAN_MODE == "async"
+
+
+async def open_scan_session() -> Optional[ScanSession]:
+    """Scan session to feed while the bytes go by; None if scanning later."""
+    if scan_in_background():
+        return None
+    return await virus_scanner.open_session()
+
+
+def object_metadata(filename: str, user_id: str) -> dict:
+    """Object metadata for an upload; shared blobs carry no per-user data."""
+    if settings.CONTENT_ADDRESSED_STORAGE:
+        return {}
+    return {"original-filename": filename, "user-id": user_id}
+
+
+def preview_status_for(filename: str, file_size: int) -> Optional[str]:
+    """preview_status of a new file: pending if it gets thumbnails, else None."""
+    if (
+        settings.DERIVATIVES_ENABLED
+        and file_size <= settings.DERIVATIVE_MAX_SOURCE_SIZE
+        and derivative_kind(filename)
+    ):
+        return PreviewStatus.PENDING.value
+    return None
+
+
+def ensure_clean(scan_status: str) -> None:
+    """Block access to content that has not passed the virus scan."""
+    if scan_status == ScanStatus.QUARANTINED:
+        raise FileQuarantinedError()
+    if scan_status == ScanStatus.PENDING:
+        raise ScanPendingError()
+
+
 class FileService:
     """File upload/download service."""
 
     def __init__(self, db: AsyncSession):
         self.db = db
         self.repo = FileRepository(db)
+        self.blobs = BlobRepository(db)
+        self.intents = UploadIntentRepository(db)
+        # Files loaded by this request (see get_file)
+        self._files: dict[int, File] = {}
 
     async def upload_file(
         self,
-        file_data: BytesIO,
+        chunks: AsyncIterator[bytes],
         filename: str,
         user_id: str,
         content_type: str,
         description: str = None,
     ) -> dict:
-        """Upload file with virus scanning and metadata storage."""
+        """Upload file with virus scanning and metadata storage.
 
-        # Get file size
-        file_data.seek(0, 2)  # Seek to end
-        file_size = file_data.tell()
-        file_data.seek(0)  # Seek back to start
+        The body is consumed once, chunk by chunk: each chunk updates the
+        SHA-256, goes to the ClamAV INSTREAM session and into the storage
+        upload, and counts towards MAX_FILE_SIZE. Nothing holds the whole
+        file in memory.
 
-        # Validate file size
-        if file_size > settings.MAX_FILE_SIZE:
-            raise FileTooLargeError(
-                f"File size {file_size} exceeds maximum {settings.MAX_FILE_SIZE}"
-            )
+        With CONTENT_ADDRESSED_STORAGE the upload then becomes a reference to
+        the shared blob for its SHA-256, so content that any user stored
+        before is not kept twice.
+        """
 
-        # Validate extension
+        # Validate extension before reading any of the body
         validate_file_extension(filename)
 
-        # Calculate hash for deduplication
-        file_bytes = file_data.read()
-        file_hash = calculate_file_hash(file_bytes)
-        file_data = BytesIO(file_bytes)
+        unique_filename = generate_unique_filename(filename)
+        hasher = hashlib.sha256()
+        file_size = 0
+        scan = await open_scan_session()
+
+        async def tee() -> AsyncIterator[bytes]:
+            nonlocal file_size
+            async for chunk in chunks:
+                file_size += len(chunk)
+                if file_size > settings.MAX_FILE_SIZE:
+                    raise FileTooLargeError(
+                        f"File size exceeds maximum {settings.MAX_FILE_SIZE}"
+                    )
+                hasher.update(chunk)
+                if scan:
+                    await scan.feed(chunk)
+                yield chunk
+
+        # Upload to storage backend (MinIO/S3) while hashing and scanning.
+        # The hash is only known at the end, so it is not object metadata.
+        try:
+            await storage.upload_stream(
+                unique_filename,
+                tee(),
+                content_type=content_type,
+                metadata=object_metadata(filename, user_id),
+            )
+        except BaseException:
+            if scan:
+                scan.close()
+            raise
+
+        return await self._register_upload(
+            unique_filename,
+            filename,
+            hasher.hexdigest(),
+            file_size,
+            user_id,
+            content_type,
+            description,
+            scan,
+            defer_scan=scan_in_background(),
+        )
+
+    async def register_stored_upload(
+        self,
+        object_name: str,
+        filename: str,
+        file_size: int,
+        user_id: str,
+        content_type: str,
+        description: str = None,
+        expected_hash: str = None,
+    ) -> dict:
+        """Register an object that was assembled in storage, not streamed
+        through ``upload_file`` (resumable uploads, unverified direct ones).
+
+        The object is read back once, feeding the SHA-256 and the scan, and
+        then goes through the same verdict, dedupe and blob handling. If it
+        does not hash to ``expected_hash`` it is deleted instead.
+        """
+        hasher = hashlib.sha256()
+        scan = await open_scan_session()
+        try:
+            stream = await storage.open_stream(object_name)
+            async for chunk in stream.iter_chunks():
+                hasher.update(chunk)
+                if scan:
+                    await scan.feed(chunk)
+        except BaseException:
+            if scan:
+                scan.close()
+            raise
+
+        file_hash = hasher.hexdigest()
+        if expected_hash and file_hash != expected_hash:
+            if scan:
+                scan.close()
+            await storage.delete_file(object_name)
+            raise ChecksumMismatchError("Uploaded content does not match its SHA-256")
+
+        return await self._register_upload(
+            object_name,
+            filename,
+            file_hash,
+            file_size,
+            user_id,
+            content_type,
+            description,
+            scan,
+            defer_scan=scan_in_background(),
+        )
+
+    async def _register_upload(
+        self,
+        unique_filename: str,
+        filename: str,
+        file_hash: str,
+        file_size: int,
+        user_id: str,
+        content_type: str,
+        description: Optional[str],
+        scan: Optional[ScanSession],
+        defer_scan: bool,
+    ) -> dict:
+        """Verdict, dedupe and record for a stored object with a known hash.
+
+        With ``defer_scan`` only a cached verdict is used; anything else is
+        stored as pending_scan and queued for a scan worker.
+        """
+        try:
+            if defer_scan:
+                scan_result = await virus_scanner.cached_verdict(file_hash)
+            else:
+                scan_result = await virus_scanner.complete_scan(scan, file_hash)
+        except VirusDetectedError:
+            await storage.delete_file(unique_filename)
+            raise
+        logger.info(f"Virus scan result: {scan_result}")
+
+        # No verdict (async mode, or the scanner failed): stored but held
+        # back from downloads until a scan worker marks it clean
+        if scan_result and scan_result["safe"]:
+            scan_status = ScanStatus.CLEAN
+        else:
+            scan_status = ScanStatus.PENDING
 
         # Check if file already exists (deduplication)
         existing = await self.repo.get_by_hash(file_hash, user_id)
         if existing:
             logger.info(f"File already exists (hash: {file_hash})")
+            # A retried completion may find the record it created itself
+            if existing.stored_filename != unique_filename:
+                await storage.delete_file(unique_filename)
+            return upload_result(existing, "File already exists (deduplicated)")
+
+        stored_filename, blob_sha256 = unique_filename, None
+        if settings.CONTENT_ADDRESSED_STORAGE:
+            stored_filename = await self._store_blob(
+                unique_filename, file_hash, file_size
+            )
+            blob_sha256 = file_hash
+
+        # Create database record
+        try:
+            file_record = await self.repo.create(
+                original_filename=filename,
+                stored_filename=stored_filename,
+                file_hash=file_hash,
+                file_size=file_size,
+                content_type=content_type,
+                user_id=user_id,
+                description=description,
+                scan_status=scan_status.value,
+                blob_sha256=blob_sha256,
+                preview_status=preview_status_for(filename, file_size),
+            )
+        except BaseException:
+            # Also drops the blob reference taken for the row
+            await self.db.rollback()
+            raise
+
+        if scan_status == ScanStatus.PENDING:
+            enqueue_scan(file_record.id)
+            message = "File uploaded, virus scan pending"
+        else:
+            message = "File uploaded successfully"
+            if file_record.preview_status == PreviewStatus.PENDING:
+                enqueue_derivatives(file_record.id)
+
+        logger.info(f"File uploaded successfully: {filename}")
+        return upload_result(file_record, message)
+
+    async def negotiate_upload(
+        self,
+        filename: str,
+        file_hash: str,
+        file_size: int,
+        user_id: str,
+        content_type: str,
+        description: str = None,
+        challenge: str = None,
+        proof: str = None,
+    ) -> dict:
+        """First step of a hash-first upload: create the file without bytes
+        if its content is already stored, otherwise say where to send them.
+
+        Returns a dict whose ``status`` is:
+        - ``exists``: this user already has the content (no new record)
+        - ``created``: a record was made from content stored for someone
+          else; the client proved it holds the bytes via a challenge
+        - ``prove``: content is known, answer ``challenge`` with the
+          SHA-256 of ``challenge_nonce`` followed by ``challenge_length``
+          bytes at ``challenge_offset``
+        - ``upload``: content is new; PUT it to ``upload_url``, then call
+          ``complete_url`` (see ``create_direct_upload``)
+        """
+        validate_file_extension(filename)
+        if file_size > settings.MAX_FILE_SIZE:
+            raise FileTooLargeError(
+                f"File size exceeds maximum {settings.MAX_FILE_SIZE}"
+            )
+
+        existing = await self.repo.get_by_hash(file_hash, user_id)
+        if existing:
+            logger.info(f"Negotiated upload already exists (hash: {file_hash})")
             return {
-                "id": existing.id,
-                "filename": existing.original_filename,
-                "file_size": existing.file_size,
-                "file_hash": existing.file_hash,
-                "content_type": existing.content_type,
-                "created_at": existing.created_at,
-                "message": "File already exists (deduplicated)",
+                "status": "exists",
+                **upload_result(existing, "File already exists (deduplicated)"),
             }
 
-        # Scan file for viruses
-        scan_result = await virus_scanner.scan_file(file_data)
-        logger.info(f"Virus scan result: {scan_result}")
+        async def upload() -> dict:
+            target = await self.create_direct_upload(
+                filename, file_size, file_hash, user_id, content_type, description
+            )
+            return {"status": "upload", **target}
+
+        source = await self.repo.get_any_by_hash(file_hash, file_size)
+        if source is None:
+            return await upload()
+        if source.scan_status == ScanStatus.QUARANTINED:
+            raise VirusDetectedError(f"Virus detected: {source.scan_detail}")
+
+        asked = None
+        if challenge:
+            asked = read_challenge(challenge, user_id, file_hash, file_size)
+        if asked is None:
+            token, nonce, offset, length = issue_challenge(
+                user_id, file_hash, file_size
+            )
+            return {
+                "status": "prove",
+                "challenge": token,
+                "challenge_nonce": nonce,
+                "challenge_offset": offset,
+                "challenge_length": length,
+            }
+        if not proof or not hmac.compare_digest(
+            proof.lower(), await self._hash_range(source, *asked)
+        ):
+            logger.warning(f"Failed upload proof for {file_hash} by {user_id}")
+            return await upload()
+
+        try:
+            stored_filename, blob_sha256 = await self._link_content(
+                source, filename, user_id, content_type
+            )
+        except FileNotFoundError:
+            # Source deleted (and collected) since the lookup
+            return await upload()
+
+        try:
+            file_record = await self.repo.create(
+                original_filename=filename,
+                stored_filename=stored_filename,
+                file_hash=file_hash,
+                file_size=file_size,
+                content_type=content_type,
+                user_id=user_id,
+                description=description,
+                scan_status=source.scan_status,
+                blob_sha256=blob_sha256,
+                preview_status=preview_status_for(filename, file_size),
+            )
+        except BaseException:
+            # Also drops the blob reference taken for the row
+            await self.db.rollback()
+            if not blob_sha256:
+                await storage.delete_file(stored_filename)
+            raise
+
+        if file_record.scan_status == ScanStatus.PENDING:
+            enqueue_scan(file_record.id)
+            message = "File created from stored content, virus scan pending"
+        else:
+            message = "File created from stored content (no upload needed)"
+            if file_record.preview_status == PreviewStatus.PENDING:
+                enqueue_derivatives(file_record.id)
+        logger.info(f"File created without upload: {filename}")
+        return {"status": "created", **upload_result(file_record, message)}
+
+    async def _hash_range(
+        self, file_record: File, nonce: str, offset: int, length: int
+    ) -> str:
+        """SHA-256 of ``nonce`` and then a byte range of a stored file, read
+        as a ranged GET."""
+        hasher = hashlib.sha256(nonce.encode())
+        if length:
+            stream = await storage.open_stream(
+                file_record.stored_filename, offset, offset + length - 1
+            )
+            async for chunk in stream.iter_chunks():
+                hasher.update(chunk)
+        return hasher.hexdigest()
+
+    async def _link_content(
+        self, source: File, filename: str, user_id: str, content_type: str
+    ) -> tuple[str, str]:
+        """Make ``source``'s content available to a new record without any
+        bytes from the client. Returns (stored_filename, blob_sha256).
+
+        Copies get fresh metadata: the source's names the other user.
+        Raises FileNotFoundError if the content is gone.
+        """
+        if source.blob_sha256 or settings.CONTENT_ADDRESSED_STORAGE:
+            sha256 = source.blob_sha256 or source.file_hash
+
+            async def materialize() -> None:
+                # A blob row can only be missing here for pre-CAS sources
+                if source.blob_sha256:
+                    raise FileNotFoundError("Stored content no longer exists")
+                await storage.copy_file(
+                    source.stored_filename, key, content_type, metadata={}
+                )
+
+            key = content_addressed_key(sha256)
+            stored_filename = await self.blobs.add_reference(
+                sha256, key, source.file_size, materialize
+            )
+            return stored_filename, sha256
 
-        # Upload to storage backend (MinIO/S3)
+        # Per-file layout: a server-side copy keeps delete semantics simple
         unique_filename = generate_unique_filename(filename)
-        await storage.upload_file(
+        if not await storage.file_exists(source.stored_filename):
+            raise FileNotFoundError("Stored content no longer exists")
+        await storage.copy_file(
+            source.stored_filename,
             unique_filename,
-            file_data,
-            file_size,
-            content_type=content_type,
-            metadata={
-                "original-filename": filename,
-                "user-id": user_id,
-                "file-hash": file_hash,
-            },
-        )
-
-        # Create database record
-        file_record = await self.repo.create(
-            original_filename=filename,
-            stored_filename=unique_filename,
-            file_hash=file_hash,
-            file_size=file_size,
-            content_type=content_type,
-            user_id=user_id,
-            description=description,
+            content_type,
+            metadata={"original-filename": filename, "user-id": user_id},
         )
-
-        logger.info(f"File uploaded successfully: {filename}")
-        return {
-            "id": file_record.id,
-            "filename": file_record.original_filename,
-            "file_size": file_record.file_size,
-            "file_hash": file_record.file_hash,
-            "content_type": file_record.content_type,
-            "created_at": file_record.created_at,
-            "message": "File uploaded successfully",
-        }
-
-    async def download_file(self, file_id: int, user_id: str) -> tuple[BytesIO, str]:
-        """Download file by ID."""
-        file_record = await self.repo.get_by_id(file_id)
-
-        if not file_record:
+        return unique_filename, None
+
+    async def _store_blob(self, upload_name: str, file_hash: str, size: int) -> str:
+        """Turn an uploaded object into a blob reference; returns the blob key.
+
+        New content is copied server-side to its content-addressed key;
+        known content just gains a reference. The upload object goes either
+        way.
+        """
+        key = content_addressed_key(file_hash)
+        try:
+            return await self.blobs.add_reference(
+                file_hash,
+                key,
+                size,
+                materialize=lambda: storage.copy_file(upload_name, key),
+            )
+        finally:
+            await storage.delete_file(upload_name)
+
+    async def get_file(self, file_id: int, user_id: str) -> File:
+        """Load a user's file once per request; pass it to the methods below.
+
+        Repeated calls in the same request are free, and hot files usually
+        come from the shared row cache without a query.
+        """
+        file_record = self._files.get(file_id)
+        if file_record is None:
+            file_record = await self.repo.get_cached(file_id)
+            if file_record is not None:
+                self._files[file_id] = file_record
+
+        if not file_record or file_record.user_id != user_id:
             raise FileNotFoundError("File not found")
+        return file_record
 
-        if file_record.user_id != user_id:
-            raise FileNotFoundError("File not found")
+    async def download_file(self, file_record: File) -> tuple[BytesIO, str]:
+        """Download a file into memory."""
+        ensure_clean(file_record.scan_status)
 
         # Download from storage backend
         file_data = await storage.download_file(file_record.stored_filename)
@@ -123,50 +513,133 @@ class FileService:
 
         return file_data, file_record.original_filename
 
-    async def delete_file(self, file_id: int, user_id: str) -> bool:
-        """Delete file (soft delete)."""
-        file_record = await self.repo.get_by_id(file_id)
+    async def open_file_stream(
+        self,
+        file_record: File,
+        byte_range: Optional[Tuple[int, int]] = None,
+    ) -> ObjectStream:
+        """Open a file's content for streaming, optionally a byte range."""
+        ensure_clean(file_record.scan_status)
+
+        start, end = byte_range or (None, None)
+        return await storage.open_stream(file_record.stored_filename, start, end)
+
+    async def open_derivative(
+        self, file_record: File, variant: Derivative
+    ) -> ObjectStream:
+        """Open a file's thumbnail or preview (WebP) for streaming."""
+        ensure_clean(file_record.scan_status)
+        if file_record.preview_status != PreviewStatus.READY:
+            raise FileNotFoundError("Preview not available")
+        return await storage.open_stream(
+            derivative_key(file_record.stored_filename, variant.value)
+        )
 
-        if not file_record:
-            raise FileNotFoundError("File not found")
+    async def open_archive(
+        self, file_ids: List[int], user_id: str
+    ) -> AsyncIterator[bytes]:
+        """Check a set of files and stream them as one ZIP archive.
+
+        Every file is loaded in one query and checked before the first byte
+        is produced, so a missing or unscanned file fails the request with
+        a status code rather than truncating the archive.
+        """
+        file_ids = list(dict.fromkeys(file_ids))
+        records = await self.repo.get_many_by_user(file_ids, user_id)
+        found = {file_record.id: file_record for file_record in records}
+        missing = [str(file_id) for file_id in file_ids if file_id not in found]
+        if missing:
+            raise FileNotFoundError(f"Files not found: {', '.join(missing)}")
+
+        entries = []
+        taken = set()
+        for file_id in file_ids:
+            file_record = found[file_id]
+            ensure_clean(file_record.scan_status)
+            entries.append(
+                ZipEntry(
+                    name=archive_member_name(file_record.original_filename, taken),
+                    size=file_record.file_size,
+                    modified=file_record.created_at,
+                    compress=not is_compressed_format(
+                        file_record.original_filename, file_record.content_type
+                    ),
+                    open=partial(storage.open_stream, file_record.stored_filename),
+                )
+            )
+        logger.info(f"Archive of {len(entries)} files for user {user_id}")
+        return stream_zip(entries, settings.ARCHIVE_PREFETCH_FILES)
 
-        if file_record.user_id != user_id:
+    async def delete_file(self, file_record: File) -> bool:
+        """Delete file (soft delete)."""
+        # Soft delete from database; fails if the row was deleted meanwhile
+        if not await self.repo.soft_delete(file_record.id):
             raise FileNotFoundError("File not found")
+        self._files.pop(file_record.id, None)
 
-        # Soft delete from database
-        await self.repo.soft_delete(file_id)
-
-        # Delete from storage backend
-        await storage.delete_file(file_record.stored_filename)
+        if file_record.blob_sha256:
+            # Shared content: the collector deletes it with the last reference
+            schedule_blob_gc()
+        else:
+            # The object collector removes it from storage
+            schedule_object_gc()
 
         logger.info(f"File deleted: {file_record.original_filename}")
         return True
 
-    async def get_file_metadata(self, file_id: int, user_id: str) -> dict:
-        """Get file metadata."""
-        file_record = await self.repo.get_by_id(file_id)
+    async def delete_files(self, file_ids: List[int], user_id: str) -> List[int]:
+        """Soft delete many of a user's files at once; the IDs deleted.
 
-        if not file_record:
-            raise FileNotFoundError("File not found")
-
-        if file_record.user_id != user_id:
-            raise FileNotFoundError("File not found")
+        One UPDATE marks the rows. Objects are removed in the background
+        in multi-object batches, so this costs no storage calls at all.
+        """
+        deleted = await self.repo.soft_delete_many(
+            list(dict.fromkeys(file_ids)), user_id
+        )
+        for file_id, _ in deleted:
+            self._files.pop(file_id, None)
 
-        return {
-            "id": file_record.id,
-            "filename": file_record.original_filename,
-            "file_size": file_record.file_size,
-            "content_type": file_record.content_type,
-            "file_hash": file_record.file_hash,
-            "created_at": file_record.created_at,
-            "updated_at": file_record.updated_at,
-        }
+        shared = sum(1 for _, sha256 in deleted if sha256)
+        if shared:
+            schedule_blob_gc()
+        if shared < len(deleted):
+            schedule_object_gc()
+        return [file_id for file_id, _ in deleted]
 
     async def list_files(
-        self, user_id: str, skip: int = 0, limit: int = 10
+        self,
+        user_id: str,
+        limit: int = 10,
+        cursor: str = None,
+        skip: int = 0,
+        with_urls: bool = False,
     ) -> dict:
-        """List user files with pagination."""
-        files, total = await self.repo.list_by_user(user_id, skip, limit)
+        """List user files, newest first.
+
+        Pass the previous page's ``next_cursor`` to continue; ``skip`` is
+        kept for older clients but gets slower the deeper it goes. With
+        ``with_urls`` clean files come with a presigned download URL, and
+        files with previews with a presigned URL for their thumbnail.
+        """
+        after = decode_cursor(cursor) if cursor else None
+        # One extra row tells whether there is a next page
+        files = await self.repo.list_by_user(user_id, limit + 1, after, skip)
+        next_cursor = None
+        if len(files) > limit:
+            files = files[:limit]
+            next_cursor = encode_cursor(files[-1].created_at, files[-1].id)
+
+        urls, thumbnails = {}, {}
+        if with_urls:
+            clean = [f for f in files if f.scan_status == ScanStatus.CLEAN]
+            thumbnails = {
+                f.id: derivative_key(f.stored_filename, Derivative.THUMBNAIL.value)
+                for f in clean
+                if f.preview_status == PreviewStatus.READY
+            }
+            urls = await presigned_urls.download_urls(
+                [f.stored_filename for f in clean] + list(thumbnails.values())
+            )
 
         return {
             "items": [
@@ -175,40 +648,168 @@ class FileService:
                     "original_filename": f.original_filename,
                     "file_size": f.file_size,
                     "content_type": f.content_type,
+                    "scan_status": f.scan_status,
                     "created_at": f.created_at,
+                    "preview_status": f.preview_status,
+                    "download_url": urls.get(f.stored_filename),
+                    "thumbnail_url": urls.get(thumbnails.get(f.id)),
                 }
                 for f in files
             ],
-            "total": total,
-            "page": skip // limit + 1,
+            "total": await self.repo.count_by_user(user_id),
+            "page": None if cursor else skip // limit + 1,
             "page_size": limit,
+            "next_cursor": next_cursor,
         }
 
     async def get_presigned_download_url(
-        self, file_id: int, user_id: str, expiration: int = None
-    ) -> str:
-        """Generate presigned download URL."""
-        file_record = await self.repo.get_by_id(file_id)
-
-        if not file_record:
-            raise FileNotFoundError("File not found")
-
-        if file_record.user_id != user_id:
-            raise FileNotFoundError("File not found")
-
-        url = await storage.get_presigned_download_url(
+        self, file_record: File, expiration: int = None
+    ) -> Tuple[str, int]:
+        """Presigned download URL and the seconds it is still valid for.
+
+        A recently signed URL for the same object is reused, so this may
+        be less than ``expiration`` (never below the reuse threshold).
+        """
+        ensure_clean(file_record.scan_status)
+        return await presigned_urls.download_url(
             file_record.stored_filename, expiration
         )
-        return url
 
-    async def get_presigned_upload_url(
-        self, filename: str, expiration: int = None
-    ) -> str:
-        """Generate presigned upload URL."""
-        unique_filename = generate_unique_filename(filename)
+    async def create_direct_upload(
+        self,
+        filename: str,
+        file_size: int,
+        file_hash: str,
+        user_id: str,
+        content_type: str,
+        description: str = None,
+        expiration: int = None,
+    ) -> dict:
+        """Start a direct-to-storage upload: record the intent, presign a PUT.
+
+        The bytes never pass through this service. Where storage supports
+        it the URL only accepts a body with the declared SHA-256.
+        """
         validate_file_extension(filename)
+        if file_size > settings.MAX_FILE_SIZE:
+            raise FileTooLargeError(
+                f"File size exceeds maximum {settings.MAX_FILE_SIZE}"
+            )
 
+        expiration = expiration or settings.PRESIGNED_URL_EXPIRATION
+        unique_filename = generate_unique_filename(filename)
         url = await storage.get_presigned_upload_url(
-            unique_filename, expiration
+            unique_filename, expiration, content_type=content_type, sha256=file_hash
         )
-        return url
+        intent = await self.intents.create(
+            id=uuid.uuid4().hex,
+            user_id=user_id,
+            filename=filename,
+            content_type=content_type,
+            description=description,
+            file_size=file_size,
+            file_hash=file_hash,
+            stored_filename=unique_filename,
+            # The object may land until the URL expires; allow for a slow PUT
+            expires_at=datetime.utcnow() + timedelta(seconds=2 * expiration),
+        )
+        return {
+            "upload_id": intent.id,
+            "upload_url": url,
+            # Signed into the URL on S3, so the PUT must send them as given
+            "upload_headers": {
+                "Content-Type": content_type,
+                "x-amz-checksum-sha256": base64.b64encode(
+                    bytes.fromhex(file_hash)
+                ).decode(),
+            },
+            "complete_url": f"/api/v1/files/presigned-upload/{intent.id}/complete",
+            "expires_in": expiration,
+        }
+
+    async def complete_direct_upload(self, intent_id: str, user_id: str) -> dict:
+        """Register a direct upload once the object is in storage.
+
+        A HEAD checks the size, and the SHA-256 when storage verified one on
+        upload; then the record is created and a scan job queued without
+        reading the object. Backends that keep no checksum (MinIO) get the
+        object read back once instead, hashing and scanning together.
+
+        The intent stays locked until the file row is committed, so the
+        expiry sweep cannot delete the object mid-registration.
+        """
+        intent = await self.intents.get(intent_id, user_id, lock=True)
+        if intent is None:
+            raise FileNotFoundError("Upload not found")
+
+        info = await storage.stat_file(intent.stored_filename)
+        if info is None:
+            if intent.expires_at < datetime.utcnow():
+                await self.intents.delete(intent.id)
+                raise UploadExpiredError()
+            raise UploadIncompleteError("Object has not been uploaded yet")
+
+        if info.size != intent.file_size or (
+            info.sha256 is not None and info.sha256 != intent.file_hash
+        ):
+            await storage.delete_file(intent.stored_filename)
+            await self.intents.delete(intent.id)
+            raise ChecksumMismatchError(
+                "Uploaded object does not match the declared size and SHA-256"
+            )
+
+        try:
+            if info.sha256 is not None:
+                result = await self._register_upload(
+                    intent.stored_filename,
+                    intent.filename,
+                    intent.file_hash,
+                    intent.file_size,
+                    user_id,
+                    intent.content_type,
+                    intent.description,
+                    scan=None,
+                    defer_scan=settings.ENABLE_VIRUS_SCAN,
+                )
+            else:
+                result = await self.register_stored_upload(
+                    intent.stored_filename,
+                    intent.filename,
+                    intent.file_size,
+                    user_id,
+                    intent.content_type,
+                    intent.description,
+                    expected_hash=intent.file_hash,
+                )
+        except (ChecksumMismatchError, VirusDetectedError):
+            # The object is gone; there is nothing left to complete
+            await self.intents.delete(intent.id)
+            raise
+
+        await self.intents.delete(intent.id)
+        logger.info(f"Direct upload {intent.id} registered as file {result['id']}")
+        return result
+
+    async def discard_expired_intents(self) -> int:
+        """Delete expired direct uploads and their objects; returns how many.
+
+        An object a file row already uses (completed just before the
+        intent row went) is kept. An intent that fails is left for the
+        next sweep.
+        """
+        discarded = 0
+        failed: List[str] = []
+        while (intent := await self.intents.lock_expired(failed)) is not None:
+            try:
+                key = intent.stored_filename
+                if not await self.repo.unpurged_keys([key]):
+                    await storage.delete_file(key)
+                await self.intents.delete(intent.id)
+            except Exception as e:
+                await self.db.rollback()
+                failed.append(intent.id)
+                logger.error(f"Could not discard upload {intent.id}: {e}")
+                continue
+            UPLOADS_EXPIRED.labels(kind="direct").inc()
+            discarded += 1
+        return discarded
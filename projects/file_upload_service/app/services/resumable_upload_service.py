@@ -0,0 +1,308 @@
+"""
+Resumable uploads (tus 1.0 core, creation and termination).
+
+How it works:
+- POST creates an upload session (a row in ``upload_sessions``); PATCHes
+  then append bytes at the session's offset, from any worker
+- Appended bytes are cut into STORAGE_PART_SIZE parts of one storage
+  multipart upload. Part N always holds bytes [(N-1)*size, N*size), so a
+  resumed upload just continues with the next part number
+- Bytes past the last whole part are saved as a small tail object and
+  prepended to the next PATCH, so everything up to the acknowledged
+  offset is durable even if the connection drops mid-part
+- The last PATCH assembles the object, which is then read back once for
+  the SHA-256 and the scan and registered like any other upload
+"""
+
+import json
+import uuid
+from datetime import datetime, timedelta
+from io import BytesIO
+from typing import AsyncIterator, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.exceptions import (
+    FileNotFoundError,
+    FileTooLargeError,
+    UploadExpiredError,
+    UploadOffsetMismatchError,
+    VirusDetectedError,
+)
+from app.core.metrics import UPLOADS_EXPIRED
+from app.core.storage import storage
+from app.models.upload_session import UploadSession
+from app.repositories.upload_session_repository import UploadSessionRepository
+from app.services.file_service import FileService, object_metadata
+from app.utils.file_utils import generate_unique_filename, validate_file_extension
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def tail_key(session_id: str, offset: int) -> str:
+    """Object holding the bytes after the last whole part, as of ``offset``."""
+    return f"tails/{session_id}/{offset}"
+
+
+class ResumableUploadService:
+    """Resumable upload sessions on top of storage multipart uploads."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.repo = UploadSessionRepository(db)
+
+    async def create_upload(
+        self,
+        filename: str,
+        upload_length: int,
+        user_id: str,
+        content_type: str,
+        description: str = None,
+    ) -> UploadSession:
+        """Open a session for ``upload_length`` bytes; nothing is stored yet."""
+        validate_file_extension(filename)
+        if upload_length > settings.MAX_FILE_SIZE:
+            raise FileTooLargeError(
+                f"File size exceeds maximum {settings.MAX_FILE_SIZE}"
+            )
+
+        return await self.repo.create(
+            id=uuid.uuid4().hex,
+            user_id=user_id,
+            filename=filename,
+            content_type=content_type,
+            description=description,
+            upload_length=upload_length,
+            offset=0,
+            stored_filename=generate_unique_filename(filename),
+            parts="[]",
+            tail_size=0,
+            expires_at=datetime.utcnow()
+            + timedelta(seconds=settings.RESUMABLE_UPLOAD_EXPIRY),
+        )
+
+    async def get_upload(self, session_id: str, user_id: str) -> UploadSession:
+        """Get a live session; expired ones are cleaned up and rejected."""
+        session = await self.repo.get(session_id, user_id)
+        if session is None:
+            raise FileNotFoundError("Upload not found")
+        if session.expires_at < datetime.utcnow():
+            await self._discard(session)
+            raise UploadExpiredError()
+        return session
+
+    async def append(
+        self,
+        session_id: str,
+        user_id: str,
+        offset: int,
+        chunks: AsyncIterator[bytes],
+    ) -> Tuple[UploadSession, Optional[dict]]:
+        """Append a PATCH body at ``offset``.
+
+        A body cut short by a disconnect still counts up to its last byte.
+        Returns the session and, once the last byte is in, the registered
+        file (the same result as a one-shot upload).
+        """
+        session = await self.get_upload(session_id, user_id)
+        if offset != session.offset:
+            raise UploadOffsetMismatchError(
+                f"Upload is at offset {session.offset}, not {offset}"
+            )
+        if 0 < session.upload_length == session.offset:
+            # Assembled by an earlier PATCH whose registration failed
+            return session, await self._register(session)
+
+        part_size = settings.STORAGE_PART_SIZE
+        parts: List[Tuple[int, str]] = [tuple(p) for p in json.loads(session.parts)]
+        multipart_id = session.multipart_id
+        started_here = False
+        upload = None
+
+        buffer = bytearray()
+        if session.tail_size:
+            tail = await storage.download_file(tail_key(session.id, session.offset))
+            buffer += tail.getvalue()
+
+        async def submit(data: bytes) -> None:
+            nonlocal multipart_id, started_here, upload
+            if upload is None:
+                if multipart_id is None:
+                    multipart_id = await storage.start_multipart_upload(
+                        session.stored_filename,
+                        session.content_type,
+                        object_metadata(session.filename, user_id),
+                    )
+                    started_here = True
+                upload = storage.resume_multipart_upload(
+                    session.stored_filename, multipart_id, len(parts) + 1
+                )
+            await upload.submit(data)
+
+        received = 0
+        try:
+            async for chunk in chunks:
+                received += len(chunk)
+                if session.offset + received > session.upload_length:
+                    raise FileTooLargeError(
+                        "Upload exceeds its declared Upload-Length"
+                    )
+                buffer += chunk
+                while len(buffer) >= part_size:
+                    await submit(bytes(buffer[:part_size]))
+                    del buffer[:part_size]
+
+            finished = session.offset + received == session.upload_length
+            if finished and buffer and multipart_id is not None:
+                # The last part may be shorter than the rest
+                await submit(bytes(buffer))
+                buffer.clear()
+            if upload is not None:
+                parts += await upload.sent_parts()
+        except BaseException:
+            if upload is not None:
+                await upload.cancel()
+            if started_here:
+                await storage.abort_multipart_upload(
+                    session.stored_filename, multipart_id
+                )
+            raise
+
+        if finished:
+            await self._assemble(session, multipart_id, parts, buffer)
+            return session, await self._register(session)
+        if not received:
+            return session, None
+
+        # advance() updates ``session`` in place; keep what it replaces
+        old_offset, old_tail_size = session.offset, session.tail_size
+        new_offset = old_offset + received
+        if buffer:
+            await storage.upload_file(
+                tail_key(session.id, new_offset), BytesIO(buffer), len(buffer)
+            )
+        advanced = await self.repo.advance(
+            session.id,
+            old_offset,
+            offset=new_offset,
+            multipart_id=multipart_id,
+            parts=json.dumps(parts),
+            tail_size=len(buffer),
+        )
+        if not advanced:
+            if buffer:
+                await storage.delete_file(tail_key(session.id, new_offset))
+            if started_here:
+                await storage.abort_multipart_upload(
+                    session.stored_filename, multipart_id
+                )
+            raise UploadOffsetMismatchError("Upload was advanced by another request")
+        if old_tail_size:
+            await storage.delete_file(tail_key(session.id, old_offset))
+
+        await self.db.refresh(session)
+        logger.info(f"Upload {session.id} at {new_offset}/{session.upload_length}")
+        return session, None
+
+    async def terminate(self, session_id: str, user_id: str) -> None:
+        """Cancel an upload and discard everything stored for it."""
+        session = await self.repo.get(session_id, user_id)
+        if session is None:
+            raise FileNotFoundError("Upload not found")
+        await self._discard(session)
+
+    async def discard_expired(self) -> int:
+        """Discard every expired session; returns how many were discarded.
+
+        Abandoned sessions would otherwise keep their row, tail object and
+        open multipart upload until their owner came back. One that fails
+        is left for the next sweep.
+        """
+        discarded = 0
+        failed: List[str] = []
+        while (session := await self.repo.lock_expired(failed)) is not None:
+            try:
+                await self._discard(session)
+            except Exception as e:
+                await self.db.rollback()
+                failed.append(session.id)
+                logger.error(f"Could not discard upload {session.id}: {e}")
+                continue
+            UPLOADS_EXPIRED.labels(kind="resumable").inc()
+            discarded += 1
+        return discarded
+
+    async def _assemble(
+        self,
+        session: UploadSession,
+        multipart_id: Optional[str],
+        parts: List[Tuple[int, str]],
+        buffer: bytearray,
+    ) -> None:
+        """Turn the parts (or, for small files, the buffer) into the object."""
+        if multipart_id is None:
+            await storage.upload_file(
+                session.stored_filename,
+                BytesIO(buffer),
+                len(buffer),
+                content_type=session.content_type,
+                metadata=object_metadata(session.filename, session.user_id),
+            )
+        else:
+            upload = storage.resume_multipart_upload(
+                session.stored_filename, multipart_id, len(parts) + 1
+            )
+            await upload.complete(parts)
+
+        old_offset, old_tail_size = session.offset, session.tail_size
+        advanced = await self.repo.advance(
+            session.id,
+            old_offset,
+            offset=session.upload_length,
+            multipart_id=None,
+            parts="[]",
+            tail_size=0,
+        )
+        if not advanced:
+            raise UploadOffsetMismatchError("Upload was completed by another request")
+        if old_tail_size:
+            await storage.delete_file(tail_key(session.id, old_offset))
+        await self.db.refresh(session)
+
+    async def _register(self, session: UploadSession) -> dict:
+        """Hash, scan and record the assembled object, then end the session.
+
+        On an unexpected error the session stays, so the client can repeat
+        the final PATCH to retry just this step.
+        """
+        try:
+            result = await FileService(self.db).register_stored_upload(
+                session.stored_filename,
+                session.filename,
+                session.upload_length,
+                session.user_id,
+                session.content_type,
+                session.description,
+            )
+        except VirusDetectedError:
+            # The object is already deleted; nothing left to retry
+            await self.repo.delete(session.id)
+            raise
+        await self.repo.delete(session.id)
+        logger.info(f"Upload {session.id} completed as file {result['id']}")
+        return result
+
+    async def _discard(self, session: UploadSession) -> None:
+        if session.multipart_id:
+            await storage.abort_multipart_upload(
+                session.stored_filename, session.multipart_id
+            )
+        if session.tail_size:
+            await storage.delete_file(tail_key(session.id, session.offset))
+        if 0 < session.upload_length == session.offset:
+            # Assembled but never registered
+            await storage.delete_file(session.stored_filename)
+        await self.repo.delete(session.id)
+        logger.info(f"Discarded upload session: {session.id}")
@@ -0,0 +1,84 @@
+"""
+Thumbnail and preview rendering; runs in the process pool.
+
+How it works:
+- The source is decoded once, at the largest size any variant needs:
+  images with Pillow (JPEGs in draft mode, so the decoder itself scales
+  down by up to 8x instead of decoding every pixel), PDFs by rendering
+  their first page with pdfium
+- Variants are made largest first, each scaled down from the previous
+  one to fit a square box, and encoded as WebP (transparency kept)
+- Images with more than ``max_pixels`` pixels are rejected from their
+  header, before any pixel data is decoded
+
+Everything here is plain CPU work on plain values (bytes and sizes in,
+bytes out), so it can be handed to another process as is.
+"""
+
+from enum import Enum
+from io import BytesIO
+from typing import Dict
+
+import pypdfium2 as pdfium
+from PIL import Image, ImageOps
+
+
+class Derivative(str, Enum):
+    """Rendered variants of a file, smallest first."""
+
+    THUMBNAIL = "thumbnail"
+    PREVIEW = "preview"
+
+
+def _open_image(data: bytes, box: int, max_pixels: int) -> Image.Image:
+    image = Image.open(BytesIO(data))
+    if image.width * image.height > max_pixels:
+        raise ValueError(f"Image too large: {image.width}x{image.height}")
+    # JPEG only: decode at 1/2, 1/4 or 1/8 scale, still at least ``box``
+    image.draft("RGB", (box, box))
+    # Apply the EXIF orientation, or phone photos come out sideways
+    return ImageOps.exif_transpose(image)
+
+
+def _render_first_page(data: bytes, box: int) -> Image.Image:
+    pdf = pdfium.PdfDocument(data)
+    try:
+        page = pdf[0]
+        width, height = page.get_size()
+        bitmap = page.render(scale=box / max(width, height))
+        # Detach from pdfium's buffer before the document is closed
+        return bitmap.to_pil().copy()
+    finally:
+        pdf.close()
+
+
+def render_derivatives(
+    data: bytes,
+    kind: str,
+    sizes: Dict[str, int],
+    max_pixels: int,
+    quality: int,
+) -> Dict[str, bytes]:
+    """Render ``data`` ("image" or "pdf") into WebP variants.
+
+    ``sizes`` maps each variant name to the longest side of its box;
+    images smaller than a box are not enlarged. Raises on content that
+    cannot be decoded.
+    """
+    largest = max(sizes.values())
+    if kind == "pdf":
+        image = _render_first_page(data, largest)
+    else:
+        image = _open_image(data, largest, max_pixels)
+
+    if image.mode not in ("RGB", "RGBA"):
+        alpha = image.mode in ("LA", "PA") or "transparency" in image.info
+        image = image.convert("RGBA" if alpha else "RGB")
+
+    rendered = {}
+    for variant, size in sorted(sizes.items(), key=lambda item: -item[1]):
+        image.thumbnail((size, size), Image.Resampling.LANCZOS)
+        out = BytesIO()
+        image.save(out, "WEBP", quality=quality)
+        rendered[variant] = out.getvalue()
+    return rendered
@@ -0,0 +1,54 @@
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from app.core.storage import FileStream, ObjectStream
+
+# ASGI extension letting the server send an open file itself (sendfile)
+ZEROCOPY_EXTENSION = "http.response.zerocopy"
+
+
+class ObjectStreamResponse(StreamingResponse):
+    """Streams an ObjectStream; local files go zero-copy when possible.
+
+    If the server offers the ASGI zero-copy extension and the object is a
+    local file (LocalFSStorage), the file descriptor is handed to the
+    server, which sends it with ``sendfile`` so the bytes never enter
+    Python. Otherwise the object is read chunk by chunk on the I/O pool.
+
+    Uvicorn, the server this service ships with, does not offer the
+    extension, so under it every download takes the chunked path.
+    """
+
+    def __init__(self, stream: ObjectStream, **kwargs):
+        super().__init__(stream.iter_chunks(), **kwargs)
+        self.stream = stream
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        extensions = scope.get("extensions") or {}
+        if not (
+            isinstance(self.stream, FileStream) and ZEROCOPY_EXTENSION in extensions
+        ):
+            await super().__call__(scope, receive, send)
+            return
+
+        try:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": self.status_code,
+                    "headers": self.raw_headers,
+                }
+            )
+            await send(
+                {
+                    "type": ZEROCOPY_EXTENSION,
+                    "file": self.stream.file.fileno(),
+                    "offset": self.stream.offset,
+                    "count": self.stream.count,
+                    "more_body": False,
+                }
+            )
+        finally:
+            self.stream.close()
+        if self.background is not None:
+            await self.background()
@@ -1,6 +1,7 @@
 import hashlib
 import uuid
 from pathlib import Path
+from typing import Optional
 
 from app.core.config import settings
 from app.core.exceptions import InvalidFileTypeError
@@ -27,6 +28,73 @@ def generate_unique_filename(original_filename: str) -> str:
     return unique_name
 
 
+# Formats that are already compressed; deflating them again only costs CPU
+COMPRESSED_EXTENSIONS = set(
+    "7z avif bz2 docx epub gif gz heic jpeg jpg m4a mkv mov mp3 mp4 odp ods odt "
+    "ogg pdf png pptx rar tgz webm webp xlsx xz zip".split()
+)
+
+
+def is_compressed_format(filename: str, content_type: str) -> bool:
+    """Whether content is already compressed (not worth deflating)."""
+    ext = Path(filename).suffix.lstrip(".").lower()
+    return ext in COMPRESSED_EXTENSIONS or content_type.startswith(
+        ("video/", "audio/")
+    )
+
+
+def archive_member_name(filename: str, taken: set) -> str:
+    """A safe, unique name for a file inside a ZIP archive.
+
+    Path separators are replaced (no entry can extract outside the target
+    directory) and repeated names become ``name (1).ext``, ``name (2).ext``.
+    """
+    name = filename.replace("/", "_").replace("\\", "_").lstrip(".") or "file"
+    stem, ext = Path(name).stem, Path(name).suffix
+    candidate, n = name, 0
+    while candidate.lower() in taken:
+        n += 1
+        candidate = f"{stem} ({n}){ext}"
+    taken.add(candidate.lower())
+    return candidate
+
+
+def content_addressed_key(file_hash: str) -> str:
+    """Object key for content-addressed storage: blobs/ab/cd/<sha256>."""
+    return f"blobs/{file_hash[:2]}/{file_hash[2:4]}/{file_hash}"
+
+
+# Formats thumbnails and previews are rendered from (PDFs: the first page)
+IMAGE_EXTENSIONS = set("bmp gif jpeg jpg png tif tiff webp".split())
+
+DERIVED_PREFIX = "derived/"
+
+
+def derivative_kind(filename: str) -> Optional[str]:
+    """"image" or "pdf" for files that get thumbnails and previews, else None."""
+    ext = Path(filename).suffix.lstrip(".").lower()
+    if ext == "pdf":
+        return "pdf"
+    if ext in IMAGE_EXTENSIONS:
+        return "image"
+    return None
+
+
+def derivative_key(stored_filename: str, variant: str) -> str:
+    """Object key of a thumbnail/preview: derived/<stored_filename>/<variant>.
+
+    Keyed by the source object, so content-addressed files share theirs.
+    """
+    return f"{DERIVED_PREFIX}{stored_filename}/{variant}.webp"
+
+
+def derivative_source(key: str) -> Optional[str]:
+    """The source object of a derivative key; None for any other key."""
+    if not key.startswith(DERIVED_PREFIX):
+        return None
+    return key[len(DERIVED_PREFIX) :].rpartition("/")[0] or None
+
+
 def calculate_file_hash(file_data: bytes) -> str:
     """Calculate SHA256 hash of file."""
     return hashlib.sha256(file_data).hexdigest()
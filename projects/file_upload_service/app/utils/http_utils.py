@@ -0,0 +1,62 @@
+import base64
+import binascii
+from typing import Dict, Optional, Tuple
+
+from app.core.exceptions import RangeNotSatisfiableError
+
+
+def parse_range_header(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Resolve a ``Range`` header to an inclusive (start, end) byte range.
+
+    Only single byte ranges are honoured. Returns None when the whole file
+    should be sent instead (other units, multiple ranges, malformed values),
+    which RFC 9110 allows a server to do.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        elif last:
+            # Suffix range: the final N bytes
+            start = max(size - int(last), 0)
+            end = size - 1
+        else:
+            return None
+    except ValueError:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiableError(f"Range start {start} beyond size {size}")
+    if end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    """Weak comparison of an ``If-None-Match``/``If-Range`` value to an ETag."""
+    if header.strip() == "*":
+        return True
+    candidates = (value.strip().removeprefix("W/") for value in header.split(","))
+    return etag.removeprefix("W/") in candidates
+
+
+def parse_upload_metadata(header: str) -> Dict[str, str]:
+    """Decode a tus ``Upload-Metadata`` header: ``key base64value,...``.
+
+    Keys without a value map to "". Undecodable values are skipped.
+    """
+    metadata = {}
+    for pair in header.split(","):
+        key, _, value = pair.strip().partition(" ")
+        if not key:
+            continue
+        try:
+            metadata[key] = base64.b64decode(value.strip(), validate=True).decode()
+        except (binascii.Error, UnicodeDecodeError):
+            continue
+    return metadata
@@ -0,0 +1,22 @@
+import base64
+import binascii
+from datetime import datetime
+from typing import Tuple
+
+from app.core.exceptions import InvalidCursorError
+
+
+def encode_cursor(created_at: datetime, file_id: int) -> str:
+    """Opaque cursor for the position after a listed file."""
+    raw = f"{created_at.isoformat()}|{file_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """(created_at, id) of the last file on the previous page."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, _, file_id = raw.partition("|")
+        return datetime.fromisoformat(created_at), int(file_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursorError()
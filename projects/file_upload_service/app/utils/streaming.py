@@ -0,0 +1,51 @@
+from typing import AsyncIterator, BinaryIO, Optional
+
+from fastapi import Request, UploadFile
+from starlette.requests import ClientDisconnect
+
+from app.core.config import settings
+from app.core.exceptions import FileTooLargeError
+
+
+async def iter_upload_file(
+    file: UploadFile, chunk_size: Optional[int] = None
+) -> AsyncIterator[bytes]:
+    """Yield an UploadFile's content in chunks without reading it whole."""
+    chunk_size = chunk_size or settings.UPLOAD_CHUNK_SIZE
+    while chunk := await file.read(chunk_size):
+        yield chunk
+
+
+async def iter_buffer(
+    data: BinaryIO, chunk_size: Optional[int] = None
+) -> AsyncIterator[bytes]:
+    """Yield an in-memory file object's remaining content in chunks."""
+    chunk_size = chunk_size or settings.UPLOAD_CHUNK_SIZE
+    while chunk := data.read(chunk_size):
+        yield chunk
+
+
+async def limit_stream(
+    chunks: AsyncIterator[bytes], max_size: int
+) -> AsyncIterator[bytes]:
+    """Pass chunks through, raising FileTooLargeError past ``max_size``."""
+    size = 0
+    async for chunk in chunks:
+        size += len(chunk)
+        if size > max_size:
+            raise FileTooLargeError(f"File size exceeds maximum {max_size}")
+        yield chunk
+
+
+async def iter_request_body(request: Request) -> AsyncIterator[bytes]:
+    """Yield the request body; a client disconnect just ends the body.
+
+    For resumable uploads, where whatever arrived before the connection
+    dropped is still kept.
+    """
+    try:
+        async for chunk in request.stream():
+            if chunk:
+                yield chunk
+    except ClientDisconnect:
+        return
@@ -0,0 +1,63 @@
+"""
+Proof that a client holds content before it is linked to another upload.
+
+Why?
+- Hash-first uploads create a file from existing content without any
+  bytes being sent. Knowing a SHA-256 is not the same as having the file,
+  so a hash alone must never grant access to another user's content
+- The server picks a random byte range and a random nonce; the client
+  answers with the SHA-256 of the nonce followed by that range, which only
+  someone with the content can compute. The nonce matters for small files:
+  their range is the whole file, whose SHA-256 is exactly what the client
+  already sent
+
+Challenges are stateless: the nonce, range, expiry and what it is for
+are signed with SECRET_KEY, so any worker can check an answer.
+"""
+
+import hashlib
+import hmac
+import secrets
+import time
+from typing import Optional, Tuple
+
+from app.core.config import settings
+
+PROOF_RANGE_SIZE = 64 * 1024
+PROOF_TTL = 300  # Seconds a challenge stays valid
+
+
+def _sign(payload: str) -> str:
+    return hmac.new(
+        settings.SECRET_KEY.encode(), payload.encode(), hashlib.sha256
+    ).hexdigest()
+
+
+def issue_challenge(
+    user_id: str, file_hash: str, size: int
+) -> Tuple[str, str, int, int]:
+    """New challenge for this user and content: (token, nonce, offset, length)."""
+    nonce = secrets.token_hex(16)
+    length = min(size, PROOF_RANGE_SIZE)
+    offset = secrets.randbelow(size - length + 1)
+    expires = int(time.time()) + PROOF_TTL
+    fields = f"{nonce}.{offset}.{length}.{expires}"
+    token = f"{fields}.{_sign(f'{user_id}:{file_hash}:{size}:{fields}')}"
+    return token, nonce, offset, length
+
+
+def read_challenge(
+    token: str, user_id: str, file_hash: str, size: int
+) -> Optional[Tuple[str, int, int]]:
+    """The (nonce, offset, length) a token asks for, or None if forged or
+    expired."""
+    try:
+        nonce, offset, length, expires, signature = token.split(".")
+        fields = f"{nonce}.{int(offset)}.{int(length)}.{int(expires)}"
+    except ValueError:
+        return None
+    expected = _sign(f"{user_id}:{file_hash}:{size}:{fields}")
+    if not hmac.compare_digest(signature, expected) or int(expires) < time.time():
+        return None
+    return nonce, int(offset), int(length)
+
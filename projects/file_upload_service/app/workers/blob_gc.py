@@ -0,0 +1,114 @@
+"""
+Garbage collection of content-addressed blobs nobody references any more.
+
+How it works:
+- Deleting a file only drops its blob's ref_count; the object stays until
+  the collector runs, so deletes never wait on storage
+- The collector wakes when a count may have reached zero, and also every
+  BLOB_GC_INTERVAL to pick up anything missed (restarts, failed deletes)
+- Each blob is locked while its object (and any thumbnails rendered from
+  it) is deleted, then the row goes; an upload of the same content waits
+  on that lock and recreates the blob, so a live reference never points
+  at a deleted object
+"""
+
+import asyncio
+from typing import Optional
+
+from app.core.config import settings
+from app.core.metrics import BLOBS_COLLECTED
+from app.core.storage import storage
+from app.db.session import AsyncSessionLocal
+from app.repositories.blob_repository import BlobRepository
+from app.utils.derivatives import Derivative
+from app.utils.file_utils import derivative_key
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class BlobCollector:
+    """Background task deleting unreferenced blobs and their objects."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+        logger.info("Started blob garbage collector")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                collected = await self.collect()
+                if collected:
+                    logger.info(f"Collected {collected} unreferenced blobs")
+            except Exception as e:
+                logger.error(f"Blob collection failed: {e}")
+
+    async def collect(self) -> int:
+        """Delete every unreferenced blob; returns how many were deleted."""
+        collected = 0
+        async with AsyncSessionLocal() as db:
+            repo = BlobRepository(db)
+            while (blob := await repo.lock_unreferenced()) is not None:
+                keys = [blob.storage_key] + [
+                    derivative_key(blob.storage_key, variant.value)
+                    for variant in Derivative
+                ]
+                try:
+                    if await storage.delete_files(keys):
+                        raise OSError(f"Could not delete blob {blob.sha256}")
+                except Exception:
+                    # Unlock and leave the row for the next run
+                    await db.rollback()
+                    raise
+                await repo.delete(blob.sha256)
+                BLOBS_COLLECTED.inc()
+                collected += 1
+        return collected
+
+
+# Lazy singleton - started on startup
+_blob_collector: Optional[BlobCollector] = None
+
+
+def start_blob_collector() -> BlobCollector:
+    """Create and start the collector on the running loop. Call on startup."""
+    global _blob_collector
+
+    if _blob_collector is None:
+        _blob_collector = BlobCollector(interval=settings.BLOB_GC_INTERVAL)
+        _blob_collector.start()
+    return _blob_collector
+
+
+async def stop_blob_collector() -> None:
+    """Stop the collector if it was started. Call on shutdown."""
+    global _blob_collector
+
+    if _blob_collector is not None:
+        await _blob_collector.stop()
+        _blob_collector = None
+
+
+def schedule_blob_gc() -> None:
+    """Collect soon rather than at the next BLOB_GC_INTERVAL sweep."""
+    if _blob_collector is not None:
+        _blob_collector.wake()
@@ -0,0 +1,141 @@
+"""
+Background thumbnails and previews for image and PDF uploads.
+
+How it works:
+- Files that can have derivatives are recorded with preview_status
+  pending, and queued here once they are clean (right away, or when a
+  scan worker clears them); nothing is rendered from unscanned content
+- DERIVATIVE_WORKERS tasks take IDs off the queue, download the file and
+  render every variant in the process pool (see app.utils.derivatives),
+  so decoding never runs on the event loop. The results are stored as
+  derived/<stored_filename>/<variant>.webp and the file marked ready
+- Content-addressed files share their blob's derivatives: if another
+  file already rendered them, the file is marked ready without rendering
+- As with scan jobs (both run on app.workers.job_pool), the ``files``
+  table is the source of truth: a sweep re-queues pending rows every
+  DERIVATIVE_SWEEP_INTERVAL, which recovers jobs lost to restarts, a
+  full queue or a storage outage
+
+Content that cannot be rendered (corrupt, too many pixels, or it crashed
+a pool process) is marked failed and not retried. Storage errors leave
+the file pending for the next sweep.
+"""
+
+from io import BytesIO
+from typing import Dict, List
+
+from app.core.config import settings
+from app.core.metrics import (
+    DERIVATIVE_JOBS,
+    DERIVATIVE_QUEUE_DEPTH,
+    DERIVATIVE_RENDER_SECONDS,
+    REGISTRY,
+    timed,
+)
+from app.core.process_pool import run_in_process_pool
+from app.core.storage import storage
+from app.db.session import AsyncSessionLocal
+from app.models.file import PreviewStatus, ScanStatus
+from app.repositories.file_repository import FileRepository
+from app.utils.derivatives import Derivative, render_derivatives
+from app.utils.file_utils import derivative_key, derivative_kind
+from app.utils.logger import setup_logger
+from app.workers.job_pool import FileJobPool
+
+logger = setup_logger(__name__)
+
+
+def variant_sizes() -> Dict[str, int]:
+    """Box size (longest side, in pixels) of each derivative variant."""
+    return {
+        Derivative.THUMBNAIL.value: settings.THUMBNAIL_SIZE,
+        Derivative.PREVIEW.value: settings.PREVIEW_SIZE,
+    }
+
+
+class DerivativeWorkerPool(FileJobPool):
+    """In-process rendering job queue and the workers consuming it."""
+
+    name = "derivative"
+    jobs = DERIVATIVE_JOBS
+    queue_depth = DERIVATIVE_QUEUE_DEPTH
+
+    @classmethod
+    def from_settings(cls) -> "DerivativeWorkerPool":
+        return cls(
+            workers=settings.DERIVATIVE_WORKERS,
+            queue_size=settings.DERIVATIVE_QUEUE_SIZE,
+            sweep_interval=settings.DERIVATIVE_SWEEP_INTERVAL,
+        )
+
+    async def _pending_ids(self, repo: FileRepository, limit: int) -> List[int]:
+        return await repo.list_ids_pending_preview(limit)
+
+    async def _process(self, file_id: int) -> None:
+        async with AsyncSessionLocal() as db:
+            repo = FileRepository(db)
+            file_record = await repo.get_by_id(file_id)
+            if (
+                file_record is None
+                or file_record.is_deleted
+                or file_record.preview_status != PreviewStatus.PENDING
+                or file_record.scan_status != ScanStatus.CLEAN
+            ):
+                return
+
+            source = file_record.stored_filename
+            # The thumbnail is stored last, so it means the set is complete
+            thumbnail = derivative_key(source, Derivative.THUMBNAIL.value)
+            if file_record.blob_sha256 and await storage.file_exists(thumbnail):
+                await repo.update(file_id, preview_status=PreviewStatus.READY.value)
+                DERIVATIVE_JOBS.labels(outcome="shared").inc()
+                return
+
+            data = await storage.download_file(source)
+            try:
+                with timed(DERIVATIVE_RENDER_SECONDS.labels()):
+                    rendered = await run_in_process_pool(
+                        render_derivatives,
+                        data.getvalue(),
+                        derivative_kind(file_record.original_filename),
+                        variant_sizes(),
+                        settings.DERIVATIVE_MAX_PIXELS,
+                        settings.DERIVATIVE_QUALITY,
+                    )
+            except Exception as e:
+                # Includes a pool process dying on it: the input is the
+                # likely cause, and retrying would only crash another one
+                await repo.update(file_id, preview_status=PreviewStatus.FAILED.value)
+                DERIVATIVE_JOBS.labels(outcome="failed").inc()
+                logger.warning(f"No preview for file {file_id}: {e!r}")
+                return
+
+            for variant in (Derivative.PREVIEW, Derivative.THUMBNAIL):
+                body = rendered[variant.value]
+                await storage.upload_file(
+                    derivative_key(source, variant.value),
+                    BytesIO(body),
+                    len(body),
+                    content_type="image/webp",
+                )
+            await repo.update(file_id, preview_status=PreviewStatus.READY.value)
+            DERIVATIVE_JOBS.labels(outcome="ready").inc()
+            logger.info(f"Rendered previews for file {file_id}")
+
+
+def start_derivative_workers() -> DerivativeWorkerPool:
+    """Create and start the workers on the running loop. Call on startup."""
+    return DerivativeWorkerPool.start_shared()
+
+
+async def stop_derivative_workers() -> None:
+    """Stop the workers if they were started. Call on shutdown."""
+    await DerivativeWorkerPool.stop_shared()
+
+
+def enqueue_derivatives(file_id: int) -> None:
+    """Queue a clean file with pending previews; else the sweep finds it."""
+    DerivativeWorkerPool.submit(file_id)
+
+
+REGISTRY.add_collector(DerivativeWorkerPool.collect_queue_depth)
@@ -0,0 +1,145 @@
+"""
+Shared machinery of the per-file background job pools (scans, previews).
+
+How it works:
+- Jobs are file IDs on a bounded in-process queue, consumed by a fixed
+  number of worker tasks; a file queued or in progress is not queued again
+- The ``files`` table is the source of truth, not the queue: a sweep
+  re-queues the rows still waiting for the job every sweep interval, which
+  recovers jobs lost to restarts, a full queue or an outage
+- Each pool is a lazy singleton started on startup; ``submit`` is a no-op
+  while it is not running, the sweep picks those files up later
+
+Subclasses say which rows are waiting (``_pending_ids``), what to do with
+one (``_process``) and how they are configured (``from_settings``).
+"""
+
+import asyncio
+from abc import ABC, abstractmethod
+from typing import List, Optional, Set
+
+from app.core.metrics import Counter, Gauge
+from app.db.session import AsyncSessionLocal
+from app.repositories.file_repository import FileRepository
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class FileJobPool(ABC):
+    """In-process job queue of file IDs and the workers consuming it."""
+
+    name: str  # in log messages, e.g. "scan"
+    jobs: Counter  # labelled by outcome; errors are counted here
+    queue_depth: Gauge
+
+    _instance: Optional["FileJobPool"] = None
+
+    def __init__(self, workers: int, queue_size: int, sweep_interval: float):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.sweep_interval = sweep_interval
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        # Queued or in progress; keeps the sweep from queueing a file twice
+        self._queued: Set[int] = set()
+        self._tasks: List[asyncio.Task] = []
+
+    @classmethod
+    @abstractmethod
+    def from_settings(cls) -> "FileJobPool":
+        """A pool configured from settings."""
+
+    @abstractmethod
+    async def _pending_ids(self, repo: FileRepository, limit: int) -> List[int]:
+        """IDs of up to ``limit`` files still waiting for this job."""
+
+    @abstractmethod
+    async def _process(self, file_id: int) -> None:
+        """Run the job for one file; raising counts it as an error."""
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        for n in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._run(n)))
+        self._tasks.append(asyncio.create_task(self._sweep()))
+        logger.info(f"Started {self.workers} {self.name} workers")
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def enqueue(self, file_id: int) -> bool:
+        """Queue a file. False if the queue is full."""
+        if file_id in self._queued:
+            return True
+        try:
+            self._queue.put_nowait(file_id)
+        except asyncio.QueueFull:
+            logger.warning(
+                f"{self.name.capitalize()} queue full; file {file_id} left for sweep"
+            )
+            return False
+        self._queued.add(file_id)
+        return True
+
+    async def _sweep(self) -> None:
+        while True:
+            try:
+                async with AsyncSessionLocal() as db:
+                    file_ids = await self._pending_ids(
+                        FileRepository(db), self.queue_size
+                    )
+                for file_id in file_ids:
+                    if not self.enqueue(file_id):
+                        break
+            except Exception as e:
+                logger.error(f"{self.name.capitalize()} sweep failed: {e}")
+            await asyncio.sleep(self.sweep_interval)
+
+    async def _run(self, worker: int) -> None:
+        while True:
+            file_id = await self._queue.get()
+            try:
+                await self._process(file_id)
+            except Exception as e:
+                self.jobs.labels(outcome="error").inc()
+                logger.error(
+                    f"{self.name.capitalize()} worker {worker} "
+                    f"failed on file {file_id}: {e}"
+                )
+            finally:
+                self._queued.discard(file_id)
+                self._queue.task_done()
+
+    # Lazy singleton, one per subclass
+
+    @classmethod
+    def start_shared(cls) -> "FileJobPool":
+        """Create and start the pool on the running loop. Call on startup."""
+        if cls._instance is None:
+            cls._instance = cls.from_settings()
+            cls._instance.start()
+        return cls._instance
+
+    @classmethod
+    async def stop_shared(cls) -> None:
+        """Stop the pool if it was started. Call on shutdown."""
+        if cls._instance is not None:
+            await cls._instance.stop()
+            cls._instance = None
+
+    @classmethod
+    def submit(cls, file_id: int) -> None:
+        """Queue a file if the pool runs; otherwise the sweep finds it."""
+        if cls._instance is not None:
+            cls._instance.enqueue(file_id)
+
+    @classmethod
+    def collect_queue_depth(cls) -> None:
+        """Registry collector for the queue depth gauge."""
+        cls.queue_depth.set(cls._instance.depth if cls._instance else 0)
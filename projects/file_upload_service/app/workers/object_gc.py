@@ -0,0 +1,204 @@
+"""
+Garbage collection of storage objects whose files were deleted.
+
+How it works:
+- Deleting files only marks their rows; the objects stay until the
+  collector runs, so deletes (even of thousands of files) never wait on
+  storage
+- The collector wakes after deletes, and every OBJECT_GC_INTERVAL to pick
+  up anything missed. It locks a batch of deleted, unpurged rows, removes
+  their objects (and thumbnails) with multi-object deletes of up to 1000
+  keys per request, and marks the rows purged
+- Keys that fail are retried with backoff, OBJECT_GC_RETRIES times in
+  all; what still fails keeps its row unpurged for the next run
+- Every ORPHAN_SCAN_INTERVAL the bucket is listed, and objects older than
+  ORPHAN_MIN_AGE that neither a file row nor a blob accounts for are
+  deleted too (thumbnails go with their source). These come from crashes
+  between storing an object and recording it, or from abandoned uploads.
+  The age keeps in-progress uploads (whose rows do not exist yet) safe
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from app.core.config import settings
+from app.core.metrics import OBJECT_GC_FAILURES, OBJECTS_COLLECTED
+from app.core.storage import MULTI_DELETE_LIMIT, storage
+from app.db.session import AsyncSessionLocal
+from app.repositories.blob_repository import BlobRepository
+from app.repositories.file_repository import FileRepository
+from app.utils.derivatives import Derivative
+from app.utils.file_utils import derivative_key, derivative_source
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+async def delete_objects(names: List[str], attempts: int) -> List[str]:
+    """Multi-object delete with retries; returns the names that still failed."""
+    failed = names
+    for attempt in range(1, attempts + 1):
+        try:
+            failed = await storage.delete_files(failed)
+        except Exception as e:
+            logger.warning(f"Object delete attempt {attempt} failed: {e}")
+        if not failed:
+            break
+        if attempt < attempts:
+            await asyncio.sleep(0.5 * 2 ** (attempt - 1))
+    if failed:
+        OBJECT_GC_FAILURES.inc(len(failed))
+    return failed
+
+
+class ObjectCollector:
+    """Background task deleting the objects of deleted files, and orphans."""
+
+    def __init__(
+        self,
+        interval: float,
+        orphan_scan_interval: float,
+        orphan_min_age: float,
+        attempts: int,
+    ):
+        self.interval = interval
+        self.orphan_scan_interval = orphan_scan_interval
+        self.orphan_min_age = orphan_min_age
+        self.attempts = attempts
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        # Not at startup: listing the bucket can take a while
+        self._next_orphan_scan = time.monotonic() + orphan_scan_interval
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+        logger.info("Started object garbage collector")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                collected = await self.collect()
+                if collected:
+                    logger.info(f"Collected {collected} deleted objects")
+            except Exception as e:
+                logger.error(f"Object collection failed: {e}")
+
+            if self.orphan_scan_interval and time.monotonic() >= (
+                self._next_orphan_scan
+            ):
+                self._next_orphan_scan = time.monotonic() + self.orphan_scan_interval
+                try:
+                    orphans = await self.collect_orphans()
+                    logger.info(f"Orphan scan deleted {orphans} objects")
+                except Exception as e:
+                    logger.error(f"Orphan scan failed: {e}")
+
+    async def collect(self) -> int:
+        """Delete the objects of every deleted file; returns how many."""
+        collected = 0
+        async with AsyncSessionLocal() as db:
+            repo = FileRepository(db)
+            while rows := await repo.lock_unpurged(MULTI_DELETE_LIMIT):
+                keys = list({key for _, key, _ in rows})
+                # Never delete an object a live row still points at
+                shared = await repo.live_keys(keys)
+                doomed = [key for key in keys if key not in shared]
+                with_previews = {key for _, key, preview in rows if preview} - shared
+                derived = [
+                    derivative_key(key, variant.value)
+                    for key in with_previews
+                    for variant in Derivative
+                ]
+                failed = await delete_objects(doomed + derived, self.attempts)
+                # A row stays unpurged if its object or a derivative remains
+                failed = {derivative_source(key) or key for key in failed}
+                purged = [file_id for file_id, key, _ in rows if key not in failed]
+                # Commits, which also releases the locks on failed rows
+                await repo.mark_purged(purged)
+                OBJECTS_COLLECTED.labels(reason="deleted").inc(
+                    len(doomed) - len(failed)
+                )
+                collected += len(doomed) - len(failed)
+                if failed:
+                    logger.warning(f"{len(failed)} objects left for the next run")
+                    break
+        return collected
+
+    async def collect_orphans(self) -> int:
+        """Delete old objects that no row accounts for; returns how many."""
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.orphan_min_age)
+        deleted = 0
+        batch: List[str] = []
+        async for obj in storage.list_objects():
+            if obj.last_modified < cutoff:
+                batch.append(obj.name)
+            if len(batch) == MULTI_DELETE_LIMIT:
+                deleted += await self._delete_orphans(batch)
+                batch = []
+        if batch:
+            deleted += await self._delete_orphans(batch)
+        return deleted
+
+    async def _delete_orphans(self, keys: List[str]) -> int:
+        # A thumbnail belongs to whatever its source object belongs to
+        sources = {key: derivative_source(key) or key for key in keys}
+        lookup = list(set(sources.values()))
+        async with AsyncSessionLocal() as db:
+            known = await FileRepository(db).unpurged_keys(lookup)
+            known |= await BlobRepository(db).existing_keys(lookup)
+        orphans = [key for key in keys if sources[key] not in known]
+        if not orphans:
+            return 0
+        failed = await delete_objects(orphans, self.attempts)
+        OBJECTS_COLLECTED.labels(reason="orphan").inc(len(orphans) - len(failed))
+        return len(orphans) - len(failed)
+
+
+# Lazy singleton - started on startup
+_object_collector: Optional[ObjectCollector] = None
+
+
+def start_object_collector() -> ObjectCollector:
+    """Create and start the collector on the running loop. Call on startup."""
+    global _object_collector
+
+    if _object_collector is None:
+        _object_collector = ObjectCollector(
+            interval=settings.OBJECT_GC_INTERVAL,
+            orphan_scan_interval=settings.ORPHAN_SCAN_INTERVAL,
+            orphan_min_age=settings.ORPHAN_MIN_AGE,
+            attempts=settings.OBJECT_GC_RETRIES,
+        )
+        _object_collector.start()
+    return _object_collector
+
+
+async def stop_object_collector() -> None:
+    """Stop the collector if it was started. Call on shutdown."""
+    global _object_collector
+
+    if _object_collector is not None:
+        await _object_collector.stop()
+        _object_collector = None
+
+
+def schedule_object_gc() -> None:
+    """Collect soon rather than at the next OBJECT_GC_INTERVAL sweep."""
+    if _object_collector is not None:
+        _object_collector.wake()
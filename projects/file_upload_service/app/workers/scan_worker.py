@@ -0,0 +1,119 @@
+"""
+Background virus scanning for files stored as ``pending_scan``.
+
+How it works:
+- Uploads that have no verdict yet (SCAN_MODE=async, or clamd failed in
+  sync mode) are stored as pending_scan and their ID is queued here
+- SCAN_WORKERS tasks take IDs off the queue, stream the object from
+  storage into a clamd session and mark the file clean or quarantined
+- Files that get thumbnails are handed to the derivative workers once
+  clean; nothing is rendered from unscanned content
+- The ``files`` table is the source of truth, not the queue: a sweep
+  re-queues pending_scan rows every SCAN_SWEEP_INTERVAL, which recovers
+  jobs lost to restarts, a full queue or a clamd outage (the queue, the
+  sweep and the workers are app.workers.job_pool)
+
+A scan error leaves the file pending (and undownloadable) until a later
+attempt succeeds; it is never treated as clean.
+"""
+
+from typing import List
+
+from app.core.config import settings
+from app.core.exceptions import VirusDetectedError
+from app.core.metrics import REGISTRY, SCAN_JOBS, SCAN_QUEUE_DEPTH
+from app.core.storage import storage
+from app.core.virus_scanner import virus_scanner
+from app.db.session import AsyncSessionLocal
+from app.models.file import File, PreviewStatus, ScanStatus
+from app.repositories.file_repository import FileRepository
+from app.utils.logger import setup_logger
+from app.workers.derivative_worker import enqueue_derivatives
+from app.workers.job_pool import FileJobPool
+
+logger = setup_logger(__name__)
+
+
+class ScanWorkerPool(FileJobPool):
+    """In-process scan job queue and the workers consuming it."""
+
+    name = "scan"
+    jobs = SCAN_JOBS
+    queue_depth = SCAN_QUEUE_DEPTH
+
+    @classmethod
+    def from_settings(cls) -> "ScanWorkerPool":
+        return cls(
+            workers=settings.SCAN_WORKERS,
+            queue_size=settings.SCAN_QUEUE_SIZE,
+            sweep_interval=settings.SCAN_SWEEP_INTERVAL,
+        )
+
+    async def _pending_ids(self, repo: FileRepository, limit: int) -> List[int]:
+        return await repo.list_ids_by_scan_status(ScanStatus.PENDING.value, limit)
+
+    async def _process(self, file_id: int) -> None:
+        async with AsyncSessionLocal() as db:
+            repo = FileRepository(db)
+            file_record = await repo.get_by_id(file_id)
+            if file_record is None or file_record.scan_status != ScanStatus.PENDING:
+                return
+
+            try:
+                result = await virus_scanner.cached_verdict(file_record.file_hash)
+                if result is None:
+                    result = await self._scan_object(file_record)
+            except VirusDetectedError as e:
+                await repo.update(
+                    file_id,
+                    scan_status=ScanStatus.QUARANTINED.value,
+                    scan_detail=e.detail.removeprefix("Virus detected: ")[:255],
+                )
+                SCAN_JOBS.labels(outcome="quarantined").inc()
+                logger.warning(f"File {file_id} quarantined: {e.detail}")
+                return
+
+            if not result["safe"]:
+                # Stays pending; the next sweep retries it
+                SCAN_JOBS.labels(outcome="error").inc()
+                logger.warning(f"Scan of file {file_id} failed: {result.get('error')}")
+                return
+
+            await repo.update(
+                file_id, scan_status=ScanStatus.CLEAN.value, scan_detail=None
+            )
+            SCAN_JOBS.labels(outcome="clean").inc()
+            logger.info(f"File {file_id} scanned clean")
+            if file_record.preview_status == PreviewStatus.PENDING:
+                enqueue_derivatives(file_id)
+
+    async def _scan_object(self, file_record: File) -> dict:
+        session = await virus_scanner.open_session()
+        if session is None:
+            return {"safe": True}
+        try:
+            stream = await storage.open_stream(file_record.stored_filename)
+            async for chunk in stream.iter_chunks():
+                await session.feed(chunk)
+        except BaseException:
+            session.close()
+            raise
+        return await virus_scanner.complete_scan(session, file_record.file_hash)
+
+
+def start_scan_workers() -> ScanWorkerPool:
+    """Create and start the scan workers on the running loop. Call on startup."""
+    return ScanWorkerPool.start_shared()
+
+
+async def stop_scan_workers() -> None:
+    """Stop the workers if they were started. Call on shutdown."""
+    await ScanWorkerPool.stop_shared()
+
+
+def enqueue_scan(file_id: int) -> None:
+    """Queue a pending_scan file; without workers the sweep picks it up later."""
+    ScanWorkerPool.submit(file_id)
+
+
+REGISTRY.add_collector(ScanWorkerPool.collect_queue_depth)
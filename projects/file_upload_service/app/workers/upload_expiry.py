@@ -0,0 +1,87 @@
+"""
+Cleanup of uploads that were started and then abandoned.
+
+How it works:
+- Every UPLOAD_EXPIRY_INTERVAL, resumable upload sessions past their
+  expires_at are discarded: the open multipart upload is aborted, the
+  tail object (or the assembled but unregistered object) deleted, and
+  the row removed
+- Direct upload intents past their expires_at are never going to be
+  completed; the object their presigned PUT may have stored is deleted
+  with the row
+- Otherwise an expired upload is only cleaned up if its owner touches it
+  again, so abandoned uploads would hold storage forever
+- Each row is locked while it is discarded, so several workers can sweep
+  at once; one that fails stays for the next sweep
+"""
+
+import asyncio
+from typing import Optional
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.services.file_service import FileService
+from app.services.resumable_upload_service import ResumableUploadService
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class UploadExpiryCollector:
+    """Background task discarding expired uploads and what they stored."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+        logger.info("Started upload expiry collector")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                collected = await self.collect()
+                if collected:
+                    logger.info(f"Discarded {collected} expired uploads")
+            except Exception as e:
+                logger.error(f"Upload expiry sweep failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def collect(self) -> int:
+        """Discard every expired upload; returns how many were discarded."""
+        async with AsyncSessionLocal() as db:
+            sessions = await ResumableUploadService(db).discard_expired()
+            intents = await FileService(db).discard_expired_intents()
+        return sessions + intents
+
+
+# Lazy singleton - started on startup
+_upload_expiry: Optional[UploadExpiryCollector] = None
+
+
+def start_upload_expiry() -> UploadExpiryCollector:
+    """Create and start the collector on the running loop. Call on startup."""
+    global _upload_expiry
+
+    if _upload_expiry is None:
+        _upload_expiry = UploadExpiryCollector(
+            interval=settings.UPLOAD_EXPIRY_INTERVAL
+        )
+        _upload_expiry.start()
+    return _upload_expiry
+
+
+async def stop_upload_expiry() -> None:
+    """Stop the collector if it was started. Call on shutdown."""
+    global _upload_expiry
+
+    if _upload_expiry is not None:
+        await _upload_expiry.stop()
+        _upload_expiry = None
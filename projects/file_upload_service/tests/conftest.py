@@ -0,0 +1,12 @@
+"""Test configuration: the settings the app needs to import."""
+
+import os
+
+for name, value in {
+    "DATABASE_URL": "sqlite+aiosqlite:///:memory:",
+    "MINIO_ENDPOINT": "localhost:9000",
+    "MINIO_ACCESS_KEY": "test",
+    "MINIO_SECRET_KEY": "test",
+    "SECRET_KEY": "test-secret",
+}.items():
+    os.environ.setdefault(name, value)
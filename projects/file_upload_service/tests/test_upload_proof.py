@@ -0,0 +1,122 @@
+"""Hash-first upload proofs: a known SHA-256 must never be enough."""
+
+import hashlib
+
+import pytest
+
+from app.models.file import File, ScanStatus
+from app.services import file_service as file_service_module
+from app.services.file_service import FileService
+from app.utils.upload_proof import PROOF_RANGE_SIZE, issue_challenge, read_challenge
+
+# Smaller than PROOF_RANGE_SIZE, so the challenge covers all of it
+CONTENT = b"stored by another user " * 100
+FILE_HASH = hashlib.sha256(CONTENT).hexdigest()
+
+
+class _Stream:
+    def __init__(self, data: bytes):
+        self.data = data
+
+    async def iter_chunks(self):
+        yield self.data
+
+
+class _Storage:
+    async def open_stream(self, name, start=None, end=None):
+        return _Stream(CONTENT[start : end + 1])
+
+
+class _Linked(Exception):
+    """Raised where the service would link the stored content."""
+
+
+@pytest.fixture
+def service(monkeypatch):
+    service = FileService(db=None)
+    source = File(
+        id=1,
+        user_id="owner",
+        stored_filename="owner-file.txt",
+        file_hash=FILE_HASH,
+        file_size=len(CONTENT),
+        scan_status=ScanStatus.CLEAN.value,
+    )
+
+    async def own_copy(file_hash, user_id):
+        return None
+
+    async def stored_copy(file_hash, size):
+        return source
+
+    async def upload(*args):
+        return {"upload_id": "new"}
+
+    async def link(*args):
+        raise _Linked()
+
+    monkeypatch.setattr(service.repo, "get_by_hash", own_copy)
+    monkeypatch.setattr(service.repo, "get_any_by_hash", stored_copy)
+    monkeypatch.setattr(service, "create_direct_upload", upload)
+    monkeypatch.setattr(service, "_link_content", link)
+    monkeypatch.setattr(file_service_module, "storage", _Storage())
+    return service
+
+
+async def negotiate(service, **kwargs) -> dict:
+    return await service.negotiate_upload(
+        "copy.txt", FILE_HASH, len(CONTENT), "intruder", "text/plain", **kwargs
+    )
+
+
+async def test_small_file_is_challenged_whole(service):
+    result = await negotiate(service)
+
+    assert result["status"] == "prove"
+    assert len(CONTENT) < PROOF_RANGE_SIZE
+    assert result["challenge_offset"] == 0
+    assert result["challenge_length"] == len(CONTENT)
+    assert result["challenge_nonce"]
+
+
+async def test_file_hash_alone_is_rejected(service):
+    challenge = (await negotiate(service))["challenge"]
+
+    result = await negotiate(service, challenge=challenge, proof=FILE_HASH)
+
+    assert result["status"] == "upload"
+
+
+async def test_proof_over_nonce_and_range_is_accepted(service):
+    reply = await negotiate(service)
+    start = reply["challenge_offset"]
+    data = CONTENT[start : start + reply["challenge_length"]]
+    proof = hashlib.sha256(reply["challenge_nonce"].encode() + data).hexdigest()
+
+    with pytest.raises(_Linked):
+        await negotiate(service, challenge=reply["challenge"], proof=proof)
+
+
+async def test_challenges_get_fresh_nonces(service):
+    first = await negotiate(service)
+    second = await negotiate(service)
+
+    assert first["challenge_nonce"] != second["challenge_nonce"]
+
+
+async def test_forged_challenge_gets_a_new_one(service):
+    reply = await negotiate(service)
+    nonce, rest = reply["challenge"].split(".", 1)
+    forged = f"{'0' * len(nonce)}.{rest}"
+    proof = hashlib.sha256(b"0" * len(nonce) + CONTENT).hexdigest()
+
+    result = await negotiate(service, challenge=forged, proof=proof)
+
+    assert result["status"] == "prove"
+
+
+def test_challenge_is_bound_to_its_user():
+    token, *_ = issue_challenge("intruder", FILE_HASH, len(CONTENT))
+
+    assert read_challenge(token, "intruder", FILE_HASH, len(CONTENT))
+    assert read_challenge(token, "owner", FILE_HASH, len(CONTENT)) is None
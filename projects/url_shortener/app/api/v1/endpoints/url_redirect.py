@@ -1,13 +1,12 @@
 """URL redirection endpoint."""
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db
-from app.core.config import settings
 from app.core.exceptions import URLNotFoundError
-from app.core.rate_limiter import get_rate_limit_string, limiter
+from app.core.rate_limiter import rate_limit
 from app.services.url_redirection_service import get_url_redirection_service
 
 router = APIRouter()
@@ -20,13 +19,12 @@ router = APIRouter()
     responses={
         302: {"description": "Redirect to original URL"},
         404: {"description": "Short code not found"},
+        429: {"description": "Rate limit exceeded"},
     },
-)
-@limiter.limit(
-    get_rate_limit_string(), exempt_when=lambda: not settings.RATE_LIMIT_ENABLED
+    dependencies=[Depends(rate_limit("redirect"))],
 )
 async def redirect_url(
-    request: Request, short_code: str, db: AsyncSession = Depends(get_db)
+    short_code: str, db: AsyncSession = Depends(get_db)
 ) -> RedirectResponse:
     """Redirect short code to original URL."""
     service = get_url_redirection_service(db)
@@ -1,13 +1,12 @@
 """URL shortening endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user_optional, get_db
-from app.core.config import settings
 from app.core.exceptions import ShortCodeGenerationError
+from app.core.rate_limiter import rate_limit
 from app.models.user import User
-from app.core.rate_limiter import get_rate_limit_string, limiter
 from app.schemas.url import URLCreate, URLResponse
 from app.services.url_shortening_service import get_url_shortening_service
 
@@ -20,12 +19,9 @@ router = APIRouter()
     status_code=status.HTTP_201_CREATED,
     summary="Create shortened URL",
     response_description="The created shortened URL",
-)
-@limiter.limit(
-    get_rate_limit_string(), exempt_when=lambda: not settings.RATE_LIMIT_ENABLED
+    dependencies=[Depends(rate_limit("create"))],
 )
 async def create_url(
-    request: Request,
     data: URLCreate,
     db: AsyncSession = Depends(get_db),
     current_user: User | None = Depends(get_current_user_optional),
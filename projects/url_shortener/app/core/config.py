@@ -54,12 +54,21 @@ class Settings(BaseSettings):
     RATE_LIMIT_ENABLED: bool = False  # Disabled by default for local testing
     RATE_LIMIT_REQUESTS: int = 100  # Number of requests
     RATE_LIMIT_WINDOW: str = "minute"  # Time window: second, minute, hour, day
+    # Per-route overrides keyed by limiter scope, e.g. {"redirect": "1000/minute"}
+    RATE_LIMIT_ROUTE_LIMITS: dict[str, str] = {}
+    # Per-API-key overrides keyed by the raw key, e.g. {"partner-key": "50/second"}
+    # Only keys listed here get their own bucket; unknown keys count per IP
+    RATE_LIMIT_API_KEY_LIMITS: dict[str, str] = {}
+    RATE_LIMIT_API_KEY_HEADER: str = "X-API-Key"
+    # Share of a limit a worker leases from Redis per round trip (local pre-check)
+    RATE_LIMIT_LOCAL_LEASE_FRACTION: float = 0.05
 
     # Redis Settings
     REDIS_URL: str = "redis://localhost:6379"
     REDIS_DB_CACHE: int = 0  # For caching URL mappings
     REDIS_DB_ANALYTICS: int = 1  # For analytics data
     REDIS_DB_QUEUE: int = 2  # For message queue
+    REDIS_DB_RATE_LIMIT: int = 3  # For rate limiter state
     REDIS_MAX_CONNECTIONS: int = 100  # Connection pool size
 
     # Database Pool Settings
@@ -70,6 +79,15 @@ class Settings(BaseSettings):
     # Worker Settings
     WORKER_BATCH_SIZE: int = 1000  # Events per batch flush
     WORKER_FLUSH_INTERVAL: int = 5  # Seconds between flushes
+    WORKER_METRICS_PORT: int = 0  # Serve worker /metrics on this port (0 = off)
+
+    # Metrics
+    METRICS_ENABLED: bool = True  # Expose GET /metrics (Prometheus text format)
+
+    # Event loop monitor (opt-in)
+    LOOP_MONITOR_ENABLED: bool = False
+    LOOP_MONITOR_INTERVAL_MS: int = 50  # Lag sampling interval
+    LOOP_BLOCK_THRESHOLD_MS: int = 100  # Report callbacks holding the loop longer
 
     @property
     def async_database_url(self) -> str:
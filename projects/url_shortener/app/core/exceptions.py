@@ -23,3 +23,12 @@ class ShortCodeGenerationError(URLShortenerException):
     """Raised when unable to generate a unique short code."""
 
     pass
+
+
+class RateLimitExceededError(URLShortenerException):
+    """Raised when a client exceeds its request quota."""
+
+    def __init__(self, limit: str, retry_after: float):
+        super().__init__(f"Rate limit exceeded: {limit}")
+        self.limit = limit
+        self.retry_after = retry_after
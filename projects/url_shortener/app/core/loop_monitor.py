@@ -0,0 +1,170 @@
+"""
+Event-loop lag monitor and blocking-call detector.
+
+How it works:
+- Sampler task: sleeps a fixed interval and records how late it woke up.
+  That delay is the scheduling lag every other coroutine saw at that moment.
+- Watchdog thread: if the sampler has not checked in for longer than the
+  block threshold, the loop thread is stuck inside one callback. The
+  watchdog grabs that thread's current stack so the log shows exactly which
+  synchronous call (PBKDF2, a sync SDK, ...) was holding the loop.
+
+Opt-in via LOOP_MONITOR_ENABLED; cost is one wakeup per interval plus a
+mostly-idle thread.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from app.core.config import settings
+from app.core.metrics import (
+    EVENT_LOOP_BLOCKS,
+    EVENT_LOOP_LAG_QUANTILE,
+    EVENT_LOOP_LAG_SECONDS,
+    REGISTRY,
+)
+from app.utils.logger import logger
+
+LAG_QUANTILES = (0.5, 0.9, 0.99)
+
+
+class EventLoopMonitor:
+    """Measures loop lag continuously and reports callbacks that block it."""
+
+    def __init__(
+        self,
+        interval: float = 0.05,
+        block_threshold: float = 0.1,
+        window: int = 1200,
+        stack_limit: int = 30,
+    ):
+        """
+        Args:
+            interval: Seconds between lag samples
+            block_threshold: Seconds without a sample before a stall is reported
+            window: Number of recent samples used for percentile gauges
+            stack_limit: Max frames kept in a stall report
+        """
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self.stack_limit = stack_limit
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._last_beat = time.perf_counter()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self) -> None:
+        """Start sampling on the running loop. Call from inside the loop."""
+        if self._task is not None:
+            return
+
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._stop.clear()
+        self._task = asyncio.get_running_loop().create_task(self._sample())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="event-loop-watchdog", daemon=True
+        )
+        self._watchdog.start()
+        logger.info(
+            f"Event loop monitor started (interval={self.interval * 1000:.0f}ms, "
+            f"block_threshold={self.block_threshold * 1000:.0f}ms)"
+        )
+
+    async def stop(self) -> None:
+        """Stop the sampler task and watchdog thread."""
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._watchdog = None
+
+    async def _sample(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            lag = max(0.0, now - started - self.interval)
+            self._last_beat = now
+            self._samples.append(lag)
+            EVENT_LOOP_LAG_SECONDS.observe(lag)
+
+    def _watch(self) -> None:
+        """Runs in a daemon thread; never touches the loop itself."""
+        reported_beat = None
+        # A healthy loop checks in every `interval`; anything beyond that
+        # plus the threshold means one callback has held the thread.
+        stall_after = self.interval + self.block_threshold
+        while not self._stop.wait(self.block_threshold / 2):
+            beat = self._last_beat
+            stalled_for = time.perf_counter() - beat
+            if stalled_for < stall_after or beat == reported_beat:
+                continue
+
+            reported_beat = beat
+            EVENT_LOOP_BLOCKS.inc()
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = (
+                "".join(traceback.format_stack(frame, limit=self.stack_limit))
+                if frame
+                else "<unavailable>"
+            )
+            logger.warning(
+                "Event loop blocked",
+                blocked_ms=round(stalled_for * 1000, 1),
+                stack=stack,
+            )
+
+    def quantiles(self) -> Dict[str, float]:
+        """Lag percentiles (seconds) over the recent sample window."""
+        samples = sorted(self._samples)
+        if not samples:
+            return {}
+        result = {
+            str(q): samples[min(int(len(samples) * q), len(samples) - 1)]
+            for q in LAG_QUANTILES
+        }
+        result["max"] = samples[-1]
+        return result
+
+
+# Lazy singleton - created on startup when enabled
+_loop_monitor: Optional[EventLoopMonitor] = None
+
+
+def start_loop_monitor() -> EventLoopMonitor:
+    """Create and start the monitor on the running loop. Call on startup."""
+    global _loop_monitor
+
+    if _loop_monitor is None:
+        _loop_monitor = EventLoopMonitor(
+            interval=settings.LOOP_MONITOR_INTERVAL_MS / 1000,
+            block_threshold=settings.LOOP_BLOCK_THRESHOLD_MS / 1000,
+        )
+        REGISTRY.add_collector(_collect_lag_quantiles)
+    _loop_monitor.start()
+    return _loop_monitor
+
+
+async def stop_loop_monitor() -> None:
+    """Stop the monitor if it was started. Call on shutdown."""
+    if _loop_monitor is not None:
+        await _loop_monitor.stop()
+
+
+def _collect_lag_quantiles() -> None:
+    if _loop_monitor is None:
+        return
+    for quantile, value in _loop_monitor.quantiles().items():
+        EVENT_LOOP_LAG_QUANTILE.labels(quantile=quantile).set(value)
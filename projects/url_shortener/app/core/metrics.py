@@ -0,0 +1,357 @@
+"""
+Lightweight Prometheus metrics with no external dependency.
+
+Why in-house (not prometheus_client)?
+- Hot path cost: an observation is one bisect plus three in-place updates,
+  with no locks; each uvicorn worker runs a single event-loop thread
+- Pool gauges are read by collectors at scrape time, so nothing is sampled
+  on the request path
+- Output is the standard text exposition format (0.0.4)
+
+Each process keeps its own registry. With ``--workers > 1`` every worker
+serves its own numbers; aggregate them in PromQL with ``sum()``.
+
+Usage:
+    from app.core.metrics import REDIRECT_STAGE_SECONDS, timed
+
+    with timed(REDIRECT_STAGE_SECONDS.labels(stage="cache_get")):
+        await cache.get_cached_url(code)
+"""
+
+import asyncio
+import math
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+# Redirects are sub-millisecond on a cache hit, so the buckets start at 100us
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+)  # fmt: skip
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(
+    names: Tuple[str, ...], values: Tuple[str, ...], extra: str = ""
+) -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class _GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+
+class _HistogramChild:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class _Metric:
+    """Base for labelled metric families."""
+
+    type_name = ""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...] = (),
+        registry: Optional["MetricsRegistry"] = None,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        (registry or REGISTRY).register(self)
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, **labels: str):
+        """Get (or create) the child for a label set. Bind once, reuse on hot paths."""
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            child = self._children[key] = self._new_child()
+        return child
+
+    def _samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class _ValueMetric(_Metric):
+    """Family whose children each hold a single value."""
+
+    def _samples(self) -> Iterator[str]:
+        for values, child in self._children.items():
+            labels = _format_labels(self.labelnames, values)
+            yield f"{self.name}{labels} {_format_value(child.value)}"
+
+
+class Counter(_ValueMetric):
+    """Monotonically increasing counter."""
+
+    type_name = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+
+class Gauge(_ValueMetric):
+    """Value that can go up and down."""
+
+    type_name = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+
+class Histogram(_Metric):
+    """Fixed-bucket histogram."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+        registry: Optional["MetricsRegistry"] = None,
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def _samples(self) -> Iterator[str]:
+        for values, child in self._children.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), child.counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                labels = _format_labels(self.labelnames, values, le)
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, values)
+            yield f"{self.name}_sum{labels} {_format_value(child.sum)}"
+            yield f"{self.name}_count{labels} {child.count}"
+
+
+class MetricsRegistry:
+    """Holds metric families and scrape-time collectors."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+
+    def register(self, metric: _Metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric '{metric.name}' already registered")
+        self._metrics[metric.name] = metric
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Register a callback that refreshes gauges right before each scrape."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception:
+                # A broken collector must never fail the whole scrape
+                continue
+        return "\n".join(m.render() for m in self._metrics.values()) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+@contextmanager
+def timed(child: _HistogramChild) -> Iterator[None]:
+    """Observe the wall time of the enclosed block (awaits included)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        child.observe(time.perf_counter() - start)
+
+
+# === Application metrics ===
+
+REDIRECT_STAGE_SECONDS = Histogram(
+    "url_redirect_stage_seconds",
+    "Time spent in each stage of a redirect lookup.",
+    labelnames=("stage",),
+)
+REDIRECT_CACHE_LOOKUPS = Counter(
+    "url_redirect_cache_lookups_total",
+    "Redirect L2 cache lookups by result.",
+    labelnames=("result",),
+)
+CACHE_HIT_RATIO = Gauge(
+    "url_redirect_cache_hit_ratio",
+    "Fraction of redirect cache lookups that were hits since process start.",
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "SQLAlchemy pool connections by state.",
+    labelnames=("state",),
+)
+REDIS_POOL_CONNECTIONS = Gauge(
+    "redis_pool_connections",
+    "Redis pool connections by pool and state.",
+    labelnames=("pool", "state"),
+)
+WORKER_FLUSH_SECONDS = Histogram(
+    "analytics_worker_flush_seconds",
+    "Time taken to flush buffered clicks to the database.",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+WORKER_FLUSHED_CLICKS = Counter(
+    "analytics_worker_flushed_clicks_total",
+    "Clicks written to the database by the analytics worker.",
+)
+EVENT_LOOP_LAG_SECONDS = Histogram(
+    "event_loop_lag_seconds",
+    "How late the event loop ran a timer scheduled by the loop monitor.",
+)
+EVENT_LOOP_LAG_QUANTILE = Gauge(
+    "event_loop_lag_quantile_seconds",
+    "Event loop lag percentiles over the monitor's recent sample window.",
+    labelnames=("quantile",),
+)
+EVENT_LOOP_BLOCKS = Counter(
+    "event_loop_blocks_total",
+    "Times a single callback held the event loop past the block threshold.",
+)
+
+
+def _collect_cache_hit_ratio() -> None:
+    hits = REDIRECT_CACHE_LOOKUPS.labels(result="hit").value
+    misses = REDIRECT_CACHE_LOOKUPS.labels(result="miss").value
+    total = hits + misses
+    CACHE_HIT_RATIO.set(hits / total if total else 0.0)
+
+
+REGISTRY.add_collector(_collect_cache_hit_ratio)
+
+
+def register_pool_collectors() -> None:
+    """Expose DB and Redis pool usage. Call once on startup after pools init."""
+    from app.core.redis_pool import redis_pool_manager
+    from app.db.session import engine
+
+    def _collect_db_pool() -> None:
+        pool = engine.sync_engine.pool
+        DB_POOL_CONNECTIONS.labels(state="checked_out").set(pool.checkedout())
+        DB_POOL_CONNECTIONS.labels(state="overflow").set(max(pool.overflow(), 0))
+        DB_POOL_CONNECTIONS.labels(state="size").set(pool.size())
+
+    def _collect_redis_pools() -> None:
+        for name, (in_use, available) in redis_pool_manager.pool_stats().items():
+            REDIS_POOL_CONNECTIONS.labels(pool=name, state="in_use").set(in_use)
+            REDIS_POOL_CONNECTIONS.labels(pool=name, state="available").set(available)
+
+    REGISTRY.add_collector(_collect_db_pool)
+    REGISTRY.add_collector(_collect_redis_pools)
+
+
+async def start_metrics_server(
+    port: int, host: str = "0.0.0.0"
+) -> asyncio.AbstractServer:
+    """
+    Serve the registry over plain HTTP for processes without a web app
+    (the analytics worker). Every request gets the full metrics page.
+    """
+
+    async def _handle(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            await reader.readuntil(b"\r\n\r\n")
+            body = REGISTRY.render().encode()
+            writer.write(
+                b"HTTP/1.1 200 OK\r\n"
+                + f"Content-Type: {CONTENT_TYPE_LATEST}\r\n".encode()
+                + f"Content-Length: {len(body)}\r\n".encode()
+                + b"Connection: close\r\n\r\n"
+                + body
+            )
+            await writer.drain()
+        except (
+            asyncio.IncompleteReadError,
+            asyncio.LimitOverrunError,
+            ConnectionError,
+        ):
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(_handle, host, port)
@@ -1,72 +1,289 @@
-"""Rate limiting configuration using slowapi."""
+"""
+Distributed GCRA rate limiter running as a single Redis Lua script.
+
+Why GCRA (not fixed window)?
+- No double burst at window boundaries: state is one "theoretical arrival
+  time" per client, so the allowance drains and refills smoothly
+- One atomic round trip: read, decide and write happen inside the script
+- Redis TIME is the clock, so app workers with skewed clocks never disagree
+
+Why a local lease?
+- Each worker reserves a small slice of a client's allowance per round trip
+  and spends it from memory. Clients far below their limit touch Redis about
+  once per lease instead of once per request; clients close to their limit
+  lease one token at a time, so enforcement stays exact.
+- Unspent leased tokens expire with the lease, which can only make the
+  limiter stricter, never looser.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Optional
 
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
-from slowapi import Limiter
-from slowapi.errors import RateLimitExceeded
-from slowapi.middleware import SlowAPIMiddleware
-from slowapi.util import get_remote_address
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
 
 from app.core.config import settings
+from app.core.exceptions import RateLimitExceededError
+from app.utils.logger import logger
 
+WINDOW_SECONDS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
 
-def get_rate_limit_key(request: Request) -> str:
-    """Get rate limit key based on client IP."""
-    if not settings.RATE_LIMIT_ENABLED:
-        return ""  # Return empty string to bypass rate limiting
-    return get_remote_address(request)
+# KEYS[1] = limiter key
+# ARGV[1] = emission interval in ms (window / limit)
+# ARGV[2] = limit (burst capacity)
+# ARGV[3] = tokens requested
+# Returns {granted, remaining, retry_after_ms}
+GCRA_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local interval = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local period = interval * limit
 
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
 
-# Initialize limiter with conditional storage
-if settings.RATE_LIMIT_ENABLED:
-    limiter = Limiter(
-        key_func=get_rate_limit_key,
-        storage_uri=settings.REDIS_URL,
-        strategy="fixed-window",
-    )
-else:
-    # Use in-memory storage when disabled (won't actually limit)
-    limiter = Limiter(
-        key_func=get_rate_limit_key, storage_uri="memory://", strategy="fixed-window"
-    )
+local available = math.floor((now + period - tat) / interval)
+local granted = math.min(requested, available)
+if granted <= 0 then
+    return {0, 0, math.ceil(tat + interval - period - now)}
+end
+
+local new_tat = math.ceil(tat + granted * interval)
+redis.call('SET', KEYS[1], new_tat, 'PX', new_tat - now)
+return {granted, available - granted, 0}
+"""
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """A parsed limit such as ``100/minute``."""
+
+    requests: int
+    window: int  # seconds
+    spec: str
+
+    @property
+    def interval_ms(self) -> float:
+        """Milliseconds between evenly spaced requests at the limit."""
+        return self.window * 1000 / self.requests
+
+
+@dataclass
+class RateLimitResult:
+    """Outcome of a single limiter check."""
+
+    allowed: bool
+    remaining: int
+    retry_after: float = 0.0  # seconds
+
+
+@dataclass
+class _Lease:
+    """Tokens reserved in Redis and spendable from process memory."""
+
+    tokens: int
+    remaining: int  # Redis-side allowance left after the lease was taken
+    expires_at: float  # monotonic seconds
+
+
+@lru_cache(maxsize=128)
+def parse_rate_limit(spec: str) -> RateLimit:
+    """Parse ``"<requests>/<second|minute|hour|day>"`` into a RateLimit."""
+    try:
+        count_text, window_name = spec.strip().split("/", 1)
+        requests = int(count_text)
+        window = WINDOW_SECONDS[window_name.strip().lower()]
+    except (ValueError, KeyError) as e:
+        raise ValueError(f"Invalid rate limit '{spec}'") from e
+    if requests <= 0:
+        raise ValueError(f"Invalid rate limit '{spec}'")
+    return RateLimit(requests=requests, window=window, spec=spec)
 
 
 def get_rate_limit_string() -> str:
-    """Get rate limit string based on settings."""
+    """Get the default rate limit string based on settings."""
     return f"{settings.RATE_LIMIT_REQUESTS}/{settings.RATE_LIMIT_WINDOW}"
 
 
-def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
+class RateLimiter:
+    """GCRA limiter with a per-process token lease in front of Redis."""
+
+    def __init__(
+        self,
+        redis_client: Redis,
+        lease_fraction: float = 0.05,
+        max_local_keys: int = 10_000,
+    ):
+        self.redis = redis_client
+        self.lease_fraction = lease_fraction
+        self.max_local_keys = max_local_keys
+        self._script = redis_client.register_script(GCRA_SCRIPT)
+        self._leases: OrderedDict[str, _Lease] = OrderedDict()
+
+    def _lease_size(self, limit: RateLimit, lease: Optional[_Lease]) -> int:
+        """Lease a full slice only while the client is clearly under its limit."""
+        size = max(1, int(limit.requests * self.lease_fraction))
+        if lease is not None and lease.remaining < size * 2:
+            return 1
+        return size
+
+    def _take_local(self, lease: Optional[_Lease], now: float) -> bool:
+        """Spend one leased token if the lease is still live."""
+        if lease is None or lease.tokens <= 0 or lease.expires_at <= now:
+            return False
+        lease.tokens -= 1
+        return True
+
+    def _store_lease(self, key: str, lease: _Lease) -> None:
+        self._leases[key] = lease
+        self._leases.move_to_end(key)
+        while len(self._leases) > self.max_local_keys:
+            self._leases.popitem(last=False)
+
+    async def hit(self, key: str, limit: RateLimit) -> RateLimitResult:
+        """
+        Consume one request from ``key``'s allowance.
+
+        Args:
+            key: Fully qualified limiter key (scope + client identity)
+            limit: The limit to enforce
+
+        Returns:
+            RateLimitResult; fails open (allowed) if Redis is unavailable
+        """
+        now = time.monotonic()
+        lease = self._leases.get(key)
+
+        # Fast path: spend from the local lease, no network call
+        if self._take_local(lease, now):
+            remaining = lease.remaining + lease.tokens
+            return RateLimitResult(allowed=True, remaining=remaining)
+
+        requested = self._lease_size(limit, lease)
+        try:
+            granted, remaining, retry_after_ms = await self._script(
+                keys=[key], args=[limit.interval_ms, limit.requests, requested]
+            )
+        except RedisError as e:
+            logger.warning(f"Redis unavailable during rate_limit: {e}")
+            return RateLimitResult(allowed=True, remaining=limit.requests)
+
+        granted = int(granted)
+        if granted <= 0:
+            self._leases.pop(key, None)
+            return RateLimitResult(
+                allowed=False, remaining=0, retry_after=int(retry_after_ms) / 1000
+            )
+
+        # Keep whatever was leased beyond this request; it expires after the
+        # time those tokens represent so idle leases do not hoard allowance.
+        self._store_lease(
+            key,
+            _Lease(
+                tokens=granted - 1,
+                remaining=int(remaining),
+                expires_at=now + granted * limit.interval_ms / 1000,
+            ),
+        )
+        return RateLimitResult(allowed=True, remaining=int(remaining) + granted - 1)
+
+
+# Lazy singleton - initialized after Redis pools are ready
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def init_rate_limiter() -> None:
+    """Initialize limiter singleton. Called on app startup after Redis pools init."""
+    global _rate_limiter
+
+    from app.core.redis_pool import get_rate_limit_redis
+
+    _rate_limiter = RateLimiter(
+        get_rate_limit_redis(),
+        lease_fraction=settings.RATE_LIMIT_LOCAL_LEASE_FRACTION,
+    )
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get rate limiter singleton."""
+    if _rate_limiter is None:
+        raise RuntimeError(
+            "Rate limiter not initialized. Call init_rate_limiter() on startup."
+        )
+    return _rate_limiter
+
+
+def _client_identity(request: Request) -> tuple[str, Optional[str]]:
+    """Return (identity, api_key). Configured API keys are limited per key.
+
+    Anything else, including unknown keys, is limited per IP; otherwise a
+    client could send a fresh key with every request to get a fresh bucket.
+    """
+    api_key = request.headers.get(settings.RATE_LIMIT_API_KEY_HEADER)
+    if api_key and api_key in settings.RATE_LIMIT_API_KEY_LIMITS:
+        digest = hashlib.sha256(api_key.encode()).hexdigest()[:16]
+        return f"key:{digest}", api_key
+    host = request.client.host if request.client else "unknown"
+    return f"ip:{host}", None
+
+
+def resolve_rate_limit(scope: str, api_key: Optional[str] = None) -> RateLimit:
+    """Pick the most specific limit: API key override, then route, then default."""
+    spec = None
+    if api_key:
+        spec = settings.RATE_LIMIT_API_KEY_LIMITS.get(api_key)
+    if spec is None:
+        spec = settings.RATE_LIMIT_ROUTE_LIMITS.get(scope, get_rate_limit_string())
+    return parse_rate_limit(spec)
+
+
+def rate_limit(scope: str) -> Callable:
+    """
+    Build a FastAPI dependency enforcing the limit for ``scope``.
+
+    Usage:
+        @router.get("/", dependencies=[Depends(rate_limit("redirect"))])
+    """
+
+    async def _enforce(request: Request) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+
+        identity, api_key = _client_identity(request)
+        limit = resolve_rate_limit(scope, api_key)
+        result = await get_rate_limiter().hit(f"RATE_LIMIT:{scope}:{identity}", limit)
+        if not result.allowed:
+            raise RateLimitExceededError(limit.spec, result.retry_after)
+
+    return _enforce
+
+
+def rate_limit_exceeded_handler(
+    request: Request, exc: RateLimitExceededError
+) -> JSONResponse:
     """Custom handler for rate limit exceeded errors."""
+    retry_after = max(1, round(exc.retry_after))
     return JSONResponse(
         status_code=429,
         content={
             "detail": "Rate limit exceeded",
             "message": "Too many requests. Please try again later.",
-            "retry_after": exc.detail,
+            "retry_after": retry_after,
         },
+        headers={"Retry-After": str(retry_after), "X-RateLimit-Limit": exc.limit},
     )
 
 
 def setup_rate_limiter(app: FastAPI) -> None:
-    """Setup rate limiter middleware and exception handler."""
-    if settings.RATE_LIMIT_ENABLED:
-        app.state.limiter = limiter
-        app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
-        app.add_middleware(SlowAPIMiddleware)
-
-
-# Conditional rate limit decorator
-def conditional_rate_limit():
-    """
-    Returns a rate limit decorator if rate limiting is enabled,
-    otherwise returns a no-op decorator.
-    """
-    if settings.RATE_LIMIT_ENABLED:
-        return limiter.limit(get_rate_limit_string())
-    else:
-        # No-op decorator when rate limiting is disabled
-        def no_op_decorator(func):
-            return func
-
-        return no_op_decorator
+    """Register the 429 handler. The limiter itself is initialized in lifespan."""
+    app.add_exception_handler(RateLimitExceededError, rate_limit_exceeded_handler)
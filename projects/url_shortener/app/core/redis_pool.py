@@ -7,7 +7,7 @@ Why a singleton pool?
 - Resource management: Centralized cleanup on shutdown
 """
 
-from typing import Optional
+from typing import Callable, Optional
 
 import redis.asyncio as aioredis
 from redis.asyncio import ConnectionPool, Redis
@@ -24,6 +24,7 @@ class RedisPoolManager:
     - cache_pool: URL caching (db 0)
     - analytics_pool: Analytics counters (db 1)
     - queue_pool: Message queue (db 2)
+    - rate_limit_pool: Rate limiter state (db 3)
     """
 
     _instance: Optional["RedisPoolManager"] = None
@@ -41,8 +42,27 @@ class RedisPoolManager:
         self._cache_pool: Optional[ConnectionPool] = None
         self._analytics_pool: Optional[ConnectionPool] = None
         self._queue_pool: Optional[ConnectionPool] = None
+        self._rate_limit_pool: Optional[ConnectionPool] = None
+        self._client_factory: Optional[Callable[[str], Redis]] = None
         self._initialized = True
 
+    def use_client_factory(self, factory: Optional[Callable[[str], Redis]]) -> None:
+        """
+        Serve clients from ``factory(pool_name)`` instead of the TCP pools.
+
+        Lets the benchmark harness plug in an in-memory Redis stand-in
+        (pool names: cache, analytics, queue, rate_limit). Pass None to
+        go back to the real pools.
+        """
+        self._client_factory = factory
+
+    def _get_client(self, name: str, pool: Optional[ConnectionPool]) -> Redis:
+        if self._client_factory is not None:
+            return self._client_factory(name)
+        if not pool:
+            raise RuntimeError("Redis pools not initialized. Call init_pools() first.")
+        return Redis(connection_pool=pool)
+
     async def init_pools(self) -> None:
         """Initialize all connection pools. Call on app startup."""
         pool_kwargs = {
@@ -67,34 +87,59 @@ class RedisPoolManager:
             f"{settings.REDIS_URL}/{settings.REDIS_DB_QUEUE}",
             **pool_kwargs,
         )
+
+        self._rate_limit_pool = ConnectionPool.from_url(
+            f"{settings.REDIS_URL}/{settings.REDIS_DB_RATE_LIMIT}",
+            **pool_kwargs,
+        )
         
         logger.info("Redis connection pools initialized")
 
     async def close_pools(self) -> None:
         """Close all connection pools. Call on app shutdown."""
-        pools = [self._cache_pool, self._analytics_pool, self._queue_pool]
+        pools = [
+            self._cache_pool,
+            self._analytics_pool,
+            self._queue_pool,
+            self._rate_limit_pool,
+        ]
         for pool in pools:
             if pool:
                 await pool.disconnect()
         logger.info("Redis connection pools closed")
 
+    def pool_stats(self) -> dict[str, tuple[int, int]]:
+        """Return {pool_name: (in_use, available)} connection counts for metrics."""
+        pools = {
+            "cache": self._cache_pool,
+            "analytics": self._analytics_pool,
+            "queue": self._queue_pool,
+            "rate_limit": self._rate_limit_pool,
+        }
+        return {
+            name: (
+                len(getattr(pool, "_in_use_connections", ())),
+                len(getattr(pool, "_available_connections", ())),
+            )
+            for name, pool in pools.items()
+            if pool is not None
+        }
+
     def get_cache_client(self) -> Redis:
         """Get Redis client for URL caching."""
-        if not self._cache_pool:
-            raise RuntimeError("Redis pools not initialized. Call init_pools() first.")
-        return Redis(connection_pool=self._cache_pool)
+        return self._get_client("cache", self._cache_pool)
 
     def get_analytics_client(self) -> Redis:
         """Get Redis client for analytics."""
-        if not self._analytics_pool:
-            raise RuntimeError("Redis pools not initialized. Call init_pools() first.")
-        return Redis(connection_pool=self._analytics_pool)
+        return self._get_client("analytics", self._analytics_pool)
 
     def get_queue_client(self) -> Redis:
         """Get Redis client for message queue."""
-        if not self._queue_pool:
-            raise RuntimeError("Redis pools not initialized. Call init_pools() first.")
-        return Redis(connection_pool=self._queue_pool)
+        return self._get_client("queue", self._queue_pool)
+
+    def get_rate_limit_client(self) -> Redis:
+        """Get Redis client for rate limiter state."""
+        return self._get_client("rate_limit", self._rate_limit_pool)
 
 
 # Singleton instance
@@ -115,3 +160,8 @@ def get_analytics_redis() -> Redis:
 def get_queue_redis() -> Redis:
     """Get async Redis client for message queue."""
     return redis_pool_manager.get_queue_client()
+
+
+def get_rate_limit_redis() -> Redis:
+    """Get async Redis client for rate limiting."""
+    return redis_pool_manager.get_rate_limit_client()
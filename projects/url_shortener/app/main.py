@@ -3,14 +3,17 @@ from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 
 from app.api.v1.endpoints.url_redirect import router as redirect_router
 from app.api.v1.router import api_router
 from app.core.cache import init_caches
 from app.core.config import settings
+from app.core.loop_monitor import start_loop_monitor, stop_loop_monitor
 from app.core.message_queue import init_queue
-from app.core.rate_limiter import setup_rate_limiter
+from app.core.metrics import CONTENT_TYPE_LATEST, REGISTRY, register_pool_collectors
+from app.core.rate_limiter import init_rate_limiter, setup_rate_limiter
 from app.core.redis_pool import redis_pool_manager
 from app.core.scheduler import analytics_scheduler
 from app.utils.logger import logger
@@ -26,9 +29,13 @@ async def lifespan(app: FastAPI):
     - Initialize Redis connection pools
     - Initialize cache instances
     - Initialize message queue
+    - Initialize rate limiter (when enabled)
+    - Register pool metrics collectors
+    - Start event loop monitor (when enabled)
     - Start analytics scheduler
     
     Shutdown:
+    - Stop event loop monitor
     - Stop scheduler
     - Close Redis connection pools
     """
@@ -46,6 +53,18 @@ async def lifespan(app: FastAPI):
     # Initialize message queue (uses Redis pools)
     init_queue()
     logger.info("Message queue initialized")
+
+    # Initialize rate limiter (uses Redis pools)
+    if settings.RATE_LIMIT_ENABLED:
+        init_rate_limiter()
+        logger.info("Rate limiter initialized")
+
+    # Pool gauges are sampled at scrape time, not per request
+    if settings.METRICS_ENABLED:
+        register_pool_collectors()
+
+    if settings.LOOP_MONITOR_ENABLED:
+        start_loop_monitor()
     
     # Start analytics scheduler
     analytics_scheduler.start()
@@ -56,6 +75,8 @@ async def lifespan(app: FastAPI):
     # === SHUTDOWN ===
     logger.info("Shutting down application...")
     
+    await stop_loop_monitor()
+
     # Stop scheduler first
     analytics_scheduler.stop()
     
@@ -79,7 +100,7 @@ app.add_middleware(
     allow_headers=settings.CORS_ALLOW_HEADERS,
 )
 
-# Setup rate limiter (conditionally enabled based on settings)
+# Register rate limit error handler (limits are enforced per route)
 setup_rate_limiter(app)
 
 STATIC_DIR = Path(__file__).parent / "static"
@@ -96,6 +117,14 @@ async def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
+if settings.METRICS_ENABLED:
+
+    @app.get("/metrics", tags=["Health"], include_in_schema=False)
+    async def metrics() -> PlainTextResponse:
+        """Prometheus scrape endpoint (per-worker registry)."""
+        return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE_LATEST)
+
+
 # Server-rendered web routes
 app.include_router(web_router)
 
@@ -11,9 +11,18 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.cache import get_url_cache
 from app.core.exceptions import URLNotFoundError
 from app.core.message_queue import get_analytics_queue
+from app.core.metrics import REDIRECT_CACHE_LOOKUPS, REDIRECT_STAGE_SECONDS, timed
 from app.repositories.url_repository import url_repository
 from app.utils.logger import logger
 
+# Pre-bound metric children keep label lookups off the hot path
+_STAGE_CACHE_GET = REDIRECT_STAGE_SECONDS.labels(stage="cache_get")
+_STAGE_DB_FALLBACK = REDIRECT_STAGE_SECONDS.labels(stage="db_fallback")
+_STAGE_CACHE_BACKFILL = REDIRECT_STAGE_SECONDS.labels(stage="cache_backfill")
+_STAGE_ANALYTICS_PUBLISH = REDIRECT_STAGE_SECONDS.labels(stage="analytics_publish")
+_CACHE_HIT = REDIRECT_CACHE_LOOKUPS.labels(result="hit")
+_CACHE_MISS = REDIRECT_CACHE_LOOKUPS.labels(result="miss")
+
 
 class URLRedirectionService:
     """
@@ -45,20 +54,26 @@ class URLRedirectionService:
             URLNotFoundError: If short code not found
         """
         # Fast path: Check cache first (0.1ms)
-        cached_url = await self.cache.get_cached_url(short_code)
+        with timed(_STAGE_CACHE_GET):
+            cached_url = await self.cache.get_cached_url(short_code)
         if cached_url:
+            _CACHE_HIT.inc()
             # Fire-and-forget analytics (don't await, don't block redirect)
             await self._publish_click_event(short_code)
             return cached_url
 
+        _CACHE_MISS.inc()
+
         # Slow path: Database lookup (5ms)
-        url_entity = await self.repo.get_by_code(self.db, short_code)
+        with timed(_STAGE_DB_FALLBACK):
+            url_entity = await self.repo.get_by_code(self.db, short_code)
 
         if not url_entity:
             raise URLNotFoundError(f"Short code '{short_code}' not found")
 
         # Cache for future requests
-        await self.cache.cache_url(short_code, url_entity.original_url)
+        with timed(_STAGE_CACHE_BACKFILL):
+            await self.cache.cache_url(short_code, url_entity.original_url)
 
         # Publish analytics event
         await self._publish_click_event(short_code)
@@ -68,13 +83,14 @@ class URLRedirectionService:
     async def _publish_click_event(self, short_code: str) -> None:
         """Publish click event to analytics queue (fast, non-blocking)."""
         try:
-            await self.queue.publish(
-                event_type="click",
-                data={
-                    "short_code": short_code,
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
-                },
-            )
+            with timed(_STAGE_ANALYTICS_PUBLISH):
+                await self.queue.publish(
+                    event_type="click",
+                    data={
+                        "short_code": short_code,
+                        "timestamp": datetime.now(timezone.utc).isoformat(),
+                    },
+                )
         except Exception as e:
             # Log but don't fail the redirect
             logger.warning(f"Failed to publish click event: {e}")
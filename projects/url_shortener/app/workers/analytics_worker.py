@@ -11,11 +11,17 @@ Features:
 import asyncio
 import signal
 import sys
+import time
 from datetime import datetime, timezone
 from typing import Dict, Any, List
 
 from app.core.config import settings
 from app.core.message_queue import init_queue, get_analytics_queue
+from app.core.metrics import (
+    WORKER_FLUSH_SECONDS,
+    WORKER_FLUSHED_CLICKS,
+    start_metrics_server,
+)
 from app.core.redis_pool import redis_pool_manager
 from app.db.session import AsyncSessionLocal
 from app.repositories.url_repository import url_repository
@@ -53,6 +59,12 @@ class AsyncAnalyticsWorker:
         
         self.running = True
         self.queue = get_analytics_queue()
+
+        # Optional /metrics endpoint (the worker has no web app of its own)
+        metrics_server = None
+        if settings.WORKER_METRICS_PORT:
+            metrics_server = await start_metrics_server(settings.WORKER_METRICS_PORT)
+            logger.info(f"Worker metrics on :{settings.WORKER_METRICS_PORT}/metrics")
         
         logger.info(f"Analytics worker '{self.consumer_name}' started. Waiting for events...")
         
@@ -86,6 +98,8 @@ class AsyncAnalyticsWorker:
             # Final flush before shutdown
             await self._flush_to_database()
             await redis_pool_manager.close_pools()
+            if metrics_server:
+                metrics_server.close()
     
     async def _process_batch(self, messages: List[tuple]) -> None:
         """
@@ -143,12 +157,15 @@ class AsyncAnalyticsWorker:
         self.click_buffer.clear()
         self.last_flush = datetime.now(timezone.utc)
         
+        started = time.perf_counter()
         try:
             async with AsyncSessionLocal() as db:
                 for short_code, count in buffer_copy.items():
                     await url_repository.increment_fetch_count_by(db, short_code, count)
                 await db.commit()
-                
+
+            WORKER_FLUSH_SECONDS.observe(time.perf_counter() - started)
+            WORKER_FLUSHED_CLICKS.inc(sum(buffer_copy.values()))
             logger.info(f"Flushed {len(buffer_copy)} URLs, {sum(buffer_copy.values())} total clicks")
             
         except Exception as e:
@@ -0,0 +1,5 @@
+"""
+Hermetic benchmark suite: the real app on in-memory Redis and SQLite.
+
+Run with ``python -m benchmarks.run`` from the project root.
+"""
@@ -0,0 +1,278 @@
+"""
+Local stand-ins for Redis and PostgreSQL.
+
+Why in-house (not fakeredis)?
+- The app uses a small, fixed set of commands (strings, one hash, streams
+  with one consumer group); covering exactly those keeps the stand-in cheap
+  enough that benchmark numbers reflect app code, not the fake
+- No extra dependency beyond aiosqlite for the database side
+
+Semantics follow ``redis.asyncio.Redis(decode_responses=True)``: values go
+in as str/int and come back as str.
+"""
+
+import asyncio
+import time
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from redis.exceptions import ResponseError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.db.base import Base
+
+
+@dataclass
+class _ConsumerGroup:
+    last_delivered: Tuple[int, int] = (0, 0)
+    # message_id -> (consumer, delivered_at_ms)
+    pending: Dict[str, Tuple[str, float]] = field(default_factory=dict)
+
+
+@dataclass
+class _Stream:
+    entries: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    ids: List[Tuple[int, int]] = field(default_factory=list)  # sorted, for bisect
+    last_id: Tuple[int, int] = (0, 0)
+    groups: Dict[str, _ConsumerGroup] = field(default_factory=dict)
+    new_entry: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+def _parse_id(message_id: str) -> Tuple[int, int]:
+    ms, _, seq = message_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+def _now_ms() -> float:
+    return time.time() * 1000
+
+
+class InMemoryRedis:
+    """Single-process Redis stand-in covering the commands the app uses."""
+
+    def __init__(self) -> None:
+        self._strings: Dict[str, Tuple[str, Optional[float]]] = {}
+        self._hashes: Dict[str, Dict[str, str]] = {}
+        self._streams: Dict[str, _Stream] = {}
+
+    # === Connection ===
+
+    async def ping(self) -> bool:
+        return True
+
+    async def aclose(self) -> None:
+        return None
+
+    async def flushdb(self) -> bool:
+        self._strings.clear()
+        self._hashes.clear()
+        self._streams.clear()
+        return True
+
+    # === Strings ===
+
+    async def get(self, key: str) -> Optional[str]:
+        item = self._strings.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._strings[key]
+            return None
+        return value
+
+    async def set(self, key: str, value: Any, ex: Optional[int] = None) -> bool:
+        expires_at = time.monotonic() + ex if ex else None
+        self._strings[key] = (str(value), expires_at)
+        return True
+
+    async def delete(self, *keys: str) -> int:
+        removed = 0
+        for key in keys:
+            for store in (self._strings, self._hashes, self._streams):
+                if store.pop(key, None) is not None:
+                    removed += 1
+        return removed
+
+    # === Hashes ===
+
+    async def hincrby(self, name: str, key: str, amount: int = 1) -> int:
+        bucket = self._hashes.setdefault(name, {})
+        value = int(bucket.get(key, 0)) + amount
+        bucket[key] = str(value)
+        return value
+
+    async def hget(self, name: str, key: str) -> Optional[str]:
+        return self._hashes.get(name, {}).get(key)
+
+    async def hgetall(self, name: str) -> Dict[str, str]:
+        return dict(self._hashes.get(name, {}))
+
+    async def hdel(self, name: str, *keys: str) -> int:
+        bucket = self._hashes.get(name, {})
+        return sum(bucket.pop(key, None) is not None for key in keys)
+
+    # === Streams ===
+
+    def _stream(self, name: str, create: bool = False) -> Optional[_Stream]:
+        stream = self._streams.get(name)
+        if stream is None and create:
+            stream = self._streams[name] = _Stream()
+        return stream
+
+    async def xadd(
+        self,
+        name: str,
+        fields: Dict[str, Any],
+        maxlen: Optional[int] = None,
+        approximate: bool = True,
+    ) -> str:
+        stream = self._stream(name, create=True)
+        ms = int(_now_ms())
+        last_ms, last_seq = stream.last_id
+        stream.last_id = (ms, 0) if ms > last_ms else (last_ms, last_seq + 1)
+        message_id = f"{stream.last_id[0]}-{stream.last_id[1]}"
+        stream.entries[message_id] = {k: str(v) for k, v in fields.items()}
+        stream.ids.append(stream.last_id)
+        # Like MAXLEN ~, trim in chunks rather than on every add
+        if maxlen is not None and len(stream.ids) > maxlen * 1.1 + 100:
+            excess = len(stream.ids) - maxlen
+            for ms, seq in stream.ids[:excess]:
+                del stream.entries[f"{ms}-{seq}"]
+            del stream.ids[:excess]
+        stream.new_entry.set()
+        return message_id
+
+    async def xlen(self, name: str) -> int:
+        stream = self._stream(name)
+        return len(stream.entries) if stream else 0
+
+    async def xgroup_create(
+        self, name: str, groupname: str, id: str = "$", mkstream: bool = False
+    ) -> bool:
+        stream = self._stream(name, create=mkstream)
+        if stream is None:
+            raise ResponseError("ERR The XGROUP subcommand requires the key to exist")
+        if groupname in stream.groups:
+            raise ResponseError("BUSYGROUP Consumer Group name already exists")
+        start = stream.last_id if id == "$" else _parse_id(id)
+        stream.groups[groupname] = _ConsumerGroup(last_delivered=start)
+        return True
+
+    def _group(self, name: str, groupname: str) -> Tuple[_Stream, _ConsumerGroup]:
+        stream = self._stream(name)
+        if stream is None or groupname not in stream.groups:
+            raise ResponseError("NOGROUP No such key or consumer group")
+        return stream, stream.groups[groupname]
+
+    async def xreadgroup(
+        self,
+        groupname: str,
+        consumername: str,
+        streams: Dict[str, str],
+        count: Optional[int] = None,
+        block: Optional[int] = None,
+    ) -> List:
+        deadline = time.monotonic() + block / 1000 if block else None
+        while True:
+            result = []
+            for name in streams:
+                stream, group = self._group(name, groupname)
+                start = bisect_right(stream.ids, group.last_delivered)
+                end = len(stream.ids) if not count else start + count
+                batch = []
+                delivered_at = _now_ms()
+                for ms, seq in stream.ids[start:end]:
+                    message_id = f"{ms}-{seq}"
+                    batch.append((message_id, dict(stream.entries[message_id])))
+                    group.pending[message_id] = (consumername, delivered_at)
+                    group.last_delivered = (ms, seq)
+                if batch:
+                    result.append((name, batch))
+            if result or deadline is None:
+                return result
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return []
+            events = [self._streams[name].new_entry for name in streams]
+            for event in events:
+                event.clear()
+            waiters = [asyncio.ensure_future(event.wait()) for event in events]
+            _, not_done = await asyncio.wait(
+                waiters, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+            )
+            for waiter in not_done:
+                waiter.cancel()
+
+    async def xack(self, name: str, groupname: str, *ids: str) -> int:
+        _, group = self._group(name, groupname)
+        return sum(group.pending.pop(message_id, None) is not None for message_id in ids)
+
+    async def xautoclaim(
+        self,
+        name: str,
+        groupname: str,
+        consumername: str,
+        min_idle_time: int,
+        start_id: str = "0-0",
+        count: int = 100,
+    ) -> List:
+        stream, group = self._group(name, groupname)
+        now = _now_ms()
+        claimed = []
+        deleted = []
+        for message_id, (_, delivered_at) in list(group.pending.items()):
+            if now - delivered_at < min_idle_time:
+                continue
+            if _parse_id(message_id) < _parse_id(start_id):
+                continue
+            if message_id not in stream.entries:
+                deleted.append(message_id)
+                del group.pending[message_id]
+                continue
+            group.pending[message_id] = (consumername, now)
+            claimed.append((message_id, dict(stream.entries[message_id])))
+            if len(claimed) >= count:
+                break
+        return ["0-0", claimed, deleted]
+
+
+class InMemoryRedisBackend:
+    """
+    One InMemoryRedis per logical pool, mirroring the separate Redis DBs.
+
+    Plug into the app with ``redis_pool_manager.use_client_factory(backend)``.
+    """
+
+    def __init__(self) -> None:
+        self.databases: Dict[str, InMemoryRedis] = {}
+
+    def __call__(self, pool_name: str) -> InMemoryRedis:
+        if pool_name not in self.databases:
+            self.databases[pool_name] = InMemoryRedis()
+        return self.databases[pool_name]
+
+
+async def create_sqlite_engine(path: str = ":memory:") -> AsyncEngine:
+    """
+    Async SQLite engine with the app schema created.
+
+    ``:memory:`` uses one shared connection (StaticPool), so every session
+    sees the same database.
+    """
+    from sqlalchemy.pool import StaticPool
+
+    # Register every model on Base.metadata before create_all
+    import app.models.refresh_token  # noqa: F401
+    import app.models.url  # noqa: F401
+    import app.models.user  # noqa: F401
+
+    kwargs: Dict[str, Any] = {"connect_args": {"check_same_thread": False}}
+    if path == ":memory:":
+        kwargs["poolclass"] = StaticPool
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}", **kwargs)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return engine
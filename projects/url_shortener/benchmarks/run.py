@@ -0,0 +1,247 @@
+"""
+Run the benchmark suite and write stable JSON for trend tracking.
+
+Usage:
+    python -m benchmarks.run
+    python -m benchmarks.run --filter http. --output bench.json
+    python -m benchmarks.run --compare main.json --max-regression 0.15
+
+JSON layout (keys sorted, schema versioned):
+    {"schema": 1, "meta": {...}, "benchmarks": {"<group>.<name>": {
+        "median_ns", "min_ns", "mean_ns", "stdev_pct", "ops_per_sec",
+        "number", "rounds"}}}
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import Dict, List
+
+from benchmarks.harness import BenchResult, bench, local_app
+
+SCHEMA_VERSION = 1
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def run_suite(scale: float, rounds: int, selected: str) -> List[BenchResult]:
+    """Run every benchmark whose name contains ``selected``."""
+    from app.core.cache import get_analytics_cache, get_url_cache
+    from app.core.message_queue import get_analytics_queue
+    from app.db.session import AsyncSessionLocal
+    from app.repositories.url_repository import url_repository
+    from app.utils.shortener import generate_short_code
+
+    def n(base: int) -> int:
+        return max(1, int(base * scale))
+
+    results: List[BenchResult] = []
+    counter = itertools.count()
+
+    async def run(name: str, op, number: int, **kwargs) -> None:
+        if selected in name:
+            print(f"  {name:<32}", end="", flush=True)
+            result = await bench(name, op, number, rounds, **kwargs)
+            print(f"{result.to_dict()['median_ns'] / 1000:>10.2f} us/op")
+            results.append(result)
+
+    async with local_app() as stack:
+        url_cache = get_url_cache()
+        analytics_cache = get_analytics_cache()
+        queue = get_analytics_queue()
+        client = stack.client
+
+        # === Pure functions ===
+        await run(
+            "shortener.generate_short_code",
+            lambda: generate_short_code(f"https://example.com/{next(counter)}"),
+            n(20_000),
+            is_async=False,
+        )
+
+        # === Cache layer ===
+        await url_cache.cache_url("hot", "https://example.com/hot")
+        await run(
+            "cache.url_set",
+            lambda: url_cache.cache_url(f"k{next(counter)}", "https://example.com"),
+            n(20_000),
+        )
+        await run(
+            "cache.url_get_hit", lambda: url_cache.get_cached_url("hot"), n(20_000)
+        )
+        await run(
+            "cache.url_get_miss", lambda: url_cache.get_cached_url("absent"), n(20_000)
+        )
+        await run(
+            "cache.analytics_increment",
+            lambda: analytics_cache.increment_click_count("hot"),
+            n(20_000),
+        )
+
+        # === Message queue ===
+        event = {"short_code": "hot", "timestamp": "2024-01-01T00:00:00+00:00"}
+        await run("queue.publish", lambda: queue.publish("click", event), n(10_000))
+
+        consume_batches = n(200)
+
+        async def fill_queue() -> None:
+            for _ in range(consume_batches * 100):
+                await queue.publish("click", event)
+
+        async def consume_and_ack() -> None:
+            messages = await queue.consume_batch("bench", count=100, block_ms=0)
+            await queue.acknowledge([message_id for message_id, _ in messages])
+
+        await run(
+            "queue.consume_ack_100",
+            consume_and_ack,
+            consume_batches,
+            setup=fill_queue,
+        )
+
+        # === Full HTTP paths ===
+        async def create() -> None:
+            response = await client.post(
+                "/api/v1/urls/",
+                json={"original_url": f"https://example.com/{next(counter)}"},
+            )
+            assert response.status_code in (200, 201), response.text
+
+        await run("http.create", create, n(1_000))
+
+        response = await client.post(
+            "/api/v1/urls/", json={"original_url": "https://example.com/redirect"}
+        )
+        hot_code = response.json()["short_code"]
+
+        async def redirect_hit() -> None:
+            response = await client.get(f"/{hot_code}")
+            assert response.status_code == 302, response.status_code
+
+        await run("http.redirect_cache_hit", redirect_hit, n(2_000))
+
+        # Rows inserted behind the cache's back; every request in a round
+        # asks for a different code so each one takes the DB fallback path.
+        miss_number = n(1_000)
+        cold_codes: List[str] = []
+        async with AsyncSessionLocal() as db:
+            for i in range(miss_number):
+                code = f"cold{i:05d}"
+                await url_repository.create(
+                    db, original_url=f"https://example.com/cold/{i}", short_code=code
+                )
+                cold_codes.append(code)
+        cold_iter = iter(())
+
+        async def reset_cold() -> None:
+            nonlocal cold_iter
+            await stack.redis("cache").flushdb()
+            cold_iter = iter(cold_codes)
+
+        async def redirect_miss() -> None:
+            response = await client.get(f"/{next(cold_iter)}")
+            assert response.status_code == 302, response.status_code
+
+        await run(
+            "http.redirect_cache_miss", redirect_miss, miss_number, setup=reset_cold
+        )
+
+        async def not_found() -> None:
+            response = await client.get(f"/zz{next(counter)}")
+            assert response.status_code == 404, response.status_code
+
+        await run("http.redirect_not_found", not_found, n(1_000))
+
+    return results
+
+
+def build_report(results: List[BenchResult], scale: float) -> Dict:
+    return {
+        "schema": SCHEMA_VERSION,
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "scale": scale,
+        },
+        "benchmarks": {result.name: result.to_dict() for result in results},
+    }
+
+
+def compare(report: Dict, baseline: Dict, max_regression: float) -> bool:
+    """Print median deltas against a baseline. Returns False on a regression."""
+    ok = True
+    print(f"\n  {'benchmark':<32}{'baseline':>12}{'current':>12}{'delta':>9}")
+    for name, current in sorted(report["benchmarks"].items()):
+        previous = baseline.get("benchmarks", {}).get(name)
+        if previous is None:
+            continue
+        delta = current["median_ns"] / previous["median_ns"] - 1
+        flag = ""
+        if delta > max_regression:
+            flag = "  ❌"
+            ok = False
+        print(
+            f"  {name:<32}{previous['median_ns'] / 1000:>10.2f}us"
+            f"{current['median_ns'] / 1000:>10.2f}us{delta:>+8.1%}{flag}"
+        )
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="In-process benchmark suite",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__.split("Usage:")[1],
+    )
+    parser.add_argument("--filter", default="", help="Only run names containing this")
+    parser.add_argument("--rounds", type=int, default=5, help="Measured rounds")
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="Multiply operations per round"
+    )
+    parser.add_argument("--output", "-o", help="Write JSON results to this file")
+    parser.add_argument("--compare", help="Baseline JSON to compare medians against")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.2,
+        help="Fail if a median is this much slower than baseline (0.2 = 20%%)",
+    )
+    args = parser.parse_args()
+
+    print(f"\n  Running benchmarks (rounds={args.rounds}, scale={args.scale})\n")
+    results = asyncio.run(run_suite(args.scale, args.rounds, args.filter))
+    report = build_report(results, args.scale)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\n  Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if not compare(report, baseline, args.max_regression):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
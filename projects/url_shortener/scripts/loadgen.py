@@ -0,0 +1,623 @@
+#!/usr/bin/env python3
+"""
+Open-loop async load generator for the URL Shortener.
+No external dependencies - uses only Python standard library.
+
+Why open loop?
+- A closed-loop tester (N threads, each waiting for its response) slows
+  down exactly when the server does, so the slow requests it *should* have
+  sent are never sent. That is coordinated omission: p99 looks great while
+  users queue.
+- Here requests are scheduled at a fixed arrival rate. Latency is measured
+  from the *intended* send time, so queueing inside the client (waiting for
+  a free connection) is charged to the server, like real users would see it.
+
+Scenarios (mix with --mix, weights are relative):
+- create:   POST /api/v1/urls/ with a random URL
+- redirect: GET /{short_code} for a seeded code (cache hot path)
+- resolve:  GET /{short_code} for a code that does not exist
+            (cache miss + DB lookup, expects 404)
+
+Redirect keys follow --distribution (uniform, zipf, replay) and arrivals
+follow --arrival (constant, burst); see workloads.py.
+
+Usage:
+    python scripts/loadgen.py --rate 2000 --duration 30
+    python scripts/loadgen.py --rate 500 --mix create=1,redirect=8,resolve=1 \\
+        --output results/run.json --label "$(git rev-parse --short HEAD)"
+    python scripts/loadgen.py --codes-file codes.txt --distribution zipf \\
+        --zipf-s 1.1 --arrival burst --burst-rate 5000
+    python scripts/loadgen.py --distribution replay --replay-log access.log
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import platform
+import random
+import ssl
+import string
+import time
+from collections import Counter as TallyCounter
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from workloads import (
+    ReplaySampler,
+    UniformSampler,
+    ZipfSampler,
+    burst_arrivals,
+    constant_arrivals,
+    load_codes,
+    parse_access_log,
+)
+
+REPORT_PERCENTILES = (50.0, 90.0, 99.0, 99.9, 99.99)
+SCENARIOS = ("create", "redirect", "resolve")
+LATE_SEND_TOLERANCE = 0.01  # seconds behind schedule before a send counts as late
+
+
+# =============================================================================
+# HDR-style histogram
+# =============================================================================
+class HdrHistogram:
+    """
+    Log-linear histogram with bounded relative error (HdrHistogram layout).
+
+    Values are integers (microseconds here). Each power-of-two range is split
+    into ``sub_bucket_count / 2`` linear sub-buckets, so any recorded value is
+    reported within ``10 ** -significant_figures`` of its true value, with
+    O(1) recording and memory proportional to the dynamic range.
+    """
+
+    def __init__(self, significant_figures: int = 3):
+        if not 1 <= significant_figures <= 5:
+            raise ValueError("significant_figures must be between 1 and 5")
+        largest_single_unit = 2 * 10**significant_figures
+        self.sub_bucket_bits = math.ceil(math.log2(largest_single_unit))
+        self.sub_bucket_count = 1 << self.sub_bucket_bits
+        self.sub_bucket_half = self.sub_bucket_count >> 1
+        self.significant_figures = significant_figures
+        self.counts: Dict[int, int] = defaultdict(int)
+        self.total = 0
+        self.min = math.inf
+        self.max = 0
+        self._sum = 0
+
+    def _index(self, value: int) -> int:
+        if value < self.sub_bucket_count:
+            return value
+        shift = value.bit_length() - self.sub_bucket_bits
+        sub = value >> shift  # in [half, count)
+        return self.sub_bucket_count + (shift - 1) * self.sub_bucket_half + (
+            sub - self.sub_bucket_half
+        )
+
+    def _highest_equivalent(self, index: int) -> int:
+        if index < self.sub_bucket_count:
+            return index
+        offset = index - self.sub_bucket_count
+        shift = offset // self.sub_bucket_half + 1
+        sub = offset % self.sub_bucket_half + self.sub_bucket_half
+        return (sub << shift) + (1 << shift) - 1
+
+    def record(self, value: int, count: int = 1) -> None:
+        value = max(0, int(value))
+        self.counts[self._index(value)] += count
+        self.total += count
+        self._sum += value * count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "HdrHistogram") -> None:
+        if other.sub_bucket_bits != self.sub_bucket_bits:
+            raise ValueError("Cannot merge histograms with different precision")
+        for index, count in other.counts.items():
+            self.counts[index] += count
+        self.total += other.total
+        self._sum += other._sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self) -> float:
+        return self._sum / self.total if self.total else 0.0
+
+    def value_at_percentile(self, percentile: float) -> int:
+        if not self.total:
+            return 0
+        target = max(1, math.ceil(self.total * percentile / 100))
+        running = 0
+        for index in sorted(self.counts):
+            running += self.counts[index]
+            if running >= target:
+                return min(self._highest_equivalent(index), self.max)
+        return self.max
+
+    def summary_ms(self) -> Dict[str, float]:
+        """Percentiles in milliseconds, ready for JSON."""
+        result = {
+            f"p{p:g}": round(self.value_at_percentile(p) / 1000, 3)
+            for p in REPORT_PERCENTILES
+        }
+        result["min"] = round(self.min / 1000, 3) if self.total else 0.0
+        result["mean"] = round(self.mean / 1000, 3)
+        result["max"] = round(self.max / 1000, 3)
+        return result
+
+
+# =============================================================================
+# Minimal async HTTP/1.1 client with keep-alive pool
+# =============================================================================
+class HttpPool:
+    """Fixed-size pool of keep-alive HTTP/1.1 connections to one origin."""
+
+    def __init__(self, base_url: str, size: int, timeout: float):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.ssl = ssl.create_default_context() if parts.scheme == "https" else None
+        self.host_header = parts.netloc
+        self.timeout = timeout
+        self._idle: asyncio.Queue = asyncio.Queue()
+        for _ in range(size):
+            self._idle.put_nowait(None)  # lazily connected slot
+
+    async def _connect(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        return await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+
+    async def request(
+        self, method: str, path: str, body: Optional[bytes] = None
+    ) -> Tuple[int, bytes, float]:
+        """
+        Send one request. Returns (status, body, send_time) where send_time is
+        the moment a connection was acquired (for service-time latency).
+        """
+        conn = await self._idle.get()
+        send_time = time.perf_counter()
+        try:
+            if conn is None:
+                conn = await asyncio.wait_for(self._connect(), self.timeout)
+            reader, writer = conn
+            head = (
+                f"{method} {path} HTTP/1.1\r\n"
+                f"Host: {self.host_header}\r\n"
+                "Connection: keep-alive\r\n"
+                "User-Agent: loadgen/1.0\r\n"
+            )
+            if body is not None:
+                head += (
+                    "Content-Type: application/json\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                )
+            writer.write(head.encode() + b"\r\n" + (body or b""))
+            status, payload, keep_alive = await asyncio.wait_for(
+                self._read_response(reader), self.timeout
+            )
+            if not keep_alive:
+                writer.close()
+                conn = None
+            return status, payload, send_time
+        except BaseException:
+            if conn is not None:
+                conn[1].close()
+            conn = None
+            raise
+        finally:
+            self._idle.put_nowait(conn)
+
+    @staticmethod
+    async def _read_response(reader: asyncio.StreamReader) -> Tuple[int, bytes, bool]:
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("Connection closed by server")
+        status = int(status_line.split()[1])
+
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            payload = b"".join(chunks)
+        else:
+            payload = await reader.readexactly(int(headers.get("content-length", 0)))
+
+        keep_alive = headers.get("connection", "").lower() != "close"
+        return status, payload, keep_alive
+
+
+# =============================================================================
+# Scenarios
+# =============================================================================
+def random_url() -> str:
+    """Generate a random URL for testing."""
+    path = "".join(random.choices(string.ascii_lowercase, k=10))
+    return f"https://example.com/{path}"
+
+
+def random_missing_code() -> str:
+    """A short code that (almost certainly) does not exist: 9 chars > 6."""
+    return "zz" + "".join(random.choices(string.ascii_letters + string.digits, k=7))
+
+
+@dataclass
+class ScenarioStats:
+    """Per-scenario results."""
+
+    name: str
+    corrected: HdrHistogram = field(default_factory=HdrHistogram)
+    uncorrected: HdrHistogram = field(default_factory=HdrHistogram)
+    status_codes: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    errors: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    expected_status: Tuple[int, ...] = (200,)
+
+    @property
+    def count(self) -> int:
+        return self.corrected.total
+
+    @property
+    def failed(self) -> int:
+        bad_status = sum(
+            n for code, n in self.status_codes.items()
+            if int(code) not in self.expected_status
+        )  # fmt: skip
+        return bad_status + sum(self.errors.values())
+
+    def to_dict(self, elapsed: float) -> dict:
+        return {
+            "requests": self.count + sum(self.errors.values()),
+            "failed": self.failed,
+            "achieved_rps": round(self.count / elapsed, 2) if elapsed else 0.0,
+            "latency_ms": self.corrected.summary_ms(),
+            "service_time_ms": self.uncorrected.summary_ms(),
+            "status_codes": dict(self.status_codes),
+            "errors": dict(self.errors),
+        }
+
+
+class Scenario:
+    """Builds the request for one scenario type."""
+
+    def __init__(self, name: str, pick_code: Optional[Callable[[], str]] = None):
+        self.name = name
+        self.pick_code = pick_code
+        self.requested: TallyCounter = TallyCounter()
+
+    def build(self) -> Tuple[str, str, Optional[bytes]]:
+        if self.name == "create":
+            body = json.dumps({"original_url": random_url()}).encode()
+            return "POST", "/api/v1/urls/", body
+        if self.name == "redirect":
+            code = self.pick_code()
+            self.requested[code] += 1
+            return "GET", f"/{code}", None
+        return "GET", f"/{random_missing_code()}", None
+
+    def key_stats(self) -> dict:
+        """How concentrated the redirect keys were (for cache sizing)."""
+        counts = sorted(self.requested.values(), reverse=True)
+        total = sum(counts)
+        if not total:
+            return {}
+
+        def share(fraction: float) -> float:
+            top = max(1, int(len(counts) * fraction))
+            return round(sum(counts[:top]) / total, 4)
+
+        return {
+            "distinct_codes": len(counts),
+            "top_1pct_share": share(0.01),
+            "top_10pct_share": share(0.10),
+        }
+
+    @property
+    def expected_status(self) -> Tuple[int, ...]:
+        return {
+            "create": (200, 201),
+            "redirect": (301, 302, 307, 308),
+            "resolve": (404,),
+        }[self.name]
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """Parse 'create=1,redirect=8' into normalized weights."""
+    weights: Dict[str, float] = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"Unknown scenario '{name}'")
+        weights[name] = float(weight or 1)
+    total = sum(weights.values())
+    if total <= 0:
+        raise argparse.ArgumentTypeError("Mix weights must sum to > 0")
+    return {name: w / total for name, w in weights.items()}
+
+
+# =============================================================================
+# Runner
+# =============================================================================
+async def seed_codes(pool: HttpPool, count: int, concurrency: int = 50) -> List[str]:
+    """Create `count` URLs (closed loop, setup only) and return their codes."""
+    codes: List[str] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _create() -> None:
+        async with semaphore:
+            body = json.dumps({"original_url": random_url()}).encode()
+            try:
+                status, payload, _ = await pool.request("POST", "/api/v1/urls/", body)
+            except (OSError, asyncio.TimeoutError, ValueError):
+                return
+            if status in (200, 201):
+                codes.append(json.loads(payload)["short_code"])
+
+    await asyncio.gather(*(_create() for _ in range(count)))
+    return codes
+
+
+async def run_open_loop(
+    pool: HttpPool,
+    pick: Callable[[], Scenario],
+    arrivals: Iterable[float],
+    warmup: float,
+    stats: Dict[str, ScenarioStats],
+) -> Tuple[float, int]:
+    """
+    Issue one request per arrival offset (seconds from start).
+
+    Returns (measured_seconds, late_sends) where late_sends counts requests
+    the generator itself could not dispatch on time (client saturation).
+    """
+    start = time.perf_counter()
+    measure_from = start + warmup
+    in_flight: set = set()
+    late_sends = 0
+
+    async def fire(intended: float, scenario: Scenario) -> None:
+        method, path, body = scenario.build()
+        try:
+            status, _, send_time = await pool.request(method, path, body)
+        except Exception as e:
+            if intended >= measure_from:
+                stats[scenario.name].errors[type(e).__name__] += 1
+            return
+        done = time.perf_counter()
+        if intended < measure_from:
+            return
+        s = stats[scenario.name]
+        s.corrected.record((done - intended) * 1_000_000)
+        s.uncorrected.record((done - send_time) * 1_000_000)
+        s.status_codes[str(status)] += 1
+
+    for offset in arrivals:
+        intended = start + offset
+        delay = intended - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        elif delay < -LATE_SEND_TOLERANCE:
+            late_sends += 1
+        task = asyncio.create_task(fire(intended, pick()))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+
+    if in_flight:
+        await asyncio.gather(*in_flight)
+    return time.perf_counter() - measure_from, late_sends
+
+
+def print_summary(results: dict) -> None:
+    print(f"\n{'=' * 60}")
+    print("  RESULTS (latency measured from intended send time)")
+    print(f"{'=' * 60}")
+    print(f"  Target rate:        {results['config']['rate']:,.0f} req/s")
+    print(f"  Measured duration:  {results['elapsed_s']:.2f}s")
+    if results["late_sends"]:
+        print(f"  ⚠️  Late sends:       {results['late_sends']:,} (generator saturated)")
+    keys = results["redirect_keys"]
+    if keys:
+        print(f"  Redirect keys:      {keys['distinct_codes']:,} distinct, "
+              f"top 1% = {keys['top_1pct_share']:.0%}, "
+              f"top 10% = {keys['top_10pct_share']:.0%} of requests")  # fmt: skip
+    for name, s in results["scenarios"].items():
+        lat = s["latency_ms"]
+        svc = s["service_time_ms"]
+        print(f"{'─' * 60}")
+        print(f"  {name}: {s['requests']:,} requests, {s['failed']:,} failed, "
+              f"{s['achieved_rps']:,.1f} RPS")  # fmt: skip
+        print(f"    p50 {lat['p50']:.2f}ms  p90 {lat['p90']:.2f}ms  "
+              f"p99 {lat['p99']:.2f}ms  p99.9 {lat['p99.9']:.2f}ms  "
+              f"max {lat['max']:.2f}ms")  # fmt: skip
+        print(f"    service time p99 {svc['p99']:.2f}ms (uncorrected)")
+        if s["errors"]:
+            print(f"    errors: {s['errors']}")
+    print(f"{'=' * 60}\n")
+
+
+async def build_key_sampler(
+    pool: HttpPool, args: argparse.Namespace
+) -> Tuple[List[str], Callable[[], str]]:
+    """Load, replay or seed redirect codes and wrap them in a sampler."""
+    if args.distribution == "replay":
+        if not args.replay_log:
+            raise SystemExit("  --distribution replay needs --replay-log")
+        codes = parse_access_log(args.replay_log)
+        if not codes:
+            raise SystemExit(f"  No short codes found in {args.replay_log}")
+        print(f"  Replaying {len(codes):,} requests "
+              f"({len(set(codes)):,} distinct codes)")  # fmt: skip
+        return codes, ReplaySampler(codes)
+
+    if args.codes_file:
+        codes = load_codes(args.codes_file)
+    else:
+        print(f"  Seeding {args.seed} URLs for redirect scenario...")
+        codes = await seed_codes(pool, args.seed)
+    if not codes:
+        raise SystemExit("  No short codes to redirect to; is the server up?")
+
+    if args.distribution == "zipf":
+        sampler = ZipfSampler(codes, s=args.zipf_s)
+        print(f"  Zipf s={args.zipf_s}: hottest 1% of {len(codes):,} codes get "
+              f"{sampler.share_of_top(0.01):.0%} of redirects")  # fmt: skip
+        return codes, sampler
+    return codes, UniformSampler(codes)
+
+
+async def main_async(args: argparse.Namespace) -> dict:
+    pool = HttpPool(args.url, size=args.connections, timeout=args.timeout)
+    mix = args.mix
+
+    codes: List[str] = []
+    pick_code = None
+    if "redirect" in mix:
+        codes, pick_code = await build_key_sampler(pool, args)
+
+    scenarios = {name: Scenario(name, pick_code) for name in mix}
+    stats = {
+        name: ScenarioStats(name=name, expected_status=sc.expected_status)
+        for name, sc in scenarios.items()
+    }
+    names = list(mix)
+    weights = [mix[n] for n in names]
+
+    def pick() -> Scenario:
+        return scenarios[random.choices(names, weights)[0]]
+
+    total_seconds = args.warmup + args.duration
+    if args.arrival == "burst":
+        arrivals = burst_arrivals(
+            args.rate, total_seconds, args.burst_rate, args.burst_every,
+            args.burst_length,
+        )  # fmt: skip
+    else:
+        arrivals = constant_arrivals(args.rate, total_seconds)
+
+    print(f"  Running {args.rate:,.0f} req/s ({args.arrival}) for {args.duration}s "
+          f"(+{args.warmup}s warmup) over {args.connections} connections")  # fmt: skip
+    elapsed, late = await run_open_loop(pool, pick, arrivals, args.warmup, stats)
+
+    return {
+        "label": args.label,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "host": platform.node(),
+        "python": platform.python_version(),
+        "config": {
+            "url": args.url,
+            "rate": args.rate,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "connections": args.connections,
+            "mix": mix,
+            "arrival": args.arrival,
+            "burst": (
+                {
+                    "rate": args.burst_rate,
+                    "every_s": args.burst_every,
+                    "length_s": args.burst_length,
+                }
+                if args.arrival == "burst"
+                else None
+            ),
+            "distribution": args.distribution,
+            "zipf_s": args.zipf_s if args.distribution == "zipf" else None,
+            "codes": len(set(codes)),
+        },
+        "elapsed_s": round(elapsed, 3),
+        "late_sends": late,
+        "scenarios": {name: s.to_dict(elapsed) for name, s in stats.items()},
+        "redirect_keys": (
+            scenarios["redirect"].key_stats() if "redirect" in scenarios else {}
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Open-loop async load generator",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__.split("Usage:")[1],
+    )
+    parser.add_argument("--url", default="http://localhost:8000", help="Base URL")
+    parser.add_argument(
+        "--rate", "-r", type=float, default=1000, help="Arrival rate (req/s)"
+    )
+    parser.add_argument(
+        "--duration", "-d", type=float, default=30, help="Measured seconds"
+    )
+    parser.add_argument(
+        "--warmup", type=float, default=5, help="Unmeasured seconds before measuring"
+    )
+    parser.add_argument(
+        "--connections", "-c", type=int, default=256, help="Keep-alive connections"
+    )
+    parser.add_argument(
+        "--mix", type=parse_mix, default=parse_mix("redirect=1"),
+        help="Scenario weights, e.g. create=1,redirect=8,resolve=1",
+    )  # fmt: skip
+    parser.add_argument(
+        "--seed", type=int, default=200, help="URLs to create for redirects"
+    )
+    parser.add_argument(
+        "--codes-file", help="Existing codes (see seed_urls.py) instead of seeding"
+    )
+    parser.add_argument(
+        "--distribution", choices=("uniform", "zipf", "replay"), default="uniform",
+        help="How redirect codes are picked",
+    )  # fmt: skip
+    parser.add_argument(
+        "--zipf-s", type=float, default=1.0, help="Zipf exponent (0 = uniform)"
+    )
+    parser.add_argument("--replay-log", help="Access log to replay redirects from")
+    parser.add_argument(
+        "--arrival", choices=("constant", "burst"), default="constant",
+        help="Arrival schedule",
+    )  # fmt: skip
+    parser.add_argument(
+        "--burst-rate", type=float, default=5000, help="Rate during bursts (req/s)"
+    )
+    parser.add_argument(
+        "--burst-every", type=float, default=10, help="Seconds between burst starts"
+    )
+    parser.add_argument(
+        "--burst-length", type=float, default=1, help="Seconds each burst lasts"
+    )
+    parser.add_argument("--timeout", type=float, default=10.0, help="Per-request timeout")
+    parser.add_argument("--output", "-o", help="Write JSON results to this file")
+    parser.add_argument("--label", default="", help="Build/run label stored in JSON")
+    args = parser.parse_args()
+    args.url = args.url.rstrip("/")
+
+    print(f"\n{'=' * 60}")
+    print("  URL SHORTENER OPEN-LOOP LOAD TEST")
+    print(f"{'=' * 60}")
+    print(f"  Target: {args.url}")
+    print(f"  Mix:    {', '.join(f'{k}={v:.0%}' for k, v in args.mix.items())}")
+
+    results = asyncio.run(main_async(args))
+    print_summary(results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"  Results written to {args.output}\n")
+
+
+if __name__ == "__main__":
+    main()
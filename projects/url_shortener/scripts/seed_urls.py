@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Seed N short URLs for benchmarks and write their codes to a file.
+
+Modes:
+- api: POST /api/v1/urls/ against a running server (stdlib only). Exercises
+       the real create path; fine up to tens of thousands of URLs.
+- db:  Bulk INSERT straight into the database configured in .env (needs the
+       app's dependencies). Use it for large key spaces (millions of URLs)
+       when sizing the cache.
+
+The codes file (one code per line) is read by loadgen.py --codes-file and
+ab_load_test.sh --codes-file.
+
+Usage:
+    python scripts/seed_urls.py --count 10000 --output codes.txt
+    python scripts/seed_urls.py --via db --count 1000000 --output codes.txt
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import uuid
+from typing import List
+
+from loadgen import HttpPool, seed_codes
+from workloads import save_codes
+
+
+async def seed_via_api(url: str, count: int, concurrency: int) -> List[str]:
+    pool = HttpPool(url, size=concurrency, timeout=30.0)
+    return await seed_codes(pool, count, concurrency)
+
+
+async def seed_via_db(count: int, batch_size: int) -> List[str]:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    from datetime import UTC, datetime
+
+    from sqlalchemy import insert
+
+    from app.db.session import AsyncSessionLocal, engine
+    from app.models.url import URL
+    from app.utils.shortener import generate_short_code
+
+    codes: List[str] = []
+    now = datetime.now(UTC)
+    async with AsyncSessionLocal() as db:
+        for start in range(0, count, batch_size):
+            rows = []
+            for _ in range(min(batch_size, count - start)):
+                original_url = f"https://example.com/seed/{uuid.uuid4().hex}"
+                # 8 chars keeps collisions negligible at millions of rows
+                # without clashing with 6-char codes from the API.
+                code = generate_short_code(original_url, length=8)
+                rows.append(
+                    {
+                        "short_code": code,
+                        "original_url": original_url,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                )
+            await db.execute(insert(URL), rows)
+            await db.commit()
+            codes.extend(row["short_code"] for row in rows)
+            print(f"  Inserted {len(codes):,}/{count:,}", end="\r")
+    print()
+    await engine.dispose()
+    return codes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Seed short URLs for benchmarks",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__.split("Usage:")[1],
+    )
+    parser.add_argument("--via", choices=("api", "db"), default="api")
+    parser.add_argument("--count", "-n", type=int, default=1000, help="URLs to create")
+    parser.add_argument("--output", "-o", required=True, help="Codes file to write")
+    parser.add_argument("--url", default="http://localhost:8000", help="Base URL (api)")
+    parser.add_argument(
+        "--concurrent", "-c", type=int, default=50, help="Parallel requests (api)"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=5000, help="Rows per INSERT (db)"
+    )
+    args = parser.parse_args()
+
+    print(f"\n  Seeding {args.count:,} URLs via {args.via}...")
+    if args.via == "api":
+        codes = asyncio.run(
+            seed_via_api(args.url.rstrip("/"), args.count, args.concurrent)
+        )
+    else:
+        codes = asyncio.run(seed_via_db(args.count, args.batch_size))
+
+    if not codes:
+        raise SystemExit("  ❌ No URLs created; is the server/database up?")
+    save_codes(args.output, codes)
+    print(f"  ✅ Wrote {len(codes):,} codes to {args.output}\n")
+
+
+if __name__ == "__main__":
+    main()
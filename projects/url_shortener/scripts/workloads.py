@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Workload models for redirect benchmarks.
+No external dependencies - uses only Python standard library.
+
+Key distributions (which short code each redirect asks for):
+- uniform: every seeded code equally likely (worst case for the cache)
+- zipf:    rank k is requested with probability proportional to 1 / k^s,
+           like real link traffic where a few links get most clicks
+- replay:  codes in the order they appear in an access log
+
+Arrival schedules (when requests are sent):
+- constant: fixed rate
+- burst:    base rate with periodic spikes to a higher rate
+
+Used by loadgen.py. Run directly, it splits a request budget over the
+hottest codes for single-URL tools such as Apache Bench:
+
+    python scripts/workloads.py --codes-file codes.txt --requests 10000
+"""
+
+import argparse
+import random
+import re
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+# Matches the request path in common/combined log format
+# ("GET /abc123 HTTP/1.1") or a bare path/code per line.
+_LOG_PATH_RE = re.compile(
+    r'"(?:GET|HEAD) /([A-Za-z0-9]+)[ ?"]|^/?([A-Za-z0-9]+)\s*$'
+)
+
+
+# =============================================================================
+# Code files
+# =============================================================================
+def load_codes(path: str) -> List[str]:
+    """Read one short code per line, ignoring blanks and '#' comments."""
+    with open(path) as f:
+        return [
+            line.strip()
+            for line in f
+            if line.strip() and not line.lstrip().startswith("#")
+        ]
+
+
+def save_codes(path: str, codes: Sequence[str]) -> None:
+    """Write one short code per line."""
+    with open(path, "w") as f:
+        f.write("\n".join(codes) + "\n")
+
+
+def parse_access_log(path: str) -> List[str]:
+    """Extract requested short codes from an access log, in order."""
+    codes = []
+    with open(path) as f:
+        for line in f:
+            match = _LOG_PATH_RE.search(line)
+            if match:
+                codes.append(match.group(1) or match.group(2))
+    return codes
+
+
+# =============================================================================
+# Key samplers
+# =============================================================================
+class UniformSampler:
+    """Every code equally likely."""
+
+    def __init__(self, codes: Sequence[str], rng: Optional[random.Random] = None):
+        if not codes:
+            raise ValueError("UniformSampler needs at least one code")
+        self.codes = list(codes)
+        self.rng = rng or random.Random()
+
+    def __call__(self) -> str:
+        return self.rng.choice(self.codes)
+
+
+class ZipfSampler:
+    """
+    Zipf(s) over the given codes: P(rank k) ~ 1 / k^s.
+
+    s = 0 is uniform; s around 1.0 matches typical web/link popularity;
+    larger s concentrates more traffic on the hottest codes. Ranks are
+    assigned to codes in a shuffled order so hot keys are not simply the
+    oldest rows. Sampling is one bisect on a precomputed CDF.
+    """
+
+    def __init__(
+        self,
+        codes: Sequence[str],
+        s: float = 1.0,
+        rng: Optional[random.Random] = None,
+    ):
+        if not codes:
+            raise ValueError("ZipfSampler needs at least one code")
+        if s < 0:
+            raise ValueError("Zipf exponent must be >= 0")
+        self.rng = rng or random.Random()
+        self.codes = list(codes)
+        self.rng.shuffle(self.codes)
+        self.s = s
+        self.weights = [1 / (rank**s) for rank in range(1, len(self.codes) + 1)]
+        self._cdf = list(accumulate(self.weights))
+        self._total = self._cdf[-1]
+
+    def __call__(self) -> str:
+        index = bisect_left(self._cdf, self.rng.random() * self._total)
+        return self.codes[min(index, len(self.codes) - 1)]
+
+    def share_of_top(self, fraction: float) -> float:
+        """Expected share of requests going to the hottest `fraction` of codes."""
+        top = max(1, int(len(self.codes) * fraction))
+        return self._cdf[top - 1] / self._total
+
+
+class ReplaySampler:
+    """Codes in access-log order, looping when the log is exhausted."""
+
+    def __init__(self, codes: Sequence[str]):
+        if not codes:
+            raise ValueError("ReplaySampler needs at least one code")
+        self.codes = list(codes)
+        self._position = 0
+
+    def __call__(self) -> str:
+        code = self.codes[self._position]
+        self._position = (self._position + 1) % len(self.codes)
+        return code
+
+
+# =============================================================================
+# Arrival schedules
+# =============================================================================
+def constant_arrivals(rate: float, duration: float) -> Iterator[float]:
+    """Offsets (seconds from start) at a fixed rate."""
+    interval = 1.0 / rate
+    for i in range(int(rate * duration)):
+        yield i * interval
+
+
+def burst_arrivals(
+    rate: float,
+    duration: float,
+    burst_rate: float,
+    every: float,
+    length: float,
+) -> Iterator[float]:
+    """
+    Offsets at `rate`, switching to `burst_rate` for `length` seconds at the
+    start of every `every`-second period (e.g. a link shared on social media).
+    """
+    if length >= every:
+        raise ValueError("Burst length must be shorter than the burst period")
+    offset = 0.0
+    while offset < duration:
+        yield offset
+        in_burst = (offset % every) < length
+        offset += 1.0 / (burst_rate if in_burst else rate)
+
+
+# =============================================================================
+# Plan (for single-URL tools)
+# =============================================================================
+def plan_requests(
+    codes: Sequence[str], requests: int, top: int, s: float
+) -> List[Tuple[str, int]]:
+    """Split `requests` over the `top` hottest codes in Zipf proportions."""
+    sampler = ZipfSampler(codes, s=s)
+    hot = sampler.weights[:top]
+    total = sum(hot)
+    plan = []
+    for code, weight in zip(sampler.codes, hot):
+        count = round(requests * weight / total)
+        if count:
+            plan.append((code, count))
+    return plan
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Print '<code> <requests>' lines, split in Zipf proportions"
+    )
+    parser.add_argument("--codes-file", required=True, help="One short code per line")
+    parser.add_argument("--requests", "-n", type=int, required=True)
+    parser.add_argument("--top", type=int, default=10, help="Number of codes to use")
+    parser.add_argument("--zipf-s", type=float, default=1.0, help="Zipf exponent")
+
+    args = parser.parse_args()
+    for code, count in plan_requests(
+        load_codes(args.codes_file), args.requests, args.top, args.zipf_s
+    ):
+        print(code, count)
+
+
+if __name__ == "__main__":
+    main()